@@ -0,0 +1,46 @@
+"""Unique index on messages.twilio_message_sid for webhook dedup
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ── Messages: clear the SID on rows saved by earlier webhook retries ─
+    op.execute(
+        """
+        UPDATE messages m
+        SET twilio_message_sid = NULL
+        WHERE twilio_message_sid IS NOT NULL
+          AND EXISTS (
+            SELECT 1 FROM messages o
+            WHERE o.twilio_message_sid = m.twilio_message_sid
+              AND (o.created_at, o.id) < (m.created_at, m.id)
+          )
+        """
+    )
+
+    # ── Messages: one row per Twilio MessageSid ──────────────────────
+    op.create_index(
+        "uq_messages_twilio_sid",
+        "messages",
+        ["twilio_message_sid"],
+        unique=True,
+        postgresql_where=sa.text("twilio_message_sid IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_messages_twilio_sid", table_name="messages")
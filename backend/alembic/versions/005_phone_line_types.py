@@ -0,0 +1,42 @@
+"""Add phone_line_types lookup cache
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ── Phone line types (Twilio Lookup cache) ───────────────────────
+    op.create_table(
+        "phone_line_types",
+        sa.Column("phone", sa.Text(), primary_key=True),
+        sa.Column("line_type", sa.Text(), nullable=False),
+        sa.Column("checked_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+    )
+
+    # Seed from line types we've already paid to look up
+    op.execute(
+        """
+        INSERT INTO phone_line_types (phone, line_type, checked_at)
+        SELECT DISTINCT ON (caller_phone) caller_phone, line_type, created_at
+        FROM calls
+        WHERE line_type <> 'unknown'
+        ORDER BY caller_phone, created_at DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("phone_line_types")
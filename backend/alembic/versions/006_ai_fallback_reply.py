@@ -0,0 +1,25 @@
+"""Add businesses.ai_fallback_reply
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("businesses", sa.Column("ai_fallback_reply", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("businesses", "ai_fallback_reply")
@@ -0,0 +1,45 @@
+"""Add vapi_call_reports for durable end-of-call processing
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vapi_call_reports",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("vapi_call_id", sa.Text(), nullable=False, unique=True),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False, server_default="received"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("is_qualified", sa.Boolean(), nullable=True),
+        sa.Column("completed_steps", postgresql.JSONB(), nullable=False, server_default=sa.text("'[]'::jsonb")),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("processed_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "idx_vapi_reports_pending",
+        "vapi_call_reports",
+        ["created_at"],
+        postgresql_where=sa.text("status IN ('received', 'applied')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_vapi_reports_pending", table_name="vapi_call_reports")
+    op.drop_table("vapi_call_reports")
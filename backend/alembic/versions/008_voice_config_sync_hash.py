@@ -0,0 +1,27 @@
+"""Track the last-pushed Vapi assistant payload on voice_ai_configs
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("voice_ai_configs", sa.Column("synced_payload_hash", sa.Text(), nullable=True))
+    op.add_column("voice_ai_configs", sa.Column("synced_at", sa.TIMESTAMP(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("voice_ai_configs", "synced_at")
+    op.drop_column("voice_ai_configs", "synced_payload_hash")
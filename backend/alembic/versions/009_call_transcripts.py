@@ -0,0 +1,122 @@
+"""Move voice transcripts from calls / conversations into call_transcripts
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16
+
+"""
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+# The transcript format as of this revision (app.services.transcripts may move on)
+_ROLES = {
+    "assistant": "assistant",
+    "bot": "assistant",
+    "ai": "assistant",
+    "user": "user",
+    "customer": "user",
+}
+
+
+def _turn(role: str | None, content: str) -> dict:
+    return {
+        "role": _ROLES.get((role or "").strip().lower(), "unknown"),
+        "content": content.strip(),
+        "seconds": None,
+    }
+
+
+def _parse_flat(text: str) -> list[dict]:
+    """Turns from a flattened "role: content" transcript."""
+    turns: list[dict] = []
+    for line in text.splitlines():
+        role, sep, content = line.partition(":")
+        if sep and role.strip().lower() in _ROLES:
+            turns.append(_turn(role, content))
+        elif turns:
+            turns[-1]["content"] += "\n" + line
+        elif line.strip():
+            turns.append(_turn(None, line))
+    return turns
+
+
+def _compress(turns: list[dict]) -> bytes:
+    return zlib.compress(json.dumps(turns, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+def _flatten(data: bytes) -> str:
+    return "\n".join(f"{t['role']}: {t['content']}" for t in json.loads(zlib.decompress(data)))
+
+
+def upgrade() -> None:
+    op.create_table(
+        "call_transcripts",
+        sa.Column("call_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("calls.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("business_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("turns", sa.LargeBinary(), nullable=False),
+        sa.Column("turn_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+    )
+
+    # Backfill: one transcript per call, preferring the copy on the call row
+    conn = op.get_bind()
+    rows = conn.execution_options(stream_results=True).execute(sa.text("""
+        SELECT DISTINCT ON (c.id) c.id, c.business_id,
+               COALESCE(c.voice_ai_transcript, v.voice_transcript) AS transcript
+        FROM calls c
+        LEFT JOIN conversations v ON v.call_id = c.id
+        WHERE c.voice_ai_transcript IS NOT NULL OR v.voice_transcript IS NOT NULL
+        ORDER BY c.id, v.voice_transcript IS NULL
+    """))
+    insert = sa.text("""
+        INSERT INTO call_transcripts (call_id, business_id, turns, turn_count)
+        VALUES (:call_id, :business_id, :turns, :turn_count)
+    """)
+    while batch := rows.fetchmany(BATCH_SIZE):
+        params = []
+        for call_id, business_id, transcript in batch:
+            turns = _parse_flat(transcript)
+            if turns:
+                params.append({
+                    "call_id": call_id,
+                    "business_id": business_id,
+                    "turns": _compress(turns),
+                    "turn_count": len(turns),
+                })
+        if params:
+            conn.execute(insert, params)
+
+    op.drop_column("conversations", "voice_transcript")
+    op.drop_column("calls", "voice_ai_transcript")
+
+
+def downgrade() -> None:
+    op.add_column("calls", sa.Column("voice_ai_transcript", sa.Text(), nullable=True))
+    op.add_column("conversations", sa.Column("voice_transcript", sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    for call_id, data in conn.execute(sa.text("SELECT call_id, turns FROM call_transcripts")).all():
+        text = _flatten(data)
+        conn.execute(
+            sa.text("UPDATE calls SET voice_ai_transcript = :t WHERE id = :id"),
+            {"t": text, "id": call_id},
+        )
+        conn.execute(
+            sa.text("UPDATE conversations SET voice_transcript = :t WHERE call_id = :id"),
+            {"t": text, "id": call_id},
+        )
+
+    op.drop_table("call_transcripts")
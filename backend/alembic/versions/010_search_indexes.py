@@ -0,0 +1,67 @@
+"""Full-text and trigram indexes for dashboard search
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-16
+
+"""
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name, table, columns, extra create_index kwargs
+INDEXES = [
+    ("idx_messages_fts", "messages", ["business_id", sa.text("to_tsvector('english', body)")],
+     {"postgresql_using": "gin"}),
+    *(
+        (f"idx_leads_{column}_trgm", "leads", [column],
+         {"postgresql_using": "gin", "postgresql_ops": {column: "gin_trgm_ops"}})
+        for column in ("name", "address", "phone")
+    ),
+    ("idx_call_transcripts_fts", "call_transcripts", ["business_id", "search_vector"],
+     {"postgresql_using": "gin"}),
+]
+
+
+def _flatten(data: bytes) -> str:
+    """The "role: content" text of a stored transcript, as of this revision."""
+    turns = json.loads(zlib.decompress(data))
+    return "\n".join(f"{t['role']}: {t['content']}" for t in turns)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    op.add_column("call_transcripts", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+    conn = op.get_bind()
+    for call_id, data in conn.execute(sa.text("SELECT call_id, turns FROM call_transcripts")).all():
+        conn.execute(
+            sa.text("UPDATE call_transcripts SET search_vector = to_tsvector('english', :t) WHERE call_id = :id"),
+            {"t": _flatten(data), "id": call_id},
+        )
+
+    # messages and leads take live writes: build without blocking them.
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction, and a failed
+    # build leaves an INVALID index behind, so drop before (re)creating.
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+            op.create_index(name, table, columns, postgresql_concurrently=True, **kwargs)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    op.drop_column("call_transcripts", "search_vector")
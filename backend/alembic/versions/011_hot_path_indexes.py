@@ -0,0 +1,52 @@
+"""Indexes for the hot-path query shapes, built concurrently
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name, table, columns, extra create_index kwargs
+INDEXES = [
+    # Every Vapi report / live-call lookup goes from call to conversation
+    ("idx_convos_call", "conversations", ["call_id"],
+     {"postgresql_where": sa.text("call_id IS NOT NULL")}),
+    # Active conversation for a sender (inbound context), lead detail
+    ("idx_convos_lead", "conversations", ["lead_id", "created_at"], {}),
+    # Conversation list, keyset-paginated on (updated_at, id)
+    ("idx_convos_business_updated", "conversations", ["business_id", "updated_at", "id"], {}),
+    # Daily metrics: sent / received counts per day
+    ("idx_messages_business_direction", "messages", ["business_id", "direction", "created_at"], {}),
+    # Lead list, keyset-paginated on (updated_at, id)
+    ("idx_leads_business_updated", "leads", ["business_id", "updated_at", "id"], {}),
+    # Call list filtered by status, missed-call counts
+    ("idx_calls_business_status", "calls", ["business_id", "status", "created_at"], {}),
+    # Stripe subscription webhooks
+    ("idx_businesses_stripe_customer", "businesses", ["stripe_customer_id"],
+     {"postgresql_where": sa.text("stripe_customer_id IS NOT NULL")}),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction. If a build
+    # fails it leaves an INVALID index behind, so drop before (re)creating.
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+            op.create_index(name, table, columns, postgresql_concurrently=True, **kwargs)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
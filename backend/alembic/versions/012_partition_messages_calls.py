@@ -0,0 +1,197 @@
+"""Monthly range partitions for messages and calls, Twilio SID ledger, retention
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-16
+
+Postgres can't partition a table in place, so each table is renamed,
+recreated as a partitioned parent with the same columns, refilled, and its
+indexes rebuilt on the parent (which cascades them to every partition).
+This rewrites both tables once; run it in a quiet window.
+
+Partitioned tables can't carry a unique index without the partition key,
+and can't be the target of a foreign key on id alone, so:
+- the global uniqueness of Twilio SIDs moves to the twilio_sids ledger;
+- conversations.call_id and call_transcripts.call_id lose their FKs.
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (foreign keys as (column, referenced table), indexes as create_index args)
+TABLES = {
+    "calls": (
+        [("business_id", "businesses")],
+        [
+            ("idx_calls_business", ["business_id", "created_at"], {}),
+            ("idx_calls_caller", ["caller_phone", "business_id"], {}),
+            ("idx_calls_business_status", ["business_id", "status", "created_at"], {}),
+            ("idx_calls_twilio_sid", ["twilio_call_sid"], {}),
+        ],
+    ),
+    "messages": (
+        [("conversation_id", "conversations"), ("business_id", "businesses")],
+        [
+            ("idx_messages_convo", ["conversation_id", "created_at"], {}),
+            ("idx_messages_business_direction", ["business_id", "direction", "created_at"], {}),
+            ("idx_messages_twilio_sid", ["twilio_message_sid"],
+             {"postgresql_where": sa.text("twilio_message_sid IS NOT NULL")}),
+            ("idx_messages_fts", ["business_id", sa.text("to_tsvector('english', body)")],
+             {"postgresql_using": "gin"}),
+        ],
+    ),
+}
+
+# Months of partitions made ahead; the maintain_partitions beat task keeps
+# this topped up afterwards
+PREMAKE_MONTHS = 3
+
+# Same policies as supabase/02_rls_policies.sql; the rebuilt tables start without them
+_SUPABASE_POLICIES = """
+DO $$
+BEGIN
+  IF to_regprocedure('public.get_current_business_id()') IS NOT NULL THEN
+    CREATE POLICY "calls_select_own" ON public.calls FOR SELECT
+      USING (business_id = public.get_current_business_id());
+    CREATE POLICY "calls_insert_own" ON public.calls FOR INSERT
+      WITH CHECK (business_id = public.get_current_business_id());
+    CREATE POLICY "messages_select_own" ON public.messages FOR SELECT
+      USING (business_id = public.get_current_business_id());
+    CREATE POLICY "messages_insert_own" ON public.messages FOR INSERT
+      WITH CHECK (business_id = public.get_current_business_id());
+  END IF;
+  IF EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime') THEN
+    -- Publish partition changes as changes to calls / messages
+    ALTER PUBLICATION supabase_realtime SET (publish_via_partition_root = true);
+    ALTER PUBLICATION supabase_realtime ADD TABLE public.calls, public.messages;
+  END IF;
+END
+$$;
+"""
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partitions(table: str, first_month: date) -> None:
+    """A DEFAULT partition plus one per UTC month, first_month through PREMAKE_MONTHS ahead."""
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    op.execute(f"ALTER TABLE {table}_default ENABLE ROW LEVEL SECURITY")
+    last = _add_months(datetime.utcnow().date(), PREMAKE_MONTHS)
+    month = first_month
+    while month <= last:
+        name = f"{table}_{month:%Y_%m}"
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{_add_months(month, 1)} 00:00:00+00')"
+        )
+        op.execute(f"ALTER TABLE {name} ENABLE ROW LEVEL SECURITY")
+        month = _add_months(month, 1)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # ── FKs into calls can't survive partitioning ────────────────────
+    op.execute("ALTER TABLE conversations DROP CONSTRAINT IF EXISTS conversations_call_id_fkey")
+    op.execute("ALTER TABLE call_transcripts DROP CONSTRAINT IF EXISTS call_transcripts_call_id_fkey")
+
+    earliest = conn.scalar(
+        sa.text("SELECT least((SELECT min(created_at) FROM calls), (SELECT min(created_at) FROM messages))")
+    )
+    first_month = (
+        earliest.astimezone(timezone.utc).date() if earliest else datetime.utcnow().date()
+    ).replace(day=1)
+
+    # ── Partitioned parents, same columns, PK includes created_at ────
+    for table, (foreign_keys, _) in TABLES.items():
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+        op.execute(
+            f"ALTER TABLE {table}_unpartitioned RENAME CONSTRAINT {table}_pkey TO {table}_unpartitioned_pkey"
+        )
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {table}_unpartitioned INCLUDING DEFAULTS, "
+            f"PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+        )
+        for column, referenced in foreign_keys:
+            op.create_foreign_key(f"{table}_{column}_fkey", table, referenced, [column], ["id"])
+        op.execute(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY")
+
+    for table in TABLES:
+        _create_partitions(table, first_month)
+
+    # ── Move the rows, then index the parents ────────────────────────
+    for table, (_, indexes) in TABLES.items():
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_unpartitioned")
+        op.execute(f"DROP TABLE {table}_unpartitioned")
+        for name, columns, kwargs in indexes:
+            op.create_index(name, table, columns, **kwargs)
+
+    op.execute(_SUPABASE_POLICIES)
+
+    # ── Twilio SID ledger (dedup for retried webhooks) ───────────────
+    op.create_table(
+        "twilio_sids",
+        sa.Column("sid", sa.Text(), primary_key=True),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.execute(
+        """
+        INSERT INTO twilio_sids (sid, created_at)
+        SELECT twilio_call_sid, created_at FROM calls
+        WHERE created_at > now() - interval '30 days'
+        UNION ALL
+        SELECT twilio_message_sid, created_at FROM messages
+        WHERE direction = 'inbound' AND twilio_message_sid IS NOT NULL
+          AND created_at > now() - interval '30 days'
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+    # ── Retention ────────────────────────────────────────────────────
+    op.add_column("businesses", sa.Column("data_retention_months", sa.Integer(), nullable=True))
+    op.create_index(
+        "idx_call_transcripts_business_created", "call_transcripts", ["business_id", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_call_transcripts_business_created", table_name="call_transcripts")
+    op.drop_column("businesses", "data_retention_months")
+    op.drop_table("twilio_sids")
+
+    for table, (foreign_keys, indexes) in TABLES.items():
+        op.execute(f"CREATE TABLE {table}_unpartitioned (LIKE {table} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table}_unpartitioned SELECT * FROM {table}")
+        op.execute(f"DROP TABLE {table}")  # and its partitions
+        op.execute(f"ALTER TABLE {table}_unpartitioned RENAME TO {table}")
+        op.create_primary_key(f"{table}_pkey", table, ["id"])
+        for column, referenced in foreign_keys:
+            op.create_foreign_key(f"{table}_{column}_fkey", table, referenced, [column], ["id"])
+        for name, columns, kwargs in indexes:
+            if name not in ("idx_calls_twilio_sid", "idx_messages_twilio_sid"):
+                op.create_index(name, table, columns, **kwargs)
+
+    op.create_unique_constraint("calls_twilio_call_sid_key", "calls", ["twilio_call_sid"])
+    op.create_index(
+        "uq_messages_twilio_sid",
+        "messages",
+        ["twilio_message_sid"],
+        unique=True,
+        postgresql_where=sa.text("twilio_message_sid IS NOT NULL"),
+    )
+    op.create_foreign_key("conversations_call_id_fkey", "conversations", "calls", ["call_id"], ["id"])
+    op.create_foreign_key(
+        "call_transcripts_call_id_fkey", "call_transcripts", "calls", ["call_id"], ["id"], ondelete="CASCADE"
+    )
@@ -0,0 +1,77 @@
+"""Notify listeners of opt_outs changes; one global opt-out per phone
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-16
+
+The API's in-process opt-out index LISTENs on the opt_outs channel, so every
+committed change reaches it however it was made (app, dashboard, SQL).
+Notifications carry clock_timestamp() so Postgres doesn't fold identical
+payloads within one transaction together.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # uq_optout_phone_business doesn't cover NULL business_id; keep one
+    # global row per phone so each index key maps to exactly one row
+    op.execute(
+        """
+        DELETE FROM opt_outs a USING opt_outs b
+        WHERE a.business_id IS NULL AND b.business_id IS NULL
+          AND a.phone = b.phone AND a.id > b.id
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX uq_optout_phone_global ON opt_outs (phone) "
+        "WHERE business_id IS NULL"
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_opt_out_change() RETURNS trigger AS $$
+        BEGIN
+          IF TG_OP = 'TRUNCATE' THEN
+            PERFORM pg_notify('opt_outs', json_build_object(
+              'op', 'reload', 'at', clock_timestamp())::text);
+            RETURN NULL;
+          END IF;
+          IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM pg_notify('opt_outs', json_build_object(
+              'op', 'remove', 'phone', OLD.phone, 'business_id', OLD.business_id,
+              'at', clock_timestamp())::text);
+          END IF;
+          IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM pg_notify('opt_outs', json_build_object(
+              'op', 'add', 'phone', NEW.phone, 'business_id', NEW.business_id,
+              'at', clock_timestamp())::text);
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER opt_outs_notify AFTER INSERT OR UPDATE OR DELETE ON opt_outs "
+        "FOR EACH ROW EXECUTE FUNCTION notify_opt_out_change()"
+    )
+    op.execute(
+        "CREATE TRIGGER opt_outs_notify_truncate AFTER TRUNCATE ON opt_outs "
+        "FOR EACH STATEMENT EXECUTE FUNCTION notify_opt_out_change()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS opt_outs_notify_truncate ON opt_outs")
+    op.execute("DROP TRIGGER IF EXISTS opt_outs_notify ON opt_outs")
+    op.execute("DROP FUNCTION IF EXISTS notify_opt_out_change()")
+    op.drop_index("uq_optout_phone_global", table_name="opt_outs")
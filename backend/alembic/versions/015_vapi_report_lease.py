@@ -0,0 +1,33 @@
+"""Add a processing lease to vapi_call_reports
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "vapi_call_reports",
+        sa.Column("processing_until", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "vapi_call_reports",
+        sa.Column("processing_owner", sa.Text(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("vapi_call_reports", "processing_owner")
+    op.drop_column("vapi_call_reports", "processing_until")
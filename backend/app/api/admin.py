@@ -1,5 +1,8 @@
+import asyncio
 import uuid
 import logging
+from collections import Counter
+from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException, Header, Request
 from pydantic import BaseModel
@@ -7,9 +10,18 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.database import get_db
+from app.database import (
+    async_session_factory,
+    get_db,
+    get_read_db,
+    pool_status,
+    release_connection,
+)
 from app.models.business import Business
 from app.api.schemas import biz_to_dict
+from app.services.business_cache import invalidate_on_commit
+from app.services.pool_metrics import pool_hold_stats
+from app.services.ai_turn import get_ai_degradation_counts
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -85,6 +97,12 @@ async def update_business_endpoint(
         if hasattr(business, key):
             setattr(business, key, value)
     await db.flush()
+    invalidate_on_commit(db, business.id)
+
+    from app.services.vapi import ASSISTANT_BUSINESS_FIELDS, schedule_assistant_sync
+
+    if ASSISTANT_BUSINESS_FIELDS.intersection(body):
+        await schedule_assistant_sync(business)
 
     return {"business": biz_to_dict(business)}
 
@@ -92,6 +110,7 @@ async def update_business_endpoint(
 @router.post("/businesses/{business_id}/configure-voice")
 async def configure_voice_ai(
     business_id: str,
+    force: bool = False,
     db: AsyncSession = Depends(get_db),
     _: None = Depends(verify_admin),
 ):
@@ -99,9 +118,10 @@ async def configure_voice_ai(
     Create or update the Vapi voice AI assistant for a business.
 
     This sets up the voice AI with the business's specific configuration:
-    services, hours, custom prompt, voice selection, etc.
+    services, hours, custom prompt, voice selection, etc. Nothing is pushed
+    if the assistant already matches, unless ?force=true.
     """
-    from app.services.vapi import create_or_update_assistant, VapiUnavailableError
+    from app.services.vapi import sync_assistant, VapiUnavailableError
 
     result = await db.execute(
         select(Business).where(Business.id == uuid.UUID(business_id))
@@ -117,16 +137,75 @@ async def configure_voice_ai(
         )
 
     try:
-        assistant_id = await create_or_update_assistant(db, business)
+        synced = await sync_assistant(db, business, force=force)
         return {
-            "status": "configured",
-            "vapi_assistant_id": assistant_id,
+            "status": "configured" if synced.changed else "unchanged",
+            "vapi_assistant_id": synced.assistant_id,
             "business_id": business_id,
         }
     except VapiUnavailableError as e:
         raise HTTPException(status_code=502, detail=f"Vapi API error: {e}")
 
 
+@router.post("/voice/reconfigure-all")
+async def reconfigure_all_voice_ai(
+    force: bool = False,
+    db: AsyncSession = Depends(get_db),
+    _: None = Depends(verify_admin),
+):
+    """
+    Re-push every configured business's Vapi assistant (e.g. after a prompt
+    template change). Unchanged assistants are skipped unless ?force=true, and
+    at most VAPI_SYNC_CONCURRENCY pushes run at once.
+    """
+    from app.services.vapi import sync_assistant
+
+    if not settings.vapi_api_key:
+        raise HTTPException(
+            status_code=400,
+            detail="VAPI_API_KEY not configured. Set it in environment variables.",
+        )
+
+    result = await db.execute(
+        select(Business.id).where(Business.vapi_assistant_id.isnot(None))
+    )
+    business_ids = list(result.scalars().all())
+    await release_connection(db)
+
+    semaphore = asyncio.Semaphore(settings.vapi_sync_concurrency)
+
+    async def reconfigure(business_id: uuid.UUID) -> dict:
+        async with semaphore:
+            try:
+                # One session per business: sessions can't be shared across tasks
+                async with async_session_factory() as session:
+                    business = await session.get(Business, business_id)
+                    synced = await sync_assistant(session, business, force=force)
+                    await session.commit()
+                return {
+                    "business_id": str(business_id),
+                    "status": "configured" if synced.changed else "unchanged",
+                    "vapi_assistant_id": synced.assistant_id,
+                }
+            except Exception as e:
+                logger.warning(f"Vapi reconfigure failed for business {business_id}: {e}")
+                return {
+                    "business_id": str(business_id),
+                    "status": "error",
+                    "error": str(e),
+                }
+
+    results = await asyncio.gather(*(reconfigure(b) for b in business_ids))
+    counts = Counter(r["status"] for r in results)
+    return {
+        "total": len(results),
+        "configured": counts["configured"],
+        "unchanged": counts["unchanged"],
+        "errors": counts["error"],
+        "results": results,
+    }
+
+
 @router.post("/businesses/{business_id}/test-call")
 async def test_voice_call(
     business_id: str,
@@ -197,7 +276,7 @@ async def system_health():
 
 @router.get("/metrics")
 async def system_metrics(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: None = Depends(verify_admin),
 ):
     """Cross-client metrics."""
@@ -228,9 +307,33 @@ async def system_metrics(
     }
 
 
+@router.get("/monitoring/db-pool")
+async def monitoring_db_pool(_: None = Depends(verify_admin)):
+    """
+    DB pool state for this process: connections checked out / idle /
+    overflow, checkout waits, timeouts and latency, and how long each route
+    holds a connection per checkout.
+    """
+    return {"pool": pool_status(), "routes": pool_hold_stats()}
+
+
+@router.get("/monitoring/ai-degradation")
+async def monitoring_ai_degradation(
+    day: date | None = None,
+    _: None = Depends(verify_admin),
+):
+    """
+    Texts answered with the fallback reply, per business and reason: AI
+    timeout / error / breaker_open / rate_limited / bad_output, or sms_rate_limited for
+    inbound texts dropped by admission control.
+    """
+    day = day or date.today()
+    return {"date": day.isoformat(), "businesses": await get_ai_degradation_counts(day)}
+
+
 @router.get("/monitoring/costs")
 async def monitoring_costs(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: None = Depends(verify_admin),
 ):
     """
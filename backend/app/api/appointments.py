@@ -1,17 +1,20 @@
 import uuid
-from datetime import date, time
+from datetime import date, datetime, time
 from typing import Optional
 
+import pytz
+
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from sqlalchemy import update as sa_update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_business
-from app.models.business import Business
+from app.services.business_cache import BusinessSnapshot
 from app.models.lead import Lead
 from app.services.crud import get_appointments, create_appointment, update_appointment
+from app.services.pagination import DEFAULT_PAGE_SIZE
 from app.api.schemas import appt_to_dict
 
 router = APIRouter()
@@ -29,18 +32,32 @@ class CreateAppointmentRequest(BaseModel):
 
 @router.get("/")
 async def list_appointments(
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List appointments."""
-    appts = await get_appointments(db, business.id)
-    return {"appointments": [appt_to_dict(a) for a in appts]}
+    """
+    List appointments in schedule order. Without a date range the list starts
+    at the business's today, so upcoming work is always on the first page.
+    """
+    if date_from is None and date_to is None:
+        date_from = datetime.now(pytz.timezone(business.timezone)).date()
+    page = await get_appointments(
+        db, business.id, date_from=date_from, date_to=date_to, cursor=cursor, limit=limit
+    )
+    return {
+        "appointments": [appt_to_dict(a) for a in page.items],
+        "next_cursor": page.next_cursor,
+    }
 
 
 @router.post("/")
 async def create_appointment_endpoint(
     request: CreateAppointmentRequest,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Create appointment manually."""
@@ -72,7 +89,7 @@ async def create_appointment_endpoint(
 async def update_appointment_endpoint(
     appointment_id: str,
     request: Request,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Update appointment status."""
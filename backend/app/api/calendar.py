@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import get_settings
 from app.database import get_db
 from app.middleware.auth import get_current_business
-from app.models.business import Business
+from app.services.business_cache import BusinessSnapshot
 from app.models.calendar_integration import CalendarIntegration
 from app.services.calendar import get_calendar_provider
 
@@ -30,7 +30,7 @@ def _calendar_to_dict(integration: CalendarIntegration) -> dict:
 
 @router.get("/integrations")
 async def list_integrations(
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """List connected calendar integrations."""
@@ -47,7 +47,7 @@ async def list_integrations(
 @router.get("/connect/{provider}")
 async def connect_calendar(
     provider: str,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
 ):
     """Get OAuth authorization URL for a calendar provider."""
     if provider not in ("google", "outlook"):
@@ -127,7 +127,7 @@ async def calendar_callback(
 @router.delete("/integrations/{integration_id}")
 async def disconnect_calendar(
     integration_id: str,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Disconnect a calendar integration."""
@@ -4,11 +4,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
 from app.middleware.auth import get_current_business
-from app.models.business import Business
+from app.services.business_cache import BusinessSnapshot
 from app.models.call import Call
 from app.services.crud import get_calls
+from app.services.pagination import DEFAULT_PAGE_SIZE
+from app.services.transcripts import flatten_turns, load_transcript
 from app.api.schemas import call_to_dict
 
 router = APIRouter()
@@ -17,19 +19,24 @@ router = APIRouter()
 @router.get("/")
 async def list_calls(
     status: str | None = None,
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List calls for the business."""
-    calls = await get_calls(db, business.id, status=status)
-    return {"calls": [call_to_dict(c) for c in calls]}
+    """List calls for the business, newest first."""
+    page = await get_calls(db, business.id, status=status, cursor=cursor, limit=limit)
+    return {
+        "calls": [call_to_dict(c) for c in page.items],
+        "next_cursor": page.next_cursor,
+    }
 
 
 @router.get("/{call_id}/recording")
 async def get_call_recording(
     call_id: str,
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get the voice AI call recording URL."""
     result = await db.execute(
@@ -51,10 +58,10 @@ async def get_call_recording(
 @router.get("/{call_id}/transcript")
 async def get_call_transcript(
     call_id: str,
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get the voice AI call transcript."""
+    """Get the voice AI call transcript (structured turns plus flattened text)."""
     result = await db.execute(
         select(Call).where(
             Call.id == uuid.UUID(call_id),
@@ -65,8 +72,10 @@ async def get_call_transcript(
     if not call:
         raise HTTPException(status_code=404, detail="Call not found")
 
+    turns = await load_transcript(db, call.id)
     return {
-        "transcript": call.voice_ai_transcript or call.transcription,
+        "transcript": flatten_turns(turns) if turns else call.transcription,
+        "turns": turns or [],
         "duration_seconds": call.voice_ai_duration_seconds or call.duration_seconds,
         "voice_ai_used": call.voice_ai_used,
     }
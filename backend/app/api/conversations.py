@@ -5,9 +5,9 @@ from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db, release_connection
 from app.middleware.auth import get_current_business
-from app.models.business import Business
+from app.services.business_cache import BusinessSnapshot
 from app.models.call import Call
 from app.services.crud import (
     get_conversations,
@@ -15,7 +15,9 @@ from app.services.crud import (
     get_conversation_messages,
     update_conversation_status,
 )
+from app.services.pagination import DEFAULT_PAGE_SIZE
 from app.services.sms import send_sms, save_message
+from app.services.transcripts import flatten_turns, load_transcript
 from app.api.schemas import convo_to_dict, msg_to_dict
 
 router = APIRouter()
@@ -28,29 +30,42 @@ class SendMessageRequest(BaseModel):
 @router.get("/")
 async def list_conversations(
     status: str = None,
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List active conversations."""
-    convos = await get_conversations(db, business.id, status=status)
-    return {"conversations": [convo_to_dict(c, lead=l) for c, l in convos]}
+    """List conversations, most recently active first."""
+    page = await get_conversations(db, business.id, status=status, cursor=cursor, limit=limit)
+    return {
+        "conversations": [convo_to_dict(c, lead=l) for c, l in page.items],
+        "next_cursor": page.next_cursor,
+    }
 
 
 @router.get("/{conversation_id}")
 async def get_conversation(
     conversation_id: str,
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Full conversation with messages, voice transcript, and recording."""
+    """
+    Conversation with its latest messages, voice transcript, and recording.
+    next_cursor fetches the page of earlier messages.
+    """
     convo = await get_conversation_detail(db, business.id, uuid.UUID(conversation_id))
     if not convo:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    messages = await get_conversation_messages(db, uuid.UUID(conversation_id))
+    messages = await get_conversation_messages(
+        db, uuid.UUID(conversation_id), cursor=cursor, limit=limit
+    )
 
-    # Load call record for recording URL if this is a voice conversation
+    # Load call record for recording URL and transcript if this is a voice conversation
     recording_url = None
+    turns = None
     if convo.call_id:
         call_result = await db.execute(
             select(Call).where(Call.id == convo.call_id)
@@ -58,20 +73,25 @@ async def get_conversation(
         call = call_result.scalar_one_or_none()
         if call:
             recording_url = call.recording_url
+            if call.voice_ai_used:
+                turns = await load_transcript(db, call.id)
 
     result = convo_to_dict(convo)
     result["recording_url"] = recording_url
+    result["voice_transcript"] = flatten_turns(turns) if turns else None
+    result["transcript_turns"] = turns or []
 
     return {
         "conversation": result,
-        "messages": [msg_to_dict(m) for m in messages],
+        "messages": [msg_to_dict(m) for m in messages.items],
+        "next_cursor": messages.next_cursor,
     }
 
 
 @router.post("/{conversation_id}/takeover")
 async def takeover_conversation(
     conversation_id: str,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Human takes over from AI."""
@@ -86,7 +106,7 @@ async def takeover_conversation(
 @router.post("/{conversation_id}/return-ai")
 async def return_to_ai(
     conversation_id: str,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Return conversation to AI handling."""
@@ -102,7 +122,7 @@ async def return_to_ai(
 async def send_manual_message(
     conversation_id: str,
     request: SendMessageRequest,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Send a manual message in the conversation."""
@@ -117,6 +137,8 @@ async def send_manual_message(
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
 
+    # Only reads so far; end the transaction before Twilio is awaited
+    await release_connection(db)
     await send_sms(
         db,
         to=lead.phone,
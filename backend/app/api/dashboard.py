@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
 from app.middleware.auth import get_current_business
-from app.models.business import Business
+from app.services.business_cache import BusinessSnapshot
 from app.services.crud import get_dashboard_stats, get_recent_activity
 
 router = APIRouter()
@@ -11,8 +11,8 @@ router = APIRouter()
 
 @router.get("/stats")
 async def get_stats(
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Summary metrics: calls, leads, revenue."""
     stats = await get_dashboard_stats(db, business.id)
@@ -21,8 +21,8 @@ async def get_stats(
 
 @router.get("/recent")
 async def get_recent(
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Recent activity feed."""
     activities = await get_recent_activity(db, business.id, limit=20)
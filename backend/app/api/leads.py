@@ -5,12 +5,13 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy import select, update as sa_update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_business
-from app.models.business import Business
+from app.services.business_cache import BusinessSnapshot
 from app.models.lead import Lead
 from app.models.review_request import ReviewRequest
 from app.services.crud import get_leads, get_lead_detail, update_lead
+from app.services.pagination import DEFAULT_PAGE_SIZE
 from app.api.schemas import lead_to_dict, convo_to_dict, msg_to_dict
 
 router = APIRouter()
@@ -19,24 +20,31 @@ router = APIRouter()
 @router.get("/")
 async def list_leads(
     status: Optional[str] = None,
-    page: int = 1,
-    per_page: int = 50,
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List leads, filterable by status."""
-    leads = await get_leads(db, business.id, status=status, page=page, per_page=per_page)
-    return {"leads": [lead_to_dict(l) for l in leads]}
+    """List leads, most recently updated first, filterable by status."""
+    page = await get_leads(db, business.id, status=status, cursor=cursor, limit=limit)
+    return {
+        "leads": [lead_to_dict(l) for l in page.items],
+        "next_cursor": page.next_cursor,
+    }
 
 
 @router.get("/{lead_id}")
 async def get_lead(
     lead_id: str,
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Lead detail with conversation history."""
-    result = await get_lead_detail(db, business.id, uuid.UUID(lead_id))
+    """Lead detail with conversation history (latest messages; next_cursor pages back)."""
+    result = await get_lead_detail(
+        db, business.id, uuid.UUID(lead_id), cursor=cursor, limit=limit
+    )
     if not result:
         raise HTTPException(status_code=404, detail="Lead not found")
 
@@ -44,7 +52,8 @@ async def get_lead(
     return {
         "lead": lead_to_dict(lead),
         "conversations": [convo_to_dict(c) for c in conversations],
-        "messages": [msg_to_dict(m) for m in messages],
+        "messages": [msg_to_dict(m) for m in messages.items],
+        "next_cursor": messages.next_cursor,
     }
 
 
@@ -52,7 +61,7 @@ async def get_lead(
 async def update_lead_endpoint(
     lead_id: str,
     request: Request,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Update lead status or notes."""
@@ -69,7 +78,7 @@ async def update_lead_endpoint(
 @router.post("/{lead_id}/mark-completed")
 async def mark_lead_completed(
     lead_id: str,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Mark a lead/job as completed. Triggers review request after 2 hours."""
@@ -109,7 +118,7 @@ async def mark_lead_completed(
 @router.post("/{lead_id}/request-review")
 async def request_review_manually(
     lead_id: str,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Manually trigger a review request (sent immediately)."""
@@ -4,9 +4,9 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.database import get_db
+from app.database import get_read_db
 from app.middleware.auth import get_current_business
-from app.models.business import Business
+from app.services.business_cache import BusinessSnapshot
 from app.services.crud import get_daily_metrics_range
 from app.api.schemas import metric_to_dict
 
@@ -17,8 +17,8 @@ router = APIRouter()
 
 @router.get("/weekly")
 async def weekly_report(
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Weekly summary report."""
     week_start = date.today() - timedelta(days=7)
@@ -42,8 +42,8 @@ async def weekly_report(
 
 @router.get("/monthly")
 async def monthly_report(
-    business: Business = Depends(get_current_business),
-    db: AsyncSession = Depends(get_db),
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Monthly summary with ROI calculation."""
     month_start = date.today().replace(day=1)
@@ -39,7 +39,6 @@ def convo_to_dict(convo, lead=None) -> dict:
         "call_id": str(convo.call_id) if convo.call_id else None,
         "status": convo.status,
         "channel": getattr(convo, "channel", "sms"),
-        "voice_transcript": getattr(convo, "voice_transcript", None),
         "follow_up_count": convo.follow_up_count,
         "next_follow_up_at": convo.next_follow_up_at.isoformat() if convo.next_follow_up_at else None,
         "qualification_data": convo.qualification_data,
@@ -76,7 +75,6 @@ def call_to_dict(call) -> dict:
         "recording_url": call.recording_url,
         "transcription": call.transcription,
         "voice_ai_used": getattr(call, "voice_ai_used", False),
-        "voice_ai_transcript": getattr(call, "voice_ai_transcript", None),
         "voice_ai_duration_seconds": getattr(call, "voice_ai_duration_seconds", None),
         "voice_ai_cost": float(call.voice_ai_cost) if getattr(call, "voice_ai_cost", None) else None,
         "line_type": getattr(call, "line_type", "unknown"),
@@ -134,12 +132,14 @@ def biz_to_dict(b) -> dict:
         "avg_job_value": float(b.avg_job_value) if b.avg_job_value else 350.0,
         "ai_greeting": b.ai_greeting,
         "ai_instructions": b.ai_instructions,
+        "ai_fallback_reply": getattr(b, "ai_fallback_reply", None),
         "notification_prefs": b.notification_prefs,
         "subscription_status": b.subscription_status,
         "vapi_assistant_id": getattr(b, "vapi_assistant_id", None),
         "google_place_id": getattr(b, "google_place_id", None),
         "call_recording_enabled": getattr(b, "call_recording_enabled", True),
         "two_party_consent_state": getattr(b, "two_party_consent_state", False),
+        "data_retention_months": getattr(b, "data_retention_months", None),
         "created_at": b.created_at.isoformat() if b.created_at else None,
         "updated_at": b.updated_at.isoformat() if b.updated_at else None,
     }
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.middleware.auth import get_current_business
+from app.services.business_cache import BusinessSnapshot
+from app.services.search import search
+
+router = APIRouter()
+
+MAX_LIMIT = 50
+
+
+@router.get("/")
+async def search_endpoint(
+    q: str,
+    limit: int = 20,
+    business: BusinessSnapshot = Depends(get_current_business),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Search leads, SMS messages and voice transcripts, ranked with snippets."""
+    q = q.strip()
+    if len(q) < 2:
+        raise HTTPException(status_code=400, detail="Search query must be at least 2 characters")
+
+    results = await search(db, business.id, q, limit=max(1, min(limit, MAX_LIMIT)))
+    return {"query": q, **results}
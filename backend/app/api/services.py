@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.middleware.auth import get_current_business
-from app.models.business import Business
+from app.services.business_cache import BusinessSnapshot
 from app.services.crud import (
     get_services,
     create_service,
@@ -15,6 +15,7 @@ from app.services.crud import (
     delete_service,
     reorder_services,
 )
+from app.services.vapi import schedule_assistant_sync
 from app.api.schemas import service_to_dict
 
 router = APIRouter()
@@ -40,7 +41,7 @@ class ReorderRequest(BaseModel):
 
 @router.get("/")
 async def list_services(
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """List active services for the business."""
@@ -51,7 +52,7 @@ async def list_services(
 @router.post("/")
 async def create_service_endpoint(
     request: CreateServiceRequest,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new service."""
@@ -71,6 +72,7 @@ async def create_service_endpoint(
         is_bookable=request.is_bookable,
         sort_order=request.sort_order,
     )
+    await schedule_assistant_sync(business)
     return {"service": service_to_dict(svc)}
 
 
@@ -78,7 +80,7 @@ async def create_service_endpoint(
 async def update_service_endpoint(
     service_id: str,
     request: Request,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Update a service."""
@@ -100,26 +102,28 @@ async def update_service_endpoint(
     svc = await update_service(db, business.id, uuid.UUID(service_id), **update_data)
     if not svc:
         raise HTTPException(status_code=404, detail="Service not found")
+    await schedule_assistant_sync(business)
     return {"service": service_to_dict(svc)}
 
 
 @router.delete("/{service_id}")
 async def delete_service_endpoint(
     service_id: str,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Soft-delete a service."""
     deleted = await delete_service(db, business.id, uuid.UUID(service_id))
     if not deleted:
         raise HTTPException(status_code=404, detail="Service not found")
+    await schedule_assistant_sync(business)
     return {"deleted": True}
 
 
 @router.post("/reorder")
 async def reorder_services_endpoint(
     request: ReorderRequest,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Bulk update sort order for services."""
@@ -128,5 +132,6 @@ async def reorder_services_endpoint(
         business.id,
         [{"id": item.id, "sort_order": item.sort_order} for item in request.order],
     )
+    await schedule_assistant_sync(business)
     services = await get_services(db, business.id)
     return {"services": [service_to_dict(s) for s in services]}
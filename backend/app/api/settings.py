@@ -1,17 +1,20 @@
+from dataclasses import replace
+
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.middleware.auth import get_current_business
-from app.models.business import Business
+from app.services.business_cache import BusinessSnapshot
 from app.services.crud import update_business
+from app.services.vapi import ASSISTANT_BUSINESS_FIELDS, schedule_assistant_sync
 
 router = APIRouter()
 
 
 @router.get("/")
 async def get_settings_endpoint(
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
 ):
     """Get business settings."""
     return {
@@ -28,6 +31,7 @@ async def get_settings_endpoint(
             "avg_job_value": float(business.avg_job_value) if business.avg_job_value else 350.0,
             "ai_greeting": business.ai_greeting,
             "ai_instructions": business.ai_instructions,
+            "ai_fallback_reply": business.ai_fallback_reply,
             "notification_prefs": business.notification_prefs,
         }
     }
@@ -36,7 +40,7 @@ async def get_settings_endpoint(
 @router.patch("/")
 async def update_settings_endpoint(
     request: Request,
-    business: Business = Depends(get_current_business),
+    business: BusinessSnapshot = Depends(get_current_business),
     db: AsyncSession = Depends(get_db),
 ):
     """Update business settings."""
@@ -44,9 +48,13 @@ async def update_settings_endpoint(
     allowed = {
         "name", "owner_name", "owner_email", "owner_phone",
         "business_hours", "services", "avg_job_value",
-        "ai_greeting", "ai_instructions", "notification_prefs", "timezone",
+        "ai_greeting", "ai_instructions", "ai_fallback_reply",
+        "notification_prefs", "timezone",
     }
     update_data = {k: v for k, v in body.items() if k in allowed}
     await update_business(db, business.id, **update_data)
+    if ASSISTANT_BUSINESS_FIELDS.intersection(update_data):
+        await schedule_assistant_sync(business)
 
-    return await get_settings_endpoint(business=business)
+    # The snapshot predates the update
+    return await get_settings_endpoint(business=replace(business, **update_data))
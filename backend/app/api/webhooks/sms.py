@@ -1,29 +1,56 @@
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import Response
-from sqlalchemy import update as sa_update
+from sqlalchemy import func, update as sa_update
 from sqlalchemy.ext.asyncio import AsyncSession
 from twilio.twiml.messaging_response import MessagingResponse
 
-from app.database import get_db
+from app.database import get_db, release_connection
 from app.models.message import Message
 from app.services.voice import (
     get_business_by_twilio_number,
-    get_active_conversation,
+    load_inbound_context,
     create_or_get_lead,
     create_conversation,
 )
-from app.services.sms import send_sms, save_message, handle_opt_out, handle_opt_in
-from app.services.ai_engine import generate_ai_response
+from app.config import get_settings
+from app.services.sms import save_message, handle_opt_out, handle_opt_in
+from app.services.ai_engine import fallback_reply
+from app.services.ai_turn import (
+    run_ai_turn,
+    enqueue_ai_turn,
+    start_burst,
+    record_ai_degradation,
+    unanswered_inbound,
+)
 from app.services.notifications import notify_owner
-from app.services.follow_up import cancel_pending_follow_ups, schedule_follow_up
+from app.services.follow_up import cancel_pending_follow_ups
+from app.services.idempotency import claim_webhook, release_webhook
+from app.services.rate_limit import admit_inbound_sms, claim_limit_notice
+from app.services.status_buffer import STATUS_WINDOW, advance_status, status_buffer
 
 router = APIRouter()
+settings = get_settings()
 
 
 @router.post("/incoming")
 async def sms_incoming(request: Request, db: AsyncSession = Depends(get_db)):
     """Handles all incoming SMS messages."""
     form = await request.form()
+    message_sid = form.get("MessageSid")
+
+    # Twilio retries slow webhooks; only the first delivery of a MessageSid
+    # gets processed (and billed for an AI turn)
+    if not await claim_webhook("sms", message_sid):
+        return Response(status_code=200)
+
+    try:
+        return await _handle_incoming_sms(db, form)
+    except Exception:
+        await release_webhook("sms", message_sid)
+        raise
+
+
+async def _handle_incoming_sms(db: AsyncSession, form) -> Response:
     from_number = form.get("From")
     to_number = form.get("To")
     body = form.get("Body", "").strip()
@@ -50,21 +77,24 @@ async def sms_incoming(request: Request, db: AsyncSession = Depends(get_db)):
         )
         return Response(content=str(response), media_type="application/xml")
 
-    # Find active conversation
-    conversation = await get_active_conversation(
-        db, business_id=business.id, phone=from_number
-    )
+    # Lead, active conversation, services and recent history in one query
+    context = await load_inbound_context(db, business, from_number)
+    conversation = context.conversation
 
     if not conversation:
-        lead = await create_or_get_lead(
-            db, business_id=business.id, phone=from_number, source="manual"
-        )
+        if not context.lead:
+            context.lead = await create_or_get_lead(
+                db, business_id=business.id, phone=from_number, source="manual"
+            )
         conversation = await create_conversation(
-            db, business_id=business.id, lead_id=lead.id
+            db, business_id=business.id, lead_id=context.lead.id
         )
+        context.conversation = conversation
 
-    # Save inbound message
-    await save_message(
+    # Save inbound message (None means this MessageSid is already stored —
+    # a retry that slipped past the Redis claim, or one whose first delivery
+    # failed after committing it)
+    message = await save_message(
         db,
         conversation_id=conversation.id,
         business_id=business.id,
@@ -73,6 +103,16 @@ async def sms_incoming(request: Request, db: AsyncSession = Depends(get_db)):
         body=body,
         twilio_message_sid=form.get("MessageSid"),
     )
+    if message is None:
+        # Answer from the stored row unless a turn already has
+        message = await unanswered_inbound(db, conversation.id, form.get("MessageSid"))
+        if message is None:
+            return Response(status_code=200)
+        body = message.body
+
+    # Everything below awaits Redis, OpenAI or Twilio; commit the inbound
+    # message now so the pooled connection isn't held across those calls
+    await release_connection(db)
 
     # Cancel any pending follow-ups
     await cancel_pending_follow_ups(conversation.id)
@@ -86,26 +126,33 @@ async def sms_incoming(request: Request, db: AsyncSession = Depends(get_db)):
         )
         return Response(status_code=200)
 
-    # AI Response
-    ai_response = await generate_ai_response(
-        db=db,
-        conversation=conversation,
-        business=business,
-        new_message=body,
-    )
-
-    await send_sms(
-        db,
-        to=from_number,
-        from_=business.twilio_number,
-        body=ai_response,
-        conversation_id=conversation.id,
-        business_id=business.id,
-    )
+    # Admission control (after STOP/START, which must always be honoured)
+    # throttles only the AI turn: an over-limit text is already stored and
+    # shown on the dashboard, and gets at most one canned reply
+    if not await admit_inbound_sms(business.id, from_number):
+        await record_ai_degradation(business.id, "sms_rate_limited")
+        if await claim_limit_notice(business.id, from_number):
+            response = MessagingResponse()
+            response.message(fallback_reply(business))
+            return Response(content=str(response), media_type="application/xml")
+        return Response(status_code=200)
 
-    # Schedule follow-up if no reply in 2 hours
-    await schedule_follow_up(
-        conversation_id=conversation.id, delay_minutes=120
+    # Burst coalescing: whichever request ends up owning the burst's AI turn
+    # reads this message, which is already committed
+    burst = await start_burst(conversation.id)
+
+    # Fast-ack: answer Twilio right away and run the AI turn in the
+    # background. Falls back to inline if the queue is full.
+    if settings.sms_fast_ack:
+        if enqueue_ai_turn(
+            conversation.id, business.twilio_number, from_number, body,
+            burst=burst, received_at=message.created_at,
+        ):
+            return Response(status_code=200)
+
+    await run_ai_turn(
+        db, conversation, business, from_number, body,
+        burst=burst, context=context, received_at=message.created_at,
     )
 
     return Response(status_code=200)
@@ -113,16 +160,29 @@ async def sms_incoming(request: Request, db: AsyncSession = Depends(get_db)):
 
 @router.post("/status")
 async def sms_status(request: Request, db: AsyncSession = Depends(get_db)):
-    """Twilio SMS delivery status callback."""
+    """
+    Twilio SMS delivery status callback.
+
+    Statuses are written in batches by the status buffer; the inline UPDATE
+    only runs if the buffer isn't running in this process.
+    """
     form = await request.form()
     message_sid = form.get("MessageSid")
     message_status = form.get("MessageStatus")
 
-    if message_sid and message_status:
+    if not (message_sid and message_status):
+        return Response(status_code=200)
+
+    if status_buffer.running:
+        status_buffer.add(message_sid, message_status)
+    else:
         await db.execute(
             sa_update(Message)
-            .where(Message.twilio_message_sid == message_sid)
-            .values(status=message_status)
+            .where(
+                Message.twilio_message_sid == message_sid,
+                Message.created_at >= func.now() - STATUS_WINDOW,
+            )
+            .values(status=advance_status(message_status))
         )
 
     return Response(status_code=200)
@@ -17,6 +17,7 @@ from sqlalchemy import select, update as sa_update
 
 from app.config import get_settings
 from app.database import async_session_factory
+from app.services.business_cache import invalidate_on_commit
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -83,6 +84,7 @@ async def _update_subscription_status(
             .where(Business.id == business.id)
             .values(subscription_status=status)
         )
+        invalidate_on_commit(db, business.id)
         await db.commit()
         logger.info(f"Business {business.id} subscription → {status}")
 
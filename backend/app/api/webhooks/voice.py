@@ -7,23 +7,28 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from twilio.twiml.voice_response import VoiceResponse
 
 from app.config import get_settings
-from app.database import get_db
+from app.database import get_db, release_connection
 from app.services.voice import (
     get_business_by_twilio_number,
     create_call_record,
     is_after_hours,
     get_call,
     update_call,
-    is_opted_out,
-    get_active_conversation,
     create_or_get_lead,
     create_conversation,
 )
 from app.services.sms import send_sms
 from app.services.notifications import notify_owner
 from app.services.follow_up import schedule_follow_up
-from app.services.lookup import detect_line_type, can_receive_sms
+from app.services.lookup import can_receive_sms
+from app.services.call_prefetch import (
+    resolve_caller_context,
+    start_caller_prefetch,
+    take_caller_context,
+)
 from app.services.vapi import transfer_call_to_vapi, VapiUnavailableError
+from app.services.vapi_call_cache import remember_live_call
+from app.services.idempotency import claim_webhook, release_webhook
 from app.models.call import Call
 from app.models.conversation import Conversation
 
@@ -55,6 +60,9 @@ async def voice_incoming(request: Request, db: AsyncSession = Depends(get_db)):
         is_after_hours=is_after_hours(business),
     )
 
+    # Resolve the caller's context while the business phone rings
+    start_caller_prefetch(form.get("CallSid"), business.id, from_number)
+
     response = VoiceResponse()
 
     # Two-party consent: brief recording disclosure before connecting
@@ -94,6 +102,20 @@ async def call_completed(
     4. If Vapi is unavailable, fall back to SMS text-back
     """
     form = await request.form()
+    call_sid = form.get("CallSid")
+
+    # A retried delivery must not text the caller or start a Vapi call twice
+    if not await claim_webhook("call-completed", call_sid):
+        return Response(content=str(VoiceResponse()), media_type="application/xml")
+
+    try:
+        return await _handle_call_completed(db, form, call_id)
+    except Exception:
+        await release_webhook("call-completed", call_sid)
+        raise
+
+
+async def _handle_call_completed(db: AsyncSession, form, call_id: str) -> Response:
     dial_status = form.get("DialCallStatus")
     caller_phone = form.get("From")
 
@@ -124,38 +146,50 @@ async def call_completed(
 
     # === MISSED CALL ===
     await update_call(db, call.id, status="missed")
+    # Don't hold a connection while waiting on the prefetch
+    await release_connection(db)
+
+    # Opt-out, line type, lead and active conversation were usually resolved
+    # during the ring; resolve inline if the prefetch isn't available
+    caller = await take_caller_context(form.get("CallSid"))
+    if caller is None:
+        caller = await resolve_caller_context(db, business.id, caller_phone)
 
     # Check if caller has opted out
-    if await is_opted_out(db, caller_phone, business.id):
+    if caller.opted_out:
         response = VoiceResponse()
         response.say("Sorry we missed your call. Please try again later.")
         return Response(content=str(response), media_type="application/xml")
 
-    # Detect line type (mobile, landline, voip)
-    line_type = await detect_line_type(caller_phone)
+    # Record line type (mobile, landline, voip)
+    line_type = caller.line_type
     await db.execute(
         sa_update(Call).where(Call.id == call.id).values(line_type=line_type)
     )
 
-    # Check for existing active conversation
-    existing_convo = await get_active_conversation(
-        db, business_id=business.id, phone=caller_phone
-    )
+    # Reuse the caller's active conversation if there is one
+    conversation = None
+    if caller.conversation_id:
+        conversation = await db.get(Conversation, caller.conversation_id)
 
-    if not existing_convo:
-        lead = await create_or_get_lead(
-            db, business_id=business.id, phone=caller_phone, source="missed_call"
-        )
+    if not conversation:
+        lead_id = caller.lead_id
+        if not lead_id:
+            lead = await create_or_get_lead(
+                db, business_id=business.id, phone=caller_phone, source="missed_call"
+            )
+            lead_id = lead.id
 
         conversation = await create_conversation(
             db,
             business_id=business.id,
-            lead_id=lead.id,
+            lead_id=lead_id,
             call_id=call.id,
             channel="voice",
         )
-    else:
-        conversation = existing_convo
+
+    # Commit the lead and conversation before calling out to Vapi / Twilio
+    await release_connection(db)
 
     # === TRY VOICE AI (PRIMARY) ===
     if settings.vapi_api_key and business.vapi_assistant_id:
@@ -172,6 +206,16 @@ async def call_completed(
                 .where(Call.id == call.id)
                 .values(vapi_call_id=vapi_call_id, voice_ai_used=True)
             )
+            await release_connection(db)
+
+            # Vapi's mid-call tool webhooks look the call up by our call ID
+            remember_live_call(
+                business,
+                call_id=call.id,
+                caller_phone=caller_phone,
+                conversation_id=conversation.id,
+                lead_id=conversation.lead_id,
+            )
 
             # Notify owner that AI is answering
             await notify_owner(
@@ -251,6 +295,8 @@ async def _sms_fallback(
             business_id=business.id,
         )
 
+        # send_sms left the outbound message pending
+        await release_connection(db)
         await schedule_follow_up(
             conversation_id=conversation.id, delay_minutes=120
         )
@@ -15,6 +15,9 @@ class Settings(BaseSettings):
     # Twilio
     twilio_account_sid: str = ""
     twilio_auth_token: str = ""
+    twilio_http_timeout_seconds: float = 10.0
+    twilio_http_retries: int = 2
+    twilio_http_pool_size: int = 20
 
     # OpenAI
     openai_api_key: str = ""
@@ -23,10 +26,67 @@ class Settings(BaseSettings):
     supabase_url: str = ""
     supabase_anon_key: str = ""
     supabase_service_role_key: str = ""
+    # Dashboard tokens are verified locally: HS256 with the project's JWT
+    # secret, or asymmetric keys from the project's JWKS endpoint
+    supabase_jwt_secret: str = ""
+    supabase_jwt_audience: str = "authenticated"
     database_url: str = ""
 
+    # Async engine / connection pool (per API process)
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 10.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    # asyncpg prepared statement cache (statements per connection)
+    db_statement_cache_size: int = 100
+    # Set when DATABASE_URL points at a transaction-mode pooler (PgBouncer,
+    # Supabase port 6543): disables prepared statement caching
+    db_pgbouncer_mode: bool = False
+    # Log every SQL statement (independent of DEBUG)
+    db_echo: bool = False
+    # Optional read replica for dashboard / report reads. A tenant reads from
+    # the primary for a few seconds after writing; a failing replica is
+    # skipped for DB_REPLICA_RETRY_SECONDS
+    database_replica_url: str = ""
+    db_replica_sticky_seconds: float = 5.0
+    db_replica_retry_seconds: float = 30.0
+    db_replica_connect_timeout_seconds: float = 2.0
+    # The opt-out index LISTENs for opt_outs changes, which needs a session
+    # connection: set DATABASE_LISTEN_URL to the direct (port 5432) URL when
+    # DATABASE_URL is a transaction pooler, or every opt-out check queries the
+    # database. Checks also go to the database once the listener misses two
+    # heartbeats
+    database_listen_url: str = ""
+    opt_out_index_heartbeat_seconds: float = 5.0
+
+    # messages / calls monthly partitions and retention (see app.services.partitions).
+    # Businesses keep DATA_RETENTION_MONTHS of history unless they set their own
+    partition_premake_months: int = 3
+    data_retention_months: int = 24
+    retention_delete_batch: int = 5000
+    # Twilio SIDs kept in the dedup ledger (retried webhooks arrive within hours)
+    twilio_sid_ledger_days: int = 30
+
     # Redis
     redis_url: str = "redis://localhost:6379/0"
+    redis_socket_timeout_seconds: float = 0.5
+    # Pub/sub subscribers ping this often; two silent intervals mean the
+    # subscription is dead and is reopened
+    redis_pubsub_heartbeat_seconds: float = 15.0
+
+    # Line-type lookup cache: known types are stable, "unknown" is re-checked sooner
+    line_type_cache_ttl_days: int = 90
+    line_type_unknown_ttl_hours: int = 24
+
+    # Webhook dedup: how long a provider ID (MessageSid, CallSid, Vapi call id)
+    # is remembered so retried deliveries are dropped
+    webhook_dedup_ttl_seconds: int = 86400
+
+    # Tenant routing cache (Twilio number -> business snapshot). Changes are
+    # broadcast to every API process on commit; the TTL only bounds staleness
+    # if that broadcast is lost
+    business_cache_ttl_seconds: int = 60
 
     # Email (Resend)
     resend_api_key: str = ""
@@ -50,6 +110,76 @@ class Settings(BaseSettings):
     # Follow-up delays in minutes (2 hours, 24 hours)
     follow_up_delay_minutes: str = "120,1440"
 
+    # Inbound SMS fast-ack: persist the message, return 200, and run the
+    # AI turn on a bounded background queue (ordered per conversation)
+    sms_fast_ack: bool = False
+    ai_turn_queue_workers: int = 8
+    ai_turn_queue_size: int = 200
+
+    # Coalesce rapid-fire inbound texts into one AI turn: wait this long after
+    # each text and only answer once the conversation goes quiet (0 disables)
+    sms_burst_window_seconds: float = 0.0
+
+    # SMS delivery status callbacks are coalesced per MessageSid and written
+    # in batches; statuses for rows not saved yet are held this long
+    sms_status_flush_ms: int = 500
+    sms_status_flush_batch: int = 200
+    sms_status_hold_seconds: float = 60.0
+
+    # Most recent messages sent to the model as conversation history
+    ai_history_messages: int = 40
+
+    # AI turn latency budget. Past the budget, or while the breaker is open
+    # after repeated OpenAI failures, the caller gets the business's fallback
+    # reply and the worker retries the turn later.
+    ai_turn_budget_seconds: float = 8.0
+    ai_breaker_failure_threshold: int = 5
+    ai_breaker_reset_seconds: float = 30.0
+    ai_retry_delay_seconds: int = 60
+    ai_fallback_template: str = (
+        "Thanks for your message! This is {business_name} — "
+        "we'll get right back to you."
+    )
+
+    # Missed-call prefetch: resolve caller context while the business phone
+    # rings. Note this runs a line-type lookup for answered calls too.
+    call_prefetch_enabled: bool = True
+    call_prefetch_ttl_seconds: int = 300
+    call_prefetch_wait_seconds: float = 3.0
+
+    # Background queue for owner notifications raised mid-call
+    notify_queue_workers: int = 4
+    notify_queue_size: int = 500
+
+    # Per-tenant admission control (token buckets: sustained rate per minute
+    # and burst size, per business and per caller phone)
+    rate_limit_enabled: bool = True
+    sms_business_rate_per_minute: float = 300
+    sms_business_burst: int = 100
+    sms_caller_rate_per_minute: float = 20
+    sms_caller_burst: int = 10
+    ai_business_rate_per_minute: float = 120
+    ai_business_burst: int = 40
+    ai_caller_rate_per_minute: float = 6
+    ai_caller_burst: int = 4
+    # An over-limit caller gets at most one canned reply per this many seconds
+    rate_limit_notice_seconds: int = 300
+
+    # Vapi mid-call tool lookups: how long a handed-off call's context is cached
+    vapi_live_call_ttl_seconds: int = 3600
+
+    # Vapi end-of-call reports: worker retries, how long a stored report
+    # may sit unfinished before the sweep re-queues it, and how long a worker's
+    # processing lease lasts (renewed before each side effect)
+    vapi_report_max_retries: int = 5
+    vapi_report_requeue_minutes: int = 10
+    vapi_report_lease_seconds: int = 300
+
+    # Vapi assistant sync: delay that coalesces config edits into one push,
+    # and how many assistants the fleet-wide reconfigure pushes at once
+    vapi_sync_debounce_seconds: int = 30
+    vapi_sync_concurrency: int = 5
+
     # Owner nudge delay (remind owner to call back qualified leads)
     owner_nudge_delay_minutes: int = 30
 
@@ -1,7 +1,22 @@
+import asyncio
+import logging
+import uuid
+from contextlib import asynccontextmanager
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import NullPool
 
 from app.config import get_settings
+from app.services import pool_metrics
+from app.services.cache import TTLCache
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -12,19 +27,63 @@ class Base(DeclarativeBase):
 # (needed so Alembic can import Base without asyncpg)
 _engine = None
 _async_session = None
+_replica_engine = None
+_replica_session = None
+
+
+def _async_database_url(database_url: str | None = None) -> str:
+    database_url = database_url or get_settings().database_url
+    if database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return database_url
+
+
+def _connect_args() -> dict:
+    settings = get_settings()
+    if settings.db_pgbouncer_mode:
+        # Transaction-mode PgBouncer / Supabase pooler: a server connection
+        # may change between statements, so named prepared statements can't
+        # be cached or reused
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    }
+
+
+def _create_pooled_engine(database_url: str, **connect_args):
+    settings = get_settings()
+    engine = create_async_engine(
+        database_url,
+        echo=settings.db_echo,
+        poolclass=pool_metrics.TimedAsyncQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={**_connect_args(), **connect_args},
+    )
+    pool_metrics.install(engine)
+    return engine
 
 
 def _get_engine():
     global _engine
     if _engine is None:
-        settings = get_settings()
-        database_url = settings.database_url
-        if database_url.startswith("postgresql://"):
-            database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-        _engine = create_async_engine(database_url, echo=settings.debug)
+        _engine = _create_pooled_engine(_async_database_url())
     return _engine
 
 
+def pool_status() -> dict:
+    """Occupancy and checkout stats of the shared engine's pool."""
+    return pool_metrics.pool_status(_get_engine())
+
+
 def _get_session_factory():
     global _async_session
     if _async_session is None:
@@ -34,12 +93,128 @@ def _get_session_factory():
     return _async_session
 
 
+def _get_replica_session_factory():
+    global _replica_engine, _replica_session
+    if _replica_session is None:
+        settings = get_settings()
+        _replica_engine = _create_pooled_engine(
+            _async_database_url(settings.database_replica_url),
+            timeout=settings.db_replica_connect_timeout_seconds,
+        )
+        _replica_session = async_sessionmaker(
+            _replica_engine, class_=AsyncSession, expire_on_commit=False
+        )
+    return _replica_session
+
+
 def async_session_factory():
     """Get a session factory for use outside of FastAPI dependency injection."""
     return _get_session_factory()()
 
 
-async def get_db() -> AsyncSession:
+@asynccontextmanager
+async def standalone_session():
+    """
+    Session on a throwaway unpooled engine, for async code a Celery task runs
+    with asyncio.run(). The shared engine's pool is bound to the API's loop.
+    """
+    engine = create_async_engine(
+        _async_database_url(), poolclass=NullPool, connect_args=_connect_args()
+    )
+    try:
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as session:
+            yield session
+    finally:
+        await engine.dispose()
+
+
+async def release_connection(db: AsyncSession) -> None:
+    """
+    Commit pending work so the session hands its pooled connection back
+    before we await a slow external service (OpenAI, Twilio, Vapi). The next
+    query checks out a fresh connection.
+    """
+    if db.in_transaction():
+        await db.commit()
+
+
+# ── Read replica ──────────────────────────────────────────────────────
+#
+# Read-only dashboard routes use get_read_db, which goes to DATABASE_REPLICA_URL
+# when set. A tenant's reads stay on the primary for DB_REPLICA_STICKY_SECONDS
+# after it writes (so replica lag never hides its own change), and a replica
+# that fails to connect is skipped for DB_REPLICA_RETRY_SECONDS.
+
+_replica_breaker = CircuitBreaker(
+    "db-replica",
+    failure_threshold=1,
+    reset_seconds=get_settings().db_replica_retry_seconds,
+)
+_recent_writers = TTLCache(maxsize=8192, ttl_seconds=get_settings().db_replica_sticky_seconds)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+def _sticky_key(business_id) -> str:
+    return f"db-sticky:{business_id}"
+
+
+async def _mark_tenant_write(business_id) -> None:
+    settings = get_settings()
+    _recent_writers.set(str(business_id), True)
+    try:
+        await get_async_redis().set(
+            _sticky_key(business_id), "1", px=int(settings.db_replica_sticky_seconds * 1000)
+        )
+    except Exception as e:
+        logger.warning(f"Failed to record write for replica stickiness: {e}")
+
+
+async def _wrote_recently(business_id) -> bool:
+    if _recent_writers.get(str(business_id)):
+        return True
+    try:
+        return bool(await get_async_redis().exists(_sticky_key(business_id)))
+    except Exception:
+        return True  # can't tell; the primary is always safe
+
+
+async def _open_read_session(business_id) -> AsyncSession:
+    if not get_settings().database_replica_url:
+        return _get_session_factory()()
+    if business_id is not None and await _wrote_recently(business_id):
+        return _get_session_factory()()
+    if not _replica_breaker.allow():
+        return _get_session_factory()()
+
+    session = _get_replica_session_factory()()
+    try:
+        # Connect now so a dead replica falls back here, not mid-handler
+        await session.connection()
+    except (OSError, SQLAlchemyError, asyncio.TimeoutError) as e:
+        _replica_breaker.record_failure()
+        logger.warning(f"Read replica unavailable, reading from primary: {e}")
+        await session.close()
+        return _get_session_factory()()
+    finally:
+        _replica_breaker.end_trial()
+    _replica_breaker.record_success()
+    return session
+
+
+async def get_db(request: Request) -> AsyncSession:
+    route = request.scope.get("route")
+    pool_metrics.set_route(getattr(route, "path", request.url.path))
     session_factory = _get_session_factory()
     async with session_factory() as session:
         try:
@@ -50,3 +225,22 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
+        # Set by get_current_business on dashboard routes
+        business_id = getattr(request.state, "business_id", None)
+        if session.info.get("wrote") and business_id and get_settings().database_replica_url:
+            await _mark_tenant_write(business_id)
+
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """
+    Session for read-only routes: the replica when one is configured and
+    healthy, otherwise the primary. Declare it after get_current_business so
+    the tenant's recent writes are known. Nothing is committed.
+    """
+    route = request.scope.get("route")
+    pool_metrics.set_route(getattr(route, "path", request.url.path))
+    session = await _open_read_session(getattr(request.state, "business_id", None))
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -1,5 +1,8 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.config import get_settings
 
@@ -26,14 +29,42 @@ from app.api.settings import router as settings_router
 from app.api.calls import router as calls_router
 from app.api.admin import router as admin_router
 from app.api.services import router as services_router
+from app.api.search import router as search_router
 from app.api.calendar import router as calendar_router
+from app.services.twilio_client import close_async_twilio_client
+from app.services.redis_client import close_async_redis
+from app.services.business_cache import start_invalidation_listener, stop_invalidation_listener
+from app.services.ai_turn import ai_turn_queue, stop_ai_turns
+from app.services.opt_out_index import opt_out_index
+from app.services.status_buffer import status_buffer
+from app.services.notifications import notification_queue
+from app.services.pagination import InvalidCursorError
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ai_turn_queue.start()
+    notification_queue.start()
+    opt_out_index.start()
+    status_buffer.start()
+    start_invalidation_listener()
+    yield
+    await stop_invalidation_listener()
+    await status_buffer.stop()
+    await opt_out_index.stop()
+    await stop_ai_turns()
+    await notification_queue.stop()
+    await close_async_twilio_client()
+    await close_async_redis()
+
+
 app = FastAPI(
     title="DialHook API",
     description="AI-Powered Missed Call Recovery for Service Businesses",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS — use ALLOWED_ORIGINS env var in production (comma-separated)
@@ -49,6 +80,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(status_code=400, content={"detail": "Invalid pagination cursor"})
+
+
 # Webhook routes (Twilio + Vapi)
 app.include_router(voice_router, prefix="/webhook/voice", tags=["Webhooks - Voice"])
 app.include_router(sms_router, prefix="/webhook/sms", tags=["Webhooks - SMS"])
@@ -64,6 +101,7 @@ app.include_router(calls_router, prefix="/api/calls", tags=["Calls"])
 app.include_router(reports_router, prefix="/api/reports", tags=["Reports"])
 app.include_router(settings_router, prefix="/api/settings", tags=["Settings"])
 app.include_router(services_router, prefix="/api/services", tags=["Services"])
+app.include_router(search_router, prefix="/api/search", tags=["Search"])
 app.include_router(calendar_router, prefix="/api/calendar", tags=["Calendar"])
 
 # Admin routes
@@ -1,4 +1,8 @@
 import logging
+import time
+
+import httpx
+import jwt
 from fastapi import Request, HTTPException, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,15 +10,74 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import get_settings
 from app.database import get_db
 from app.models.business import Business
+from app.services.business_cache import (
+    BusinessSnapshot,
+    cache_business_for_user,
+    cache_generation,
+    get_cached_business_for_user,
+)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Supabase signs with the project's JWT secret (HS256) or, with asymmetric
+# signing keys, with a key published at the project's JWKS endpoint
+_ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+_JWKS_MIN_REFRESH_SECONDS = 60
+
+_jwks: dict[str, jwt.PyJWK] = {}
+_jwks_fetched_at = 0.0
+
+
+async def _refresh_jwks() -> None:
+    global _jwks, _jwks_fetched_at
+    if time.monotonic() - _jwks_fetched_at < _JWKS_MIN_REFRESH_SECONDS:
+        return  # an unknown kid doesn't get to hammer the endpoint
+    _jwks_fetched_at = time.monotonic()
+    async with httpx.AsyncClient(timeout=5) as client:
+        resp = await client.get(f"{settings.supabase_url}/auth/v1/.well-known/jwks.json")
+        resp.raise_for_status()
+    _jwks = {
+        key["kid"]: jwt.PyJWK(key)
+        for key in resp.json().get("keys", [])
+        if key.get("kid")
+    }
+
+
+async def _signing_key(token: str):
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+    if algorithm == "HS256":
+        if not settings.supabase_jwt_secret:
+            raise jwt.InvalidTokenError("HS256 token but SUPABASE_JWT_SECRET is not set")
+        return settings.supabase_jwt_secret, algorithm
+    if algorithm not in _ASYMMETRIC_ALGORITHMS:
+        raise jwt.InvalidTokenError(f"Unsupported token algorithm {algorithm}")
+
+    kid = header.get("kid")
+    if kid not in _jwks:
+        await _refresh_jwks()
+    if kid not in _jwks:
+        raise jwt.InvalidTokenError("Unknown signing key")
+    return _jwks[kid].key, algorithm
+
+
+async def verify_token(token: str) -> dict:
+    """Verify a Supabase access token locally and return its claims."""
+    key, algorithm = await _signing_key(token)
+    return jwt.decode(
+        token,
+        key,
+        algorithms=[algorithm],
+        audience=settings.supabase_jwt_audience,
+        options={"require": ["exp", "sub"]},
+    )
+
 
 async def get_current_business(
     request: Request,
     db: AsyncSession = Depends(get_db),
-) -> Business:
+) -> BusinessSnapshot:
     """
     Extract business from JWT token.
     All downstream queries use this business_id for multi-tenant scoping.
@@ -24,7 +87,8 @@ async def get_current_business(
         result = await db.execute(select(Business).limit(1))
         business = result.scalar_one_or_none()
         if business:
-            return business
+            request.state.business_id = business.id
+            return BusinessSnapshot.from_model(business)
         raise HTTPException(
             status_code=503,
             detail="No business in database. Seed a test business first.",
@@ -35,23 +99,21 @@ async def get_current_business(
         raise HTTPException(status_code=401, detail="Missing authorization token")
 
     try:
-        from supabase import create_client
-
-        supabase_client = create_client(
-            settings.supabase_url, settings.supabase_service_role_key
-        )
-        user_response = supabase_client.auth.get_user(token)
-        user = user_response.user
-    except Exception as e:
+        claims = await verify_token(token)
+    except (jwt.PyJWTError, httpx.HTTPError) as e:
         logger.warning(f"Auth failed: {e}")
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    user_id = claims["sub"]
+    cached = get_cached_business_for_user(user_id)
+    if cached is not None:
+        request.state.business_id = cached.id
+        return cached
 
     # Map Supabase user to business
+    generation = cache_generation()
     result = await db.execute(
-        select(Business).where(Business.supabase_user_id == user.id)
+        select(Business).where(Business.supabase_user_id == user_id)
     )
     business = result.scalar_one_or_none()
 
@@ -60,4 +122,5 @@ async def get_current_business(
             status_code=403, detail="No business associated with this account"
         )
 
-    return business
+    request.state.business_id = business.id
+    return cache_business_for_user(user_id, business, generation)
@@ -12,6 +12,10 @@ from app.models.service import Service
 from app.models.calendar_integration import CalendarIntegration
 from app.models.voice_ai_config import VoiceAIConfig
 from app.models.owner_nudge import OwnerNudge
+from app.models.phone_line_type import PhoneLineType
+from app.models.vapi_call_report import VapiCallReport
+from app.models.call_transcript import CallTranscript
+from app.models.twilio_sid import TwilioSid
 
 __all__ = [
     "Business",
@@ -28,4 +32,8 @@ __all__ = [
     "CalendarIntegration",
     "VoiceAIConfig",
     "OwnerNudge",
+    "PhoneLineType",
+    "VapiCallReport",
+    "CallTranscript",
+    "TwilioSid",
 ]
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, Text, Boolean, ARRAY, DECIMAL, TIMESTAMP
+from sqlalchemy import String, Text, Boolean, Integer, ARRAY, DECIMAL, TIMESTAMP, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -44,6 +44,8 @@ class Business(Base):
     )
     ai_greeting: Mapped[str | None] = mapped_column(Text, nullable=True)
     ai_instructions: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Sent instead of an AI reply when the AI is slow or unavailable
+    ai_fallback_reply: Mapped[str | None] = mapped_column(Text, nullable=True)
     notification_prefs: Mapped[dict] = mapped_column(
         JSONB,
         nullable=False,
@@ -71,6 +73,8 @@ class Business(Base):
     two_party_consent_state: Mapped[bool] = mapped_column(
         Boolean, nullable=False, default=False
     )
+    # Months of messages / calls kept; None means DATA_RETENTION_MONTHS
+    data_retention_months: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow
     )
@@ -80,3 +84,11 @@ class Business(Base):
         default=datetime.utcnow,
         onupdate=datetime.utcnow,
     )
+
+    __table_args__ = (
+        Index(
+            "idx_businesses_stripe_customer",
+            "stripe_customer_id",
+            postgresql_where=text("stripe_customer_id IS NOT NULL"),
+        ),
+    )
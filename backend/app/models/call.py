@@ -9,6 +9,12 @@ from app.database import Base
 
 
 class Call(Base):
+    """
+    One inbound call. Range-partitioned by month on created_at (see
+    app.services.partitions), so the table's primary key is (id, created_at);
+    the ORM still identifies rows by id alone.
+    """
+
     __tablename__ = "calls"
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -17,7 +23,8 @@ class Call(Base):
     business_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False
     )
-    twilio_call_sid: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+    # Unique via the TwilioSid ledger; partitions can't enforce it globally
+    twilio_call_sid: Mapped[str] = mapped_column(Text, nullable=False)
     caller_phone: Mapped[str] = mapped_column(Text, nullable=False)
     status: Mapped[str] = mapped_column(Text, nullable=False, default="ringing")
     duration_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -25,12 +32,11 @@ class Call(Base):
     recording_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     transcription: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow
+        TIMESTAMP(timezone=True), primary_key=True, default=datetime.utcnow
     )
 
     # Voice AI fields
     voice_ai_used: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
-    voice_ai_transcript: Mapped[str | None] = mapped_column(Text, nullable=True)
     voice_ai_duration_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
     voice_ai_cost: Mapped[float | None] = mapped_column(DECIMAL(10, 4), nullable=True)
     line_type: Mapped[str] = mapped_column(Text, nullable=False, default="unknown")
@@ -39,4 +45,8 @@ class Call(Base):
     __table_args__ = (
         Index("idx_calls_business", "business_id", "created_at"),
         Index("idx_calls_caller", "caller_phone", "business_id"),
+        Index("idx_calls_business_status", "business_id", "status", "created_at"),
+        Index("idx_calls_twilio_sid", "twilio_call_sid"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Integer, LargeBinary, ForeignKey, TIMESTAMP, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class CallTranscript(Base):
+    """
+    Voice AI transcript for a call, kept out of the calls/conversations rows.
+
+    `turns` is zlib-compressed JSON: [{"role", "content", "seconds"}, ...].
+    Written once per call; read through app.services.transcripts.
+    """
+
+    __tablename__ = "call_transcripts"
+
+    # No foreign key (calls is partitioned); purged with its call under retention
+    call_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    business_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False
+    )
+    turns: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    turn_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Full-text index of the (uncompressed) transcript text
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow
+    )
+
+    __table_args__ = (
+        Index(
+            "idx_call_transcripts_fts",
+            "business_id",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        Index("idx_call_transcripts_business_created", "business_id", "created_at"),
+    )
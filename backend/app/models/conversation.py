@@ -20,9 +20,8 @@ class Conversation(Base):
     lead_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("leads.id"), nullable=False
     )
-    call_id: Mapped[uuid.UUID | None] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("calls.id"), nullable=True
-    )
+    # No foreign key: calls is partitioned, and its rows age out under retention
+    call_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
     status: Mapped[str] = mapped_column(Text, nullable=False, default="active")
     follow_up_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     next_follow_up_at: Mapped[datetime | None] = mapped_column(
@@ -31,7 +30,10 @@ class Conversation(Base):
     qualification_data: Mapped[dict] = mapped_column(JSONB, default=dict)
     channel: Mapped[str] = mapped_column(Text, nullable=False, default="sms")
     # voice, sms, mixed
-    voice_transcript: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # created_at of the newest inbound text an AI turn has answered
+    answered_through: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow
     )
@@ -44,6 +46,13 @@ class Conversation(Base):
 
     __table_args__ = (
         Index("idx_convos_business", "business_id", "status"),
+        Index("idx_convos_business_updated", "business_id", "updated_at", "id"),
+        Index("idx_convos_lead", "lead_id", "created_at"),
+        Index(
+            "idx_convos_call",
+            "call_id",
+            postgresql_where=text("call_id IS NOT NULL"),
+        ),
         Index(
             "idx_convos_followup",
             "next_follow_up_at",
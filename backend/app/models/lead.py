@@ -48,4 +48,9 @@ class Lead(Base):
     __table_args__ = (
         UniqueConstraint("business_id", "phone", name="uq_lead_business_phone"),
         Index("idx_leads_business_status", "business_id", "status"),
+        Index("idx_leads_business_updated", "business_id", "updated_at", "id"),
+        # Substring / fuzzy search (pg_trgm); see app.services.search
+        Index("idx_leads_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("idx_leads_address_trgm", "address", postgresql_using="gin", postgresql_ops={"address": "gin_trgm_ops"}),
+        Index("idx_leads_phone_trgm", "phone", postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"}),
     )
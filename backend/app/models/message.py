@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Text, ForeignKey, TIMESTAMP, Index
+from sqlalchemy import Text, ForeignKey, TIMESTAMP, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -9,6 +9,8 @@ from app.database import Base
 
 
 class Message(Base):
+    """One SMS. Partitioned by month like Call; the ORM keys rows by id."""
+
     __tablename__ = "messages"
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -25,12 +27,28 @@ class Message(Base):
         Text, nullable=False
     )  # caller, ai, human
     body: Mapped[str] = mapped_column(Text, nullable=False)
+    # Inbound SIDs are deduped through the TwilioSid ledger
     twilio_message_sid: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[str] = mapped_column(Text, nullable=False, default="sent")
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow
+        TIMESTAMP(timezone=True), primary_key=True, default=datetime.utcnow
     )
 
     __table_args__ = (
         Index("idx_messages_convo", "conversation_id", "created_at"),
+        Index("idx_messages_business_direction", "business_id", "direction", "created_at"),
+        Index(
+            "idx_messages_twilio_sid",
+            "twilio_message_sid",
+            postgresql_where=text("twilio_message_sid IS NOT NULL"),
+        ),
+        # Full-text search, per tenant (btree_gin); see app.services.search
+        Index(
+            "idx_messages_fts",
+            "business_id",
+            text("to_tsvector('english', body)"),
+            postgresql_using="gin",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Text, ForeignKey, TIMESTAMP, UniqueConstraint, Index
+from sqlalchemy import Text, ForeignKey, TIMESTAMP, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -25,5 +25,12 @@ class OptOut(Base):
 
     __table_args__ = (
         UniqueConstraint("phone", "business_id", name="uq_optout_phone_business"),
+        # The constraint above doesn't cover NULL: one global opt-out per phone
+        Index(
+            "uq_optout_phone_global",
+            "phone",
+            unique=True,
+            postgresql_where=text("business_id IS NULL"),
+        ),
         Index("idx_opt_outs_phone", "phone"),
     )
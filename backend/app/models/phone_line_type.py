@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import Text, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class PhoneLineType(Base):
+    """Cached Twilio Lookup result (line type is a property of the number, not the tenant)."""
+
+    __tablename__ = "phone_line_types"
+
+    phone: Mapped[str] = mapped_column(Text, primary_key=True)
+    line_type: Mapped[str] = mapped_column(Text, nullable=False)  # mobile, landline, voip, unknown
+    checked_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow
+    )
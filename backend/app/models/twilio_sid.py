@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Text, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class TwilioSid(Base):
+    """
+    Ledger of stored Twilio CallSids / MessageSids.
+
+    messages and calls are partitioned by month, so their SID columns can't
+    carry a global unique index; inserting here in the same transaction is
+    what makes a retried webhook fail with an IntegrityError instead.
+    Pruned after TWILIO_SID_LEDGER_DAYS.
+    """
+
+    __tablename__ = "twilio_sids"
+
+    sid: Mapped[str] = mapped_column(Text, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow
+    )
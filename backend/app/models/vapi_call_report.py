@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, Integer, Text, ForeignKey, TIMESTAMP, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class VapiCallReport(Base):
+    """Raw Vapi end-of-call report, stored on receipt and processed by the worker."""
+
+    __tablename__ = "vapi_call_reports"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    vapi_call_id: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    status: Mapped[str] = mapped_column(
+        Text, nullable=False, default="received"
+    )  # received, applied, done, failed
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    is_qualified: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    # Side effects (notifications, SMS, ...) already performed, so retries skip them
+    completed_steps: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Lease held by the Celery task chain working on the report (kept through
+    # its retry backoff); the sweep and other chains leave it alone until then
+    processing_until: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+    processing_owner: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow
+    )
+    processed_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        Index(
+            "idx_vapi_reports_pending",
+            "created_at",
+            postgresql_where=text("status IN ('received', 'applied')"),
+        ),
+    )
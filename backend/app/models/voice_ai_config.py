@@ -25,6 +25,11 @@ class VoiceAIConfig(Base):
     max_call_duration_seconds: Mapped[int] = mapped_column(
         Integer, nullable=False, default=300
     )
+    # sha256 of the assistant payload last pushed to the provider
+    synced_payload_hash: Mapped[str | None] = mapped_column(Text, nullable=True)
+    synced_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow
     )
@@ -1,32 +1,78 @@
+import asyncio
 import json
 import logging
 from datetime import datetime
 
 import pytz
-from openai import AsyncOpenAI
+from openai import APITimeoutError, AsyncOpenAI, OpenAIError
 from sqlalchemy import select, update as sa_update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.database import release_connection
 from app.models.business import Business
 from app.models.conversation import Conversation
 from app.models.lead import Lead
 from app.models.message import Message
 from app.models.service import Service
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.voice import InboundContext
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 _openai_client = None
+_openai_client_loop = None
+
+_openai_breaker = CircuitBreaker(
+    "openai",
+    failure_threshold=settings.ai_breaker_failure_threshold,
+    reset_seconds=settings.ai_breaker_reset_seconds,
+)
+
+
+class AIUnavailableError(Exception):
+    """Raised when an AI turn can't be answered within its latency budget."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason  # timeout, error, breaker_open, rate_limited, bad_output
 
 
 def _get_openai_client():
-    global _openai_client
-    if _openai_client is None:
-        _openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+    # The underlying httpx pool is bound to the loop that created it
+    # (Celery retries run under asyncio.run)
+    global _openai_client, _openai_client_loop
+    loop = asyncio.get_running_loop()
+    if _openai_client is None or _openai_client_loop is not loop:
+        _openai_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            timeout=settings.ai_turn_budget_seconds,
+        )
+        _openai_client_loop = loop
     return _openai_client
 
 
+async def close_openai_client() -> None:
+    """Close the httpx pool before its event loop goes away."""
+    global _openai_client, _openai_client_loop
+    if _openai_client is None:
+        return
+    try:
+        await _openai_client.close()
+    except Exception as e:
+        logger.warning(f"Failed to close OpenAI HTTP client: {e}")
+    _openai_client = None
+    _openai_client_loop = None
+
+
+def fallback_reply(business: Business) -> str:
+    """The business's canned reply for when the AI can't answer in time."""
+    return business.ai_fallback_reply or settings.ai_fallback_template.format(
+        business_name=business.name
+    )
+
+
 def _format_services_for_prompt(services: list[Service]) -> str:
     """Format services with pricing for the AI prompt."""
     if not services:
@@ -106,10 +152,13 @@ WHAT WE KNOW SO FAR:
 - Urgency: {lead.urgency or "Unknown"}
 - Address: {lead.address or "Unknown"}
 
-SIGNALS:
-- When lead is qualified (have service, name, address, preferred time): end with [QUALIFIED]
-- If caller is upset or has complex issue: end with [HUMAN_NEEDED]
-- If emergency (no heat in winter, gas smell, flooding, CO detector): end with [EMERGENCY]
+RESPONSE FORMAT:
+Reply with JSON matching the schema:
+- reply: the SMS text to send the customer
+- signals.qualified: true when the lead is qualified (have service, name, address, preferred time)
+- signals.human_needed: true if the caller is upset or has a complex issue
+- signals.emergency: true if emergency (no heat in winter, gas smell, flooding, CO detector)
+- lead: customer details explicitly stated in the conversation (null if not mentioned)
 
 STYLE:
 - Match the customer's energy
@@ -136,29 +185,23 @@ async def generate_ai_response(
     conversation: Conversation,
     business: Business,
     new_message: str,
+    context: InboundContext | None = None,
 ) -> str:
-    """Generate an AI response using OpenAI."""
-    # Load lead from DB
-    lead_result = await db.execute(
-        select(Lead).where(Lead.id == conversation.lead_id)
-    )
-    lead = lead_result.scalar_one_or_none() or Lead()
-
-    # Load active services for the business
-    services_result = await db.execute(
-        select(Service)
-        .where(Service.business_id == business.id, Service.is_active == True)
-        .order_by(Service.sort_order)
-    )
-    services = list(services_result.scalars().all())
-
-    # Load conversation history
-    msg_result = await db.execute(
-        select(Message)
-        .where(Message.conversation_id == conversation.id)
-        .order_by(Message.created_at.asc())
-    )
-    messages = msg_result.scalars().all()
+    """
+    Generate an AI response using OpenAI.
+
+    Pass the `InboundContext` the webhook already loaded to skip reloading
+    the lead, services and message history. Raises AIUnavailableError if
+    OpenAI misses the turn's latency budget, fails, is circuit-broken, or
+    returns something that can't be texted as-is (cut off, refused, not the
+    JSON we asked for, or an empty reply).
+    """
+    if context is not None:
+        lead = context.lead or Lead()
+        services = context.services
+        messages = context.messages
+    else:
+        lead, services, messages = await _load_turn_context(db, conversation, business)
 
     openai_messages = [
         {"role": "system", "content": build_system_prompt(business, lead, conversation, services)}
@@ -176,34 +219,108 @@ async def generate_ai_response(
         await db.execute(
             sa_update(Lead).where(Lead.id == lead.id).values(status="contacted")
         )
+        lead.status = "contacted"
 
-    client = _get_openai_client()
-    response = await client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=openai_messages,
-        max_tokens=200,
-        temperature=0.7,
-    )
+    # Don't hold a pooled connection while the model thinks
+    await release_connection(db)
+
+    # One structured completion returns the reply, signals and lead fields
+    response = await _complete(openai_messages)
+
+    try:
+        turn, reply = _parse_turn(response.choices[0])
+    except AIUnavailableError:
+        logger.warning(f"AI turn returned unusable output for conversation {conversation.id}")
+        raise
 
-    ai_text = response.choices[0].message.content.strip()
+    await _apply_lead_fields(db, lead, turn.get("lead") or {})
 
-    # Check for qualification signals
-    if "[QUALIFIED]" in ai_text:
-        ai_text = ai_text.replace("[QUALIFIED]", "").strip()
+    signals = turn.get("signals") or {}
+    if signals.get("qualified"):
         await _handle_qualified_lead(db, conversation, lead, business)
 
-    if "[HUMAN_NEEDED]" in ai_text:
-        ai_text = ai_text.replace("[HUMAN_NEEDED]", "").strip()
+    if signals.get("human_needed"):
         await _handle_human_needed(db, conversation, business)
 
-    if "[EMERGENCY]" in ai_text:
-        ai_text = ai_text.replace("[EMERGENCY]", "").strip()
+    if signals.get("emergency"):
         await _handle_emergency(db, conversation, lead, business)
 
-    # Extract qualification data via function calling
-    await _extract_qualification_data(db, lead, new_message)
+    return reply
 
-    return ai_text
+
+def _parse_turn(choice) -> tuple[dict, str]:
+    """The structured turn and its reply; raises rather than text out anything else."""
+    if choice.finish_reason != "stop":
+        # "length" leaves truncated JSON; a refusal has no content at all
+        raise AIUnavailableError("bad_output")
+    try:
+        turn = json.loads(choice.message.content or "")
+    except json.JSONDecodeError as e:
+        raise AIUnavailableError("bad_output") from e
+    if not isinstance(turn, dict):
+        raise AIUnavailableError("bad_output")
+    reply = turn.get("reply")
+    if not isinstance(reply, str) or not reply.strip():
+        raise AIUnavailableError("bad_output")
+    return turn, reply.strip()
+
+
+async def _complete(openai_messages: list[dict]):
+    if not _openai_breaker.allow():
+        raise AIUnavailableError("breaker_open")
+
+    client = _get_openai_client()
+    try:
+        response = await asyncio.wait_for(
+            client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=openai_messages,
+                max_tokens=300,
+                temperature=0.7,
+                response_format={"type": "json_schema", "json_schema": AI_TURN_SCHEMA},
+            ),
+            timeout=settings.ai_turn_budget_seconds,
+        )
+    except (asyncio.TimeoutError, APITimeoutError) as e:
+        _openai_breaker.record_failure()
+        raise AIUnavailableError("timeout") from e
+    except OpenAIError as e:
+        logger.warning(f"OpenAI completion failed: {e}")
+        _openai_breaker.record_failure()
+        raise AIUnavailableError("error") from e
+    finally:
+        # A trial cut short by anything else (e.g. cancellation) must not
+        # leave the breaker refusing every call
+        _openai_breaker.end_trial()
+
+    _openai_breaker.record_success()
+    return response
+
+
+async def _load_turn_context(
+    db: AsyncSession, conversation: Conversation, business: Business
+) -> tuple[Lead, list[Service], list[Message]]:
+    """Load the lead, active services and recent history for a conversation."""
+    lead_result = await db.execute(
+        select(Lead).where(Lead.id == conversation.lead_id)
+    )
+    lead = lead_result.scalar_one_or_none() or Lead()
+
+    services_result = await db.execute(
+        select(Service)
+        .where(Service.business_id == business.id, Service.is_active == True)
+        .order_by(Service.sort_order)
+    )
+    services = list(services_result.scalars().all())
+
+    msg_result = await db.execute(
+        select(Message)
+        .where(Message.conversation_id == conversation.id)
+        .order_by(Message.created_at.desc())
+        .limit(settings.ai_history_messages)
+    )
+    messages = list(reversed(msg_result.scalars().all()))
+    return lead, services, messages
 
 
 async def _match_service(
@@ -257,6 +374,8 @@ async def _handle_qualified_lead(
 
     from app.services.notifications import notify_owner
 
+    # Commit point: notify_owner awaits Twilio and Resend
+    await release_connection(db)
     await notify_owner(
         business=business,
         event="qualified_lead",
@@ -278,6 +397,8 @@ async def _handle_human_needed(
 
     from app.services.notifications import notify_owner
 
+    # Commit point: notify_owner awaits Twilio and Resend
+    await release_connection(db)
     await notify_owner(
         business=business,
         event="human_needed",
@@ -305,6 +426,8 @@ async def _handle_emergency(
 
     from app.services.notifications import notify_owner
 
+    # Commit point: notify_owner awaits Twilio and Resend
+    await release_connection(db)
     await notify_owner(
         business=business,
         event="emergency",
@@ -312,90 +435,74 @@ async def _handle_emergency(
     )
 
 
-EXTRACTION_FUNCTIONS = [
-    {
-        "name": "update_lead_info",
-        "description": "Extract customer information mentioned in the message",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "name": {
-                    "type": "string",
-                    "description": "Customer's name if mentioned",
-                },
-                "service_needed": {
-                    "type": "string",
-                    "description": "HVAC service or problem described",
-                },
-                "urgency": {
-                    "type": "string",
-                    "enum": ["low", "medium", "high", "emergency"],
-                    "description": "How urgent the request is",
-                },
-                "address": {
-                    "type": "string",
-                    "description": "Service address if mentioned",
+def _nullable_string(description: str) -> dict:
+    return {"type": ["string", "null"], "description": description}
+
+
+AI_TURN_SCHEMA = {
+    "name": "sms_turn",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "reply": {
+                "type": "string",
+                "description": "SMS text to send the customer",
+            },
+            "signals": {
+                "type": "object",
+                "properties": {
+                    "qualified": {"type": "boolean"},
+                    "human_needed": {"type": "boolean"},
+                    "emergency": {"type": "boolean"},
                 },
-                "preferred_time": {
-                    "type": "string",
-                    "description": "Preferred appointment time if mentioned",
+                "required": ["qualified", "human_needed", "emergency"],
+                "additionalProperties": False,
+            },
+            "lead": {
+                "type": "object",
+                "properties": {
+                    "name": _nullable_string("Customer's name if mentioned"),
+                    "service_needed": _nullable_string("HVAC service or problem described"),
+                    "urgency": {
+                        "type": ["string", "null"],
+                        "enum": ["low", "medium", "high", "emergency", None],
+                        "description": "How urgent the request is",
+                    },
+                    "address": _nullable_string("Service address if mentioned"),
+                    "preferred_time": _nullable_string("Preferred appointment time if mentioned"),
                 },
+                "required": ["name", "service_needed", "urgency", "address", "preferred_time"],
+                "additionalProperties": False,
             },
-            "required": [],
         },
-    }
-]
+        "required": ["reply", "signals", "lead"],
+        "additionalProperties": False,
+    },
+}
 
+LEAD_FIELDS = ("name", "service_needed", "urgency", "address", "preferred_time")
 
-async def _extract_qualification_data(
-    db: AsyncSession,
-    lead: Lead,
-    customer_message: str,
-) -> None:
-    """Use function calling to extract lead qualification data from messages."""
-    # Skip if already fully qualified
-    if lead.name and lead.service_needed and lead.address:
+
+async def _apply_lead_fields(db: AsyncSession, lead: Lead, data: dict) -> None:
+    """Fill in lead fields extracted this turn without overwriting known values."""
+    if lead.id is None:
         return
 
-    try:
-        client = _get_openai_client()
-        extraction = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Extract any customer information from this message. Only extract what is explicitly stated.",
-                },
-                {"role": "user", "content": customer_message},
-            ],
-            tools=[{"type": "function", "function": f} for f in EXTRACTION_FUNCTIONS],
-            tool_choice="auto",
-            max_tokens=150,
-        )
+    update_vals = {
+        field: data[field]
+        for field in LEAD_FIELDS
+        if data.get(field) and not getattr(lead, field)
+    }
+    if not update_vals:
+        return
 
-        if extraction.choices[0].message.tool_calls:
-            tool_call = extraction.choices[0].message.tool_calls[0]
-            data = json.loads(tool_call.function.arguments)
-
-            update_vals = {}
-            if data.get("name") and not lead.name:
-                update_vals["name"] = data["name"]
-            if data.get("service_needed") and not lead.service_needed:
-                update_vals["service_needed"] = data["service_needed"]
-            if data.get("urgency") and not lead.urgency:
-                update_vals["urgency"] = data["urgency"]
-            if data.get("address") and not lead.address:
-                update_vals["address"] = data["address"]
-            if data.get("preferred_time") and not lead.preferred_time:
-                update_vals["preferred_time"] = data["preferred_time"]
-
-            if update_vals:
-                # Progress lead status
-                if lead.status == "contacted":
-                    update_vals["status"] = "qualifying"
-
-                await db.execute(
-                    sa_update(Lead).where(Lead.id == lead.id).values(**update_vals)
-                )
-    except Exception as e:
-        logger.warning(f"Failed to extract qualification data: {e}")
+    # Progress lead status
+    if lead.status == "contacted":
+        update_vals["status"] = "qualifying"
+
+    await db.execute(
+        sa_update(Lead).where(Lead.id == lead.id).values(**update_vals)
+    )
+    for field, value in update_vals.items():
+        setattr(lead, field, value)
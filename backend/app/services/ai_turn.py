@@ -0,0 +1,461 @@
+"""
+AI reply turn for inbound SMS.
+
+A turn is: generate the AI reply, text it back, and schedule the no-reply
+follow-up. The SMS webhook either runs it inline or, in fast-ack mode, hands
+it to a bounded background queue that keeps turns for the same conversation
+in order.
+
+Burst coalescing: when SMS_BURST_WINDOW_SECONDS > 0, each inbound text bumps
+a per-conversation sequence number in Redis and its turn waits out the
+window (a queued turn is only submitted once the window closes, so the wait
+doesn't hold up the queue worker). Only the turn for the last text of a
+burst runs, under a distributed lock, and answers every inbound text newer
+than the conversation's answered_through mark. Each turn advances that mark
+to the newest text it answered, so a text that lands while a reply is being
+generated is left for the next turn.
+
+Degraded turns: if the AI misses its latency budget (or OpenAI is
+circuit-broken, or the business / caller is over its AI rate limit), the
+caller gets the business's fallback reply right away and the Celery worker
+retries the real reply after AI_RETRY_DELAY_SECONDS, unless the conversation
+has moved on by then.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import async_session_factory, release_connection, standalone_session
+from app.models.business import Business
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.services.ai_engine import AIUnavailableError, fallback_reply, generate_ai_response
+from app.services.follow_up import schedule_follow_up
+from app.services.rate_limit import admit_ai_turn
+from app.services.redis_client import get_async_redis, redis_lock
+from app.services.sms import send_sms
+from app.services.voice import InboundContext, get_business_by_twilio_number
+from app.services.work_queue import KeyedWorkQueue
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ai_turn_queue = KeyedWorkQueue(
+    "ai-turn",
+    workers=settings.ai_turn_queue_workers,
+    max_backlog=settings.ai_turn_queue_size,
+)
+
+# Coalesced turns waiting for their burst window to close before queueing
+_delayed_turns: set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True, slots=True)
+class BurstTicket:
+    """Position of one inbound text within a conversation's burst."""
+
+    seq: int
+    deadline: float  # time.time() at which the burst window closes
+
+
+def _burst_key(conversation_id: uuid.UUID) -> str:
+    return f"sms-burst:{conversation_id}"
+
+
+async def start_burst(conversation_id: uuid.UUID) -> BurstTicket | None:
+    """
+    Record an inbound text for burst coalescing.
+
+    Returns None when coalescing is disabled or Redis is unavailable, in
+    which case the turn runs immediately as before.
+    """
+    window = settings.sms_burst_window_seconds
+    if window <= 0:
+        return None
+    try:
+        r = get_async_redis()
+        async with r.pipeline(transaction=True) as pipe:
+            pipe.incr(_burst_key(conversation_id))
+            pipe.expire(_burst_key(conversation_id), int(window) + 300)
+            seq, _ = await pipe.execute()
+        return BurstTicket(seq=int(seq), deadline=time.time() + window)
+    except Exception as e:
+        logger.warning(f"Burst coalescing unavailable for {conversation_id}: {e}")
+        return None
+
+
+async def _is_latest_in_burst(conversation_id: uuid.UUID, ticket: BurstTicket) -> bool:
+    try:
+        current = await get_async_redis().get(_burst_key(conversation_id))
+    except Exception as e:
+        logger.warning(f"Burst check failed for {conversation_id}: {e}")
+        return True
+    return current is None or int(current) == ticket.seq
+
+
+def _unanswered(conversation_id: uuid.UUID):
+    """
+    Filter for inbound texts no turn has answered yet. Conversations that
+    predate answered_through count everything since the last outbound message.
+    """
+    answered_through = (
+        select(Conversation.answered_through)
+        .where(Conversation.id == conversation_id)
+        .scalar_subquery()
+    )
+    last_outbound = (
+        select(Message.created_at)
+        .where(
+            Message.conversation_id == conversation_id,
+            Message.direction == "outbound",
+        )
+        .order_by(Message.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    since = func.coalesce(answered_through, last_outbound)
+    return and_(
+        Message.conversation_id == conversation_id,
+        Message.direction == "inbound",
+        or_(Message.created_at > since, since.is_(None)),
+    )
+
+
+async def _pending_inbound(
+    db: AsyncSession, conversation_id: uuid.UUID
+) -> tuple[str, datetime] | None:
+    """
+    Inbound texts no turn has answered yet, joined oldest first, and the
+    newest one's created_at.
+    """
+    result = await db.execute(
+        select(Message.body, Message.created_at)
+        .where(_unanswered(conversation_id))
+        .order_by(Message.created_at.asc())
+    )
+    rows = result.all()
+    bodies = [body for body, _ in rows if body]
+    if not bodies:
+        return None
+    return "\n".join(bodies), rows[-1].created_at
+
+
+async def unanswered_inbound(
+    db: AsyncSession, conversation_id: uuid.UUID, message_sid: str | None
+) -> Message | None:
+    """
+    The stored inbound text with this MessageSid, if no turn has answered it.
+
+    For a webhook retry whose first delivery committed the text and then
+    failed before replying.
+    """
+    if not message_sid:
+        return None
+    return await db.scalar(
+        select(Message)
+        .where(_unanswered(conversation_id), Message.twilio_message_sid == message_sid)
+        .limit(1)
+    )
+
+
+async def _mark_answered(
+    db: AsyncSession, conversation_id: uuid.UUID, through: datetime
+) -> None:
+    """Advance answered_through to `through` (never backwards)."""
+    await db.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .values(answered_through=func.greatest(Conversation.answered_through, through))
+    )
+
+
+async def run_ai_turn(
+    db: AsyncSession,
+    conversation: Conversation,
+    business,
+    from_number: str,
+    body: str,
+    burst: BurstTicket | None = None,
+    context: InboundContext | None = None,
+    received_at: datetime | None = None,
+) -> None:
+    """
+    Generate and send the AI reply, then schedule the follow-up.
+
+    An immediate turn answers `body` and marks the conversation answered
+    through `received_at` (the text's created_at). `context` is only used
+    for an immediate turn; a coalesced turn reloads it since the history has
+    moved on by the time the burst closes.
+    """
+    if burst is None:
+        await _reply(db, conversation, business, from_number, body, context=context)
+        if received_at is not None:
+            await _mark_answered(db, conversation.id, received_at)
+        return
+
+    # Wait out the window; a later text in the same burst owns the turn
+    delay = burst.deadline - time.time()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    if not await _is_latest_in_burst(conversation.id, burst):
+        return
+
+    async with redis_lock(f"ai-turn:{conversation.id}"):
+        status = await db.scalar(
+            select(Conversation.status).where(Conversation.id == conversation.id)
+        )
+        if status == "human_active":
+            return
+        pending = await _pending_inbound(db, conversation.id)
+        if pending is None:
+            # Another turn already answered these messages
+            return
+        combined, newest = pending
+        await _reply(db, conversation, business, from_number, combined)
+        await _mark_answered(db, conversation.id, newest)
+        # Commit inside the lock so the next turn sees our reply
+        await db.commit()
+
+
+async def _reply(
+    db: AsyncSession,
+    conversation: Conversation,
+    business,
+    from_number: str,
+    body: str,
+    context: InboundContext | None = None,
+    degrade: bool = True,
+) -> None:
+    try:
+        if not await admit_ai_turn(business.id, from_number):
+            raise AIUnavailableError("rate_limited")
+        ai_response = await generate_ai_response(
+            db=db,
+            conversation=conversation,
+            business=business,
+            new_message=body,
+            context=context,
+        )
+    except AIUnavailableError as e:
+        if not degrade:
+            raise
+        await _reply_degraded(db, conversation, business, from_number, body, e.reason)
+        return
+
+    # Commit the turn's lead updates before texting: no connection is held
+    # while Twilio answers, and a Twilio failure doesn't lose them
+    await release_connection(db)
+    await send_sms(
+        db,
+        to=from_number,
+        from_=business.twilio_number,
+        body=ai_response,
+        conversation_id=conversation.id,
+        business_id=business.id,
+    )
+
+    # Schedule follow-up if no reply in 2 hours
+    await schedule_follow_up(
+        conversation_id=conversation.id, delay_minutes=120
+    )
+
+
+async def _reply_degraded(
+    db: AsyncSession,
+    conversation: Conversation,
+    business,
+    from_number: str,
+    body: str,
+    reason: str,
+) -> None:
+    """Send the fallback reply now and have the worker retry the AI turn."""
+    logger.warning(f"AI turn degraded ({reason}) for conversation {conversation.id}")
+    await release_connection(db)
+    fallback_sid = await send_sms(
+        db,
+        to=from_number,
+        from_=business.twilio_number,
+        body=fallback_reply(business),
+        conversation_id=conversation.id,
+        business_id=business.id,
+    )
+    await record_ai_degradation(business.id, reason)
+
+    try:
+        from app.worker.tasks import celery_app
+
+        celery_app.send_task(
+            "retry_ai_turn",
+            args=[str(conversation.id), from_number, body, fallback_sid],
+            countdown=settings.ai_retry_delay_seconds,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to schedule AI turn retry for {conversation.id}: {e}")
+
+
+def _degradation_key(day: date) -> str:
+    return f"ai-degraded:{day.isoformat()}"
+
+
+async def record_ai_degradation(business_id: uuid.UUID, reason: str) -> None:
+    """Count a degraded turn per business and reason for the day."""
+    try:
+        r = get_async_redis()
+        key = _degradation_key(date.today())
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.hincrby(key, f"{business_id}:{reason}", 1)
+            pipe.expire(key, 35 * 86400)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to record AI degradation: {e}")
+
+
+async def get_ai_degradation_counts(day: date) -> dict[str, dict[str, int]]:
+    """Degraded turns on `day` as {business_id: {reason: count}}."""
+    raw = await get_async_redis().hgetall(_degradation_key(day))
+    counts: dict[str, dict[str, int]] = {}
+    for field, value in raw.items():
+        business_id, reason = field.decode().rsplit(":", 1)
+        counts.setdefault(business_id, {})[reason] = int(value)
+    return counts
+
+
+async def retry_degraded_turn(
+    conversation_id: uuid.UUID,
+    from_number: str,
+    body: str,
+    fallback_sid: str,
+) -> None:
+    """
+    Answer a turn that only got the fallback reply. Skipped if anything was
+    said since the fallback (a later turn already answered) or a human has
+    taken over.
+    """
+    async with standalone_session() as db:
+        conversation = await db.get(Conversation, conversation_id)
+        if not conversation or conversation.status not in ("active", "follow_up"):
+            return
+
+        latest_sid = await db.scalar(
+            select(Message.twilio_message_sid)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.created_at.desc())
+            .limit(1)
+        )
+        if latest_sid != fallback_sid:
+            return
+
+        business = await db.get(Business, conversation.business_id)
+        if not business:
+            return
+
+        try:
+            await _reply(db, conversation, business, from_number, body, degrade=False)
+        except AIUnavailableError as e:
+            await record_ai_degradation(business.id, e.reason)
+            logger.warning(f"AI turn retry for {conversation_id} still degraded ({e.reason})")
+            await db.rollback()
+            return
+        await db.commit()
+
+
+async def _run_queued_ai_turn(
+    conversation_id: uuid.UUID,
+    twilio_number: str,
+    from_number: str,
+    body: str,
+    burst: BurstTicket | None = None,
+    received_at: datetime | None = None,
+) -> None:
+    async with async_session_factory() as db:
+        try:
+            business = await get_business_by_twilio_number(db, twilio_number)
+            conversation = await db.get(Conversation, conversation_id)
+            if not business or not conversation:
+                logger.warning(f"Queued AI turn dropped, conversation {conversation_id} not found")
+                return
+            # A human may have taken over while this turn was queued
+            if conversation.status == "human_active":
+                return
+
+            await run_ai_turn(
+                db, conversation, business, from_number, body,
+                burst=burst, received_at=received_at,
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def _enqueue_after_burst(
+    burst: BurstTicket,
+    conversation_id: uuid.UUID,
+    twilio_number: str,
+    from_number: str,
+    body: str,
+) -> None:
+    delay = burst.deadline - time.time()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    # A later text in the same burst owns the turn
+    if not await _is_latest_in_burst(conversation_id, burst):
+        return
+    args = (conversation_id, twilio_number, from_number, body)
+    try:
+        if not ai_turn_queue.submit(
+            str(conversation_id), _run_queued_ai_turn, *args, burst=burst
+        ):
+            # Backlog full: run it here; the turn's lock still serialises it
+            await _run_queued_ai_turn(*args, burst=burst)
+    except Exception as e:
+        logger.exception(f"Coalesced AI turn for {conversation_id} failed: {e}")
+
+
+def enqueue_ai_turn(
+    conversation_id: uuid.UUID,
+    twilio_number: str,
+    from_number: str,
+    body: str,
+    burst: BurstTicket | None = None,
+    received_at: datetime | None = None,
+) -> bool:
+    """
+    Queue an AI turn. Returns False if the backlog is full.
+
+    A coalesced turn is only submitted once its burst window closes, so the
+    wait doesn't stall the other conversations sharing its queue worker.
+    """
+    if burst is not None:
+        task = asyncio.create_task(
+            _enqueue_after_burst(burst, conversation_id, twilio_number, from_number, body),
+            name=f"ai-turn-burst-{conversation_id}",
+        )
+        _delayed_turns.add(task)
+        task.add_done_callback(_delayed_turns.discard)
+        return True
+
+    return ai_turn_queue.submit(
+        str(conversation_id),
+        _run_queued_ai_turn,
+        conversation_id,
+        twilio_number,
+        from_number,
+        body,
+        received_at=received_at,
+    )
+
+
+async def stop_ai_turns(timeout: float = 10.0) -> None:
+    """Let bursts still in their window queue their turn, then drain the queue."""
+    if _delayed_turns:
+        await asyncio.wait(set(_delayed_turns), timeout=timeout)
+    await ai_turn_queue.stop(timeout)
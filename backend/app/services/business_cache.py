@@ -0,0 +1,206 @@
+"""
+Tenant routing cache.
+
+Every Twilio webhook starts by resolving the business that owns the dialed
+number, and every dashboard request the business behind the signed-in
+Supabase user. Businesses change rarely, so we keep compact, ORM-free
+snapshots of them keyed by Twilio number and by Supabase user ID.
+
+Writers call `invalidate_on_commit(db, business_id)`. Once the session
+commits, the snapshots are dropped here and the ID is published on a Redis
+channel every API process listens to, so no process keeps serving the old
+row. A read that started before the commit can't re-cache what it loaded:
+each invalidation bumps a generation number, and a fill whose generation is
+out of date is skipped. The TTL only matters if a broadcast is lost; the
+listener also clears everything when it (re)subscribes.
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, fields
+
+import redis as redis_lib
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.business import Business
+from app.services.cache import TTLCache
+from app.services.redis_client import get_async_redis, listen, pubsub_client
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+CHANNEL = "business-cache"
+
+# session.info key: business IDs to invalidate when the session commits
+_PENDING = "invalidate_businesses"
+
+
+@dataclass(frozen=True, slots=True)
+class BusinessSnapshot:
+    """Read-only copy of the Business columns used on the request path."""
+
+    id: uuid.UUID
+    name: str
+    owner_name: str
+    owner_email: str
+    owner_phone: str
+    business_phone: str
+    twilio_number: str
+    timezone: str
+    business_hours: dict
+    services: list[str]
+    avg_job_value: float | None
+    ai_greeting: str | None
+    ai_instructions: str | None
+    ai_fallback_reply: str | None
+    notification_prefs: dict
+    subscription_status: str
+    vapi_assistant_id: str | None
+    google_place_id: str | None
+    call_recording_enabled: bool
+    two_party_consent_state: bool
+    data_retention_months: int | None
+
+    @classmethod
+    def from_model(cls, business: Business) -> "BusinessSnapshot":
+        return cls(**{f.name: getattr(business, f.name) for f in fields(cls)})
+
+
+_by_twilio_number = TTLCache(maxsize=4096, ttl_seconds=settings.business_cache_ttl_seconds)
+_by_user_id = TTLCache(maxsize=4096, ttl_seconds=settings.business_cache_ttl_seconds)
+_generation = 0
+_listener: asyncio.Task | None = None
+_broadcasts: set[asyncio.Task] = set()
+
+
+def cache_generation() -> int:
+    """Take before reading a business from the DB; pass to cache_business*."""
+    return _generation
+
+
+def get_cached_business(twilio_number: str) -> BusinessSnapshot | None:
+    return _by_twilio_number.get(twilio_number)
+
+
+def cache_business(business: Business, generation: int | None = None) -> BusinessSnapshot:
+    snapshot = BusinessSnapshot.from_model(business)
+    if generation is None or generation == _generation:
+        _by_twilio_number.set(snapshot.twilio_number, snapshot)
+    return snapshot
+
+
+def get_cached_business_for_user(supabase_user_id: str) -> BusinessSnapshot | None:
+    return _by_user_id.get(supabase_user_id)
+
+
+def cache_business_for_user(
+    supabase_user_id: str, business: Business, generation: int | None = None
+) -> BusinessSnapshot:
+    snapshot = BusinessSnapshot.from_model(business)
+    if generation is None or generation == _generation:
+        _by_user_id.set(supabase_user_id, snapshot)
+    return snapshot
+
+
+def invalidate_business(business_id: uuid.UUID | str | None = None) -> None:
+    """Drop this process's snapshots for one business, or everything if no ID is given."""
+    global _generation
+    _generation += 1
+    if business_id is None:
+        _by_twilio_number.clear()
+        _by_user_id.clear()
+        return
+
+    business_id = uuid.UUID(str(business_id))
+    for cache in (_by_twilio_number, _by_user_id):
+        stale = [key for key, snapshot in cache.items() if snapshot.id == business_id]
+        for key in stale:
+            cache.pop(key)
+
+
+# ── Invalidation on commit, broadcast to every process ────────────────
+
+
+def invalidate_on_commit(db: AsyncSession | Session, business_id: uuid.UUID | str) -> None:
+    """Invalidate `business_id` everywhere once `db` commits (nothing on rollback)."""
+    db.info.setdefault(_PENDING, set()).add(str(business_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    for business_id in pending:
+        invalidate_business(business_id)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _broadcast_sync(pending)  # Celery / sync session
+        return
+    task = loop.create_task(_broadcast(pending))
+    _broadcasts.add(task)
+    task.add_done_callback(_broadcasts.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+async def _broadcast(business_ids: set[str]) -> None:
+    try:
+        redis = get_async_redis()
+        for business_id in business_ids:
+            await redis.publish(CHANNEL, business_id)
+    except Exception as e:
+        logger.warning(f"Failed to broadcast business cache invalidation: {e}")
+
+
+def _broadcast_sync(business_ids: set[str]) -> None:
+    try:
+        with redis_lib.from_url(settings.redis_url) as redis:
+            for business_id in business_ids:
+                redis.publish(CHANNEL, business_id)
+    except Exception as e:
+        logger.warning(f"Failed to broadcast business cache invalidation: {e}")
+
+
+async def _listen_for_invalidations() -> None:
+    while True:
+        client = pubsub_client()
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(CHANNEL)
+            # Anything published while we weren't subscribed was missed
+            invalidate_business()
+            async for message in listen(pubsub):
+                invalidate_business(message["data"].decode())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Business cache invalidation channel down: {e}")
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+        await asyncio.sleep(5)
+
+
+def start_invalidation_listener() -> None:
+    global _listener
+    if _listener is None or _listener.done():
+        _listener = asyncio.create_task(
+            _listen_for_invalidations(), name="business-cache-invalidation"
+        )
+
+
+async def stop_invalidation_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.cancel()
+        await asyncio.gather(_listener, return_exceptions=True)
+        _listener = None
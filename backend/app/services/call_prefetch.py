@@ -0,0 +1,104 @@
+"""
+Missed-call context prefetch.
+
+voice_incoming rings the business for up to 20 seconds before
+call_completed learns whether the call was missed. We use that window to
+resolve everything the missed-call path needs about the caller (opt-out,
+line type, existing lead, active conversation) in a background task keyed by
+CallSid, so call_completed can hand off to Vapi or text back without a
+serial round of queries and a Twilio Lookup while the caller waits.
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import async_session_factory
+from app.models.lead import Lead
+from app.services.cache import TTLCache
+from app.services.lookup import detect_line_type
+from app.services.voice import get_active_conversation, is_opted_out
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# CallSid -> prefetch task. Entries outlive the ring window plus Twilio's
+# call-completed latency; answered calls just expire.
+_pending = TTLCache(maxsize=2048, ttl_seconds=settings.call_prefetch_ttl_seconds)
+
+
+@dataclass(frozen=True, slots=True)
+class CallerContext:
+    opted_out: bool
+    line_type: str
+    lead_id: uuid.UUID | None
+    conversation_id: uuid.UUID | None
+
+
+async def resolve_caller_context(
+    db: AsyncSession, business_id: uuid.UUID, phone: str
+) -> CallerContext:
+    """Look up what the missed-call path needs to know about a caller."""
+    if await is_opted_out(db, phone, business_id):
+        return CallerContext(opted_out=True, line_type="unknown", lead_id=None, conversation_id=None)
+
+    line_type = await detect_line_type(phone, db)
+    conversation = await get_active_conversation(db, business_id=business_id, phone=phone)
+    if conversation:
+        lead_id = conversation.lead_id
+    else:
+        lead_id = await db.scalar(
+            select(Lead.id).where(Lead.business_id == business_id, Lead.phone == phone)
+        )
+    return CallerContext(
+        opted_out=False,
+        line_type=line_type,
+        lead_id=lead_id,
+        conversation_id=conversation.id if conversation else None,
+    )
+
+
+async def _prefetch(business_id: uuid.UUID, phone: str) -> CallerContext:
+    async with async_session_factory() as db:
+        context = await resolve_caller_context(db, business_id, phone)
+        # Keep the phone_line_types write from detect_line_type
+        await db.commit()
+        return context
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Caller prefetch failed: {task.exception()}")
+
+
+def start_caller_prefetch(
+    call_sid: str | None, business_id: uuid.UUID, phone: str
+) -> None:
+    """Start resolving caller context in the background while the call rings."""
+    if not settings.call_prefetch_enabled or not call_sid:
+        return
+    task = asyncio.create_task(_prefetch(business_id, phone), name=f"prefetch-{call_sid}")
+    task.add_done_callback(_log_failure)
+    _pending.set(call_sid, task)
+
+
+async def take_caller_context(call_sid: str | None) -> CallerContext | None:
+    """
+    Claim the prefetched context for a call. Returns None if there is none
+    (different process, expired, or failed) so the caller resolves inline.
+    """
+    if not call_sid:
+        return None
+    task = _pending.pop(call_sid)
+    if task is None:
+        return None
+    try:
+        return await asyncio.wait_for(task, settings.call_prefetch_wait_seconds)
+    except Exception as e:
+        logger.warning(f"Caller prefetch for {call_sid} unavailable: {e!r}")
+        return None
@@ -0,0 +1,51 @@
+"""
+In-process circuit breaker for flaky upstream APIs.
+
+After `failure_threshold` consecutive failures the breaker opens and callers
+skip the upstream entirely for `reset_seconds`. The first call after that is
+let through as a trial: success closes the breaker, failure re-opens it.
+Callers end the trial in a `finally` (end_trial) so one that raises anything
+else lets the next call try again.
+"""
+
+import time
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Whether a call to the upstream should be attempted now."""
+        if self._opened_at is None:
+            return True
+        if self._trial_in_flight:
+            return False
+        if time.monotonic() - self._opened_at < self.reset_seconds:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def end_trial(self) -> None:
+        """Clear a trial that ended without a verdict (a no-op otherwise)."""
+        self._trial_in_flight = False
@@ -15,6 +15,8 @@ from app.models.daily_metric import DailyMetric
 from app.models.audit_log import AuditLog
 from app.models.review_request import ReviewRequest
 from app.models.service import Service
+from app.services.business_cache import invalidate_on_commit
+from app.services.pagination import DEFAULT_PAGE_SIZE, Page, fetch_page
 
 
 # ── Leads ──────────────────────────────────────────────────────────────
@@ -24,26 +26,23 @@ async def get_leads(
     db: AsyncSession,
     business_id: uuid.UUID,
     status: str | None = None,
-    page: int = 1,
-    per_page: int = 50,
-) -> list[Lead]:
-    offset = (page - 1) * per_page
-    query = (
-        select(Lead)
-        .where(Lead.business_id == business_id)
-        .order_by(Lead.updated_at.desc())
-        .limit(per_page)
-        .offset(offset)
-    )
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    query = select(Lead).where(Lead.business_id == business_id)
     if status:
         query = query.where(Lead.status == status)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    return await fetch_page(db, query, (Lead.updated_at, Lead.id), cursor, limit)
 
 
 async def get_lead_detail(
-    db: AsyncSession, business_id: uuid.UUID, lead_id: uuid.UUID
-) -> tuple[Lead, list[Conversation], list[Message]] | None:
+    db: AsyncSession,
+    business_id: uuid.UUID,
+    lead_id: uuid.UUID,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> tuple[Lead, list[Conversation], Page] | None:
+    """The lead, its conversations and one page of its messages (see _message_page)."""
     result = await db.execute(
         select(Lead).where(Lead.id == lead_id, Lead.business_id == business_id)
     )
@@ -58,20 +57,12 @@ async def get_lead_detail(
     )
     conversations = list(convos_result.scalars().all())
 
-    msgs_result = await db.execute(
-        select(Message)
-        .where(
-            Message.conversation_id.in_(
-                select(Conversation.id).where(
-                    Conversation.lead_id == lead_id,
-                    Conversation.business_id == business_id,
-                )
-            )
-        )
-        .order_by(Message.created_at.asc())
+    messages = await _message_page(
+        db,
+        Message.conversation_id.in_([c.id for c in conversations]),
+        cursor,
+        limit,
     )
-    messages = list(msgs_result.scalars().all())
-
     return lead, conversations, messages
 
 
@@ -104,17 +95,20 @@ async def get_conversations(
     db: AsyncSession,
     business_id: uuid.UUID,
     status: str | None = None,
-) -> list[tuple[Conversation, Lead]]:
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    """Page of (Conversation, Lead) rows, most recently active first."""
     query = (
         select(Conversation, Lead)
         .join(Lead, Conversation.lead_id == Lead.id)
         .where(Conversation.business_id == business_id)
-        .order_by(Conversation.updated_at.desc())
     )
     if status:
         query = query.where(Conversation.status == status)
-    result = await db.execute(query)
-    return list(result.all())
+    return await fetch_page(
+        db, query, (Conversation.updated_at, Conversation.id), cursor, limit, scalars=False
+    )
 
 
 async def get_conversation_detail(
@@ -129,15 +123,26 @@ async def get_conversation_detail(
     return result.scalar_one_or_none()
 
 
+async def _message_page(db: AsyncSession, condition, cursor: str | None, limit: int) -> Page:
+    """
+    Messages newest page first, with each page in chronological order so it
+    renders as a thread; next_cursor loads the page of earlier messages.
+    """
+    page = await fetch_page(
+        db, select(Message).where(condition), (Message.created_at, Message.id), cursor, limit
+    )
+    return Page(page.items[::-1], page.next_cursor)
+
+
 async def get_conversation_messages(
-    db: AsyncSession, conversation_id: uuid.UUID
-) -> list[Message]:
-    result = await db.execute(
-        select(Message)
-        .where(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at.asc())
+    db: AsyncSession,
+    conversation_id: uuid.UUID,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    return await _message_page(
+        db, Message.conversation_id == conversation_id, cursor, limit
     )
-    return list(result.scalars().all())
 
 
 async def update_conversation_status(
@@ -165,20 +170,13 @@ async def get_calls(
     db: AsyncSession,
     business_id: uuid.UUID,
     status: str | None = None,
-    limit: int = 50,
-    offset: int = 0,
-) -> list[Call]:
-    query = (
-        select(Call)
-        .where(Call.business_id == business_id)
-        .order_by(Call.created_at.desc())
-        .limit(limit)
-        .offset(offset)
-    )
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    query = select(Call).where(Call.business_id == business_id)
     if status:
         query = query.where(Call.status == status)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    return await fetch_page(db, query, (Call.created_at, Call.id), cursor, limit)
 
 
 # ── Appointments ───────────────────────────────────────────────────────
@@ -189,18 +187,23 @@ async def get_appointments(
     business_id: uuid.UUID,
     date_from: date | None = None,
     date_to: date | None = None,
-) -> list[Appointment]:
-    query = (
-        select(Appointment)
-        .where(Appointment.business_id == business_id)
-        .order_by(Appointment.scheduled_date.asc(), Appointment.scheduled_time.asc())
-    )
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    """Page of appointments in schedule order, earliest first."""
+    query = select(Appointment).where(Appointment.business_id == business_id)
     if date_from:
         query = query.where(Appointment.scheduled_date >= date_from)
     if date_to:
         query = query.where(Appointment.scheduled_date <= date_to)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    return await fetch_page(
+        db,
+        query,
+        (Appointment.scheduled_date, Appointment.scheduled_time, Appointment.id),
+        cursor,
+        limit,
+        descending=False,
+    )
 
 
 async def create_appointment(
@@ -420,6 +423,7 @@ async def update_business(
         .values(**fields)
     )
     await db.flush()
+    invalidate_on_commit(db, business_id)
 
 
 # ── Services ──────────────────────────────────────────────────────────
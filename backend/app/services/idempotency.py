@@ -0,0 +1,50 @@
+"""
+Webhook deduplication.
+
+Twilio and Vapi retry webhooks when we're slow to answer. The first delivery
+claims its provider ID (MessageSid, CallSid, Vapi call id) with a Redis
+SET NX; retries see the claim and short-circuit before touching the database
+or the LLM. If Redis is unreachable we fail open and rely on the database
+instead: storing a message or call also inserts its SID into the
+twilio_sids ledger, whose primary key rejects the duplicate.
+"""
+
+import logging
+
+from app.config import get_settings
+from app.services.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _key(kind: str, provider_id: str) -> str:
+    return f"webhook:{kind}:{provider_id}"
+
+
+async def claim_webhook(kind: str, provider_id: str | None) -> bool:
+    """Return True if this is the first delivery of `provider_id`."""
+    if not provider_id:
+        return True
+    try:
+        r = get_async_redis()
+        claimed = await r.set(
+            _key(kind, provider_id),
+            "1",
+            nx=True,
+            ex=settings.webhook_dedup_ttl_seconds,
+        )
+        return bool(claimed)
+    except Exception as e:
+        logger.warning(f"Webhook dedup unavailable for {kind} {provider_id}: {e}")
+        return True
+
+
+async def release_webhook(kind: str, provider_id: str | None) -> None:
+    """Drop a claim so a retry can reprocess a delivery we failed to handle."""
+    if not provider_id:
+        return
+    try:
+        await get_async_redis().delete(_key(kind, provider_id))
+    except Exception as e:
+        logger.warning(f"Failed to release webhook claim {kind} {provider_id}: {e}")
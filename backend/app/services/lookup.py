@@ -6,41 +6,122 @@ This affects post-call behavior:
 - Mobile: can send SMS confirmations and follow-ups
 - Landline: voice only, no SMS possible
 - VoIP: treat as mobile (most VoIP can receive SMS)
+
+Results are cached in-process and in the phone_line_types table, and line
+types we've already recorded on calls are reused, so repeat callers don't
+cost a Lookup (or a round trip while they wait on the line).
 """
 
 import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.models.call import Call
+from app.models.phone_line_type import PhoneLineType
+from app.services.cache import TTLCache
+from app.services.twilio_client import get_async_twilio_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-_twilio_client = None
+_KNOWN_TTL = timedelta(days=settings.line_type_cache_ttl_days)
+_UNKNOWN_TTL = timedelta(hours=settings.line_type_unknown_ttl_hours)
+
+_line_types = TTLCache(maxsize=10_000, ttl_seconds=_KNOWN_TTL.total_seconds())
+
 
+def _remember(phone_number: str, line_type: str) -> None:
+    ttl = _UNKNOWN_TTL if line_type == "unknown" else _KNOWN_TTL
+    _line_types.set(phone_number, line_type, ttl_seconds=ttl.total_seconds())
 
-def _get_twilio_client():
-    global _twilio_client
-    if _twilio_client is None:
-        from twilio.rest import Client
-        _twilio_client = Client(settings.twilio_account_sid, settings.twilio_auth_token)
-    return _twilio_client
+
+async def _cached_line_type(db: AsyncSession, phone_number: str) -> str | None:
+    """Line type from our own data, if we have a fresh one."""
+    row = await db.get(PhoneLineType, phone_number)
+    if row is not None:
+        ttl = _UNKNOWN_TTL if row.line_type == "unknown" else _KNOWN_TTL
+        if row.checked_at > datetime.now(timezone.utc) - ttl:
+            return row.line_type
+
+    # Repeat caller whose line type was recorded before the cache existed
+    result = await db.execute(
+        select(Call.line_type)
+        .where(
+            Call.caller_phone == phone_number,
+            Call.line_type != "unknown",
+            Call.created_at > func.now() - _KNOWN_TTL,
+        )
+        .order_by(Call.created_at.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _store_line_type(db: AsyncSession, phone_number: str, line_type: str) -> None:
+    stmt = pg_insert(PhoneLineType).values(phone=phone_number, line_type=line_type)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[PhoneLineType.phone],
+            set_={"line_type": stmt.excluded.line_type, "checked_at": func.now()},
+        )
+    )
 
 
-async def detect_line_type(phone_number: str) -> str:
+async def detect_line_type(phone_number: str, db: AsyncSession | None = None) -> str:
     """
-    Detect the line type of a phone number using Twilio Lookup API v2.
+    Detect the line type of a phone number.
 
-    Cost: ~$0.005 per lookup.
+    Checks the in-memory cache, then (with `db`) phone_line_types and past
+    calls, and only then Twilio Lookup API v2 (~$0.005 per lookup).
 
     Returns one of: "mobile", "landline", "voip", "unknown"
     """
-    if not settings.twilio_account_sid or not settings.twilio_auth_token:
+    line_type = _line_types.get(phone_number)
+    if line_type:
+        return line_type
+
+    if db is not None:
+        try:
+            # Savepoint: on Postgres a failed statement would otherwise abort
+            # the caller's whole transaction
+            async with db.begin_nested():
+                line_type = await _cached_line_type(db, phone_number)
+        except Exception as e:
+            logger.warning(f"Line type cache read failed for {phone_number}: {e}")
+        if line_type:
+            _remember(phone_number, line_type)
+            return line_type
+
+    line_type = await _lookup_line_type(phone_number)
+    if line_type is None:
         return "unknown"
 
+    _remember(phone_number, line_type)
+    if db is not None:
+        try:
+            async with db.begin_nested():
+                await _store_line_type(db, phone_number, line_type)
+        except Exception as e:
+            logger.warning(f"Line type cache write failed for {phone_number}: {e}")
+    return line_type
+
+
+async def _lookup_line_type(phone_number: str) -> str | None:
+    """
+    Query Twilio Lookup. Returns None when the lookup couldn't be made, so
+    transient failures aren't negatively cached.
+    """
+    if not settings.twilio_account_sid or not settings.twilio_auth_token:
+        return None
+
     try:
-        client = _get_twilio_client()
+        client = get_async_twilio_client()
         # Twilio Lookup v2 with line_type_intelligence add-on
-        result = client.lookups.v2.phone_numbers(phone_number).fetch(
+        result = await client.lookups.v2.phone_numbers(phone_number).fetch_async(
             fields="line_type_intelligence"
         )
 
@@ -66,7 +147,7 @@ async def detect_line_type(phone_number: str) -> str:
 
     except Exception as e:
         logger.warning(f"Twilio Lookup failed for {phone_number}: {e}")
-        return "unknown"
+        return None
 
 
 def can_receive_sms(line_type: str) -> bool:
@@ -1,14 +1,27 @@
+import asyncio
 import logging
+import uuid
 from datetime import datetime, time
 
 import pytz
 
 from app.config import get_settings
+from app.database import async_session_factory
 from app.models.business import Business
+from app.models.lead import Lead
+from app.services.work_queue import KeyedWorkQueue
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Owner notifications raised from latency-sensitive handlers (Vapi tool calls)
+# are sent from here instead of inline
+notification_queue = KeyedWorkQueue(
+    "notify",
+    workers=settings.notify_queue_workers,
+    max_backlog=settings.notify_queue_size,
+)
+
 
 def format_phone(phone: str) -> str:
     """Format phone number for display."""
@@ -42,10 +55,10 @@ async def notify_owner(business: Business, event: str, data: dict) -> None:
     # SMS notification (unless quiet hours — emergency overrides)
     if prefs.get("sms", True) and (not in_quiet or event == "emergency"):
         try:
-            from app.services.sms import _get_twilio_client
+            from app.services.twilio_client import get_async_twilio_client
 
-            client = _get_twilio_client()
-            client.messages.create(
+            client = get_async_twilio_client()
+            await client.messages.create_async(
                 to=business.owner_phone,
                 from_=business.twilio_number,
                 body=message,
@@ -59,18 +72,42 @@ async def notify_owner(business: Business, event: str, data: dict) -> None:
             import resend
 
             resend.api_key = settings.resend_api_key
-            resend.Emails.send(
+            # The Resend SDK is synchronous; keep it off the event loop
+            await asyncio.to_thread(
+                resend.Emails.send,
                 {
                     "from": settings.email_from_address,
                     "to": business.owner_email,
                     "subject": f"DialHook: {event.replace('_', ' ').title()}",
                     "text": message,
-                }
+                },
             )
         except Exception as e:
             logger.warning(f"Failed to send email notification: {e}")
 
 
+async def _notify_with_lead(
+    business: Business, event: str, data: dict, lead_id: uuid.UUID | None
+) -> None:
+    if lead_id is not None:
+        async with async_session_factory() as db:
+            data = {**data, "lead": await db.get(Lead, lead_id)}
+    await notify_owner(business=business, event=event, data=data)
+
+
+async def enqueue_owner_notification(
+    business: Business, event: str, data: dict, lead_id: uuid.UUID | None = None
+) -> None:
+    """
+    Notify the owner in the background. The lead, if any, is loaded by the
+    job so the caller doesn't need it. Sends inline if the queue is full.
+    """
+    if not notification_queue.submit(
+        str(business.id), _notify_with_lead, business, event, data, lead_id
+    ):
+        await _notify_with_lead(business, event, data, lead_id)
+
+
 def build_notification_message(event: str, data: dict, business: Business) -> str:
     """Build human-readable notification messages."""
     voice_ai = data.get("voice_ai", False)
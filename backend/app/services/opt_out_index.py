@@ -0,0 +1,168 @@
+"""
+In-process opt-out index.
+
+Every missed call and inbound text checks opt_outs, and the global opt-out
+(business_id IS NULL) makes that an OR across two keys. This keeps the whole
+table in memory as a set of (business_id, phone) pairs, loaded when the API
+starts and kept current by a trigger on opt_outs (migration 014) that
+pg_notify's every committed insert, update, delete and truncate — whether it
+came from this app, the dashboard or SQL run by hand.
+
+The listening connection is pinged every OPT_OUT_INDEX_HEARTBEAT_SECONDS.
+Postgres delivers pending notifications before it answers a query, so a
+successful ping means every opt-out committed before it has been applied.
+Lookups return None, and callers query the database, until the index is
+loaded, while the listener is down, and whenever the last ping is more than
+two heartbeats old: until then a silently dead connection can't be told
+apart from a quiet table.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+
+import asyncpg
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+
+from app.config import get_settings
+from app.database import async_session_factory
+from app.models.opt_out import OptOut
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+CHANNEL = "opt_outs"
+
+# Global opt-outs are stored under this business key
+_GLOBAL = None
+
+
+def _listen_dsn() -> str | None:
+    """Plain postgresql:// DSN for asyncpg, or None if LISTEN can't work."""
+    url = settings.database_listen_url
+    if not url:
+        if settings.db_pgbouncer_mode:
+            return None  # a transaction pooler drops LISTEN between statements
+        url = settings.database_url
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class OptOutIndex:
+    def __init__(self):
+        self._entries: set[tuple[str | None, str]] = set()
+        self._loaded = False
+        self._confirmed_at = 0.0  # time.monotonic() of the last successful ping
+        self._backlog: list[dict] | None = None  # changes seen while loading
+        self._reload = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        stale_after = 2 * settings.opt_out_index_heartbeat_seconds
+        return self._loaded and time.monotonic() - self._confirmed_at < stale_after
+
+    def lookup(self, phone: str, business_id: uuid.UUID | None) -> bool | None:
+        """True/False if the index is authoritative, None if callers must ask the DB."""
+        if not self.ready:
+            return None
+        return (
+            (_GLOBAL, phone) in self._entries
+            or (str(business_id), phone) in self._entries
+        )
+
+    def apply(self, op: str, phone: str, business_id: uuid.UUID | str | None) -> None:
+        key = (str(business_id) if business_id else _GLOBAL, phone)
+        if op == "add":
+            self._entries.add(key)
+        elif op == "remove":
+            self._entries.discard(key)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        change = json.loads(payload)
+        if change["op"] == "reload":
+            # opt_outs was truncated: start over from a fresh load
+            self._loaded = False
+            self._reload.set()
+        elif self._backlog is not None:
+            self._backlog.append(change)
+        else:
+            self.apply(change["op"], change["phone"], change["business_id"])
+
+    def _on_terminate(self, connection) -> None:
+        self._loaded = False
+
+    async def _load(self) -> None:
+        # Changes committed while the snapshot is read are replayed on top of
+        # it, in order; add/remove are idempotent, so any that the snapshot
+        # already contains are harmless
+        self._backlog = []
+        try:
+            async with async_session_factory() as db:
+                result = await db.execute(select(OptOut.phone, OptOut.business_id))
+                self._entries = {
+                    (str(business_id) if business_id else _GLOBAL, phone)
+                    for phone, business_id in result.all()
+                }
+            for change in self._backlog:
+                self.apply(change["op"], change["phone"], change["business_id"])
+        finally:
+            self._backlog = None
+        logger.info(f"Opt-out index loaded with {len(self._entries)} entries")
+
+    async def _heartbeat(self, conn: asyncpg.Connection) -> None:
+        interval = settings.opt_out_index_heartbeat_seconds
+        while True:
+            try:
+                await asyncio.wait_for(self._reload.wait(), interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            await conn.fetchval("SELECT 1", timeout=interval)
+            self._confirmed_at = time.monotonic()
+
+    async def _listen(self, dsn: str) -> None:
+        while True:
+            conn = None
+            self._reload.clear()
+            try:
+                conn = await asyncpg.connect(
+                    dsn, timeout=settings.opt_out_index_heartbeat_seconds, statement_cache_size=0
+                )
+                conn.add_termination_listener(self._on_terminate)
+                # Listen before loading so changes made during the load aren't lost
+                await conn.add_listener(CHANNEL, self._on_notify)
+                await self._load()
+                self._confirmed_at = time.monotonic()
+                self._loaded = True
+                await self._heartbeat(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Opt-out index unavailable, falling back to DB: {e!r}")
+            finally:
+                self._loaded = False
+                if conn is not None:
+                    conn.terminate()
+            if not self._reload.is_set():
+                await asyncio.sleep(5)
+
+    def start(self) -> None:
+        dsn = _listen_dsn()
+        if dsn is None:
+            logger.info("Opt-out index disabled (no LISTEN connection); checks query the DB")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen(dsn), name="opt-out-index")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._loaded = False
+
+
+opt_out_index = OptOutIndex()
@@ -0,0 +1,97 @@
+"""
+Keyset (cursor) pagination for dashboard list endpoints.
+
+Lists are ordered by a sort key plus the row ID as a tie-breaker, and the
+next page starts strictly after the last row returned — a row-value
+comparison the (business_id, sort key) indexes can seek to — so page N costs
+the same as page 1, and rows inserted meanwhile don't shift or repeat
+entries the way OFFSET does. The cursor is the last row's key values, JSON
+encoded and base64'd; clients pass it back unchanged.
+"""
+
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Any, Sequence
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+_PARSERS = {
+    datetime: datetime.fromisoformat,
+    date: date.fromisoformat,
+    time: time.fromisoformat,
+    uuid.UUID: uuid.UUID,
+}
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Page:
+    items: list
+    next_cursor: str | None
+
+
+def clamp_limit(limit: int | None) -> int:
+    return max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, (datetime, date, time)) else str(v) for v in values]
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> tuple:
+    """Parse a cursor back into values typed like `keys`' columns."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(raw, list) or len(raw) != len(keys):
+            raise ValueError("wrong number of cursor values")
+        return tuple(
+            _PARSERS[key.type.python_type](value) for key, value in zip(keys, raw)
+        )
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    keys: Sequence,
+    cursor: str | None,
+    limit: int,
+    descending: bool = True,
+    scalars: bool = True,
+) -> Page:
+    """
+    Run `query` one page at a time, ordered by `keys` (sort columns, then the
+    ID). For multi-entity queries (`scalars=False`) the keys belong to the
+    first entity in each row.
+    """
+    limit = clamp_limit(limit)
+    if cursor:
+        after = tuple_(*decode_cursor(cursor, keys))
+        query = query.where(tuple_(*keys) < after if descending else tuple_(*keys) > after)
+    query = query.order_by(
+        *(key.desc() if descending else key.asc() for key in keys)
+    ).limit(limit + 1)
+
+    result = await db.execute(query)
+    rows = list(result.scalars().all() if scalars else result.all())
+    if len(rows) <= limit:
+        return Page(rows, None)
+
+    rows = rows[:limit]
+    last = rows[-1] if scalars else rows[-1][0]
+    return Page(rows, encode_cursor([getattr(last, key.key) for key in keys]))
@@ -0,0 +1,205 @@
+"""
+Monthly partitions and retention for messages and calls.
+
+Both tables are range-partitioned on created_at, one partition per UTC
+month ({table}_YYYY_MM) plus a DEFAULT partition that only catches rows if
+partition creation ever falls behind. Dashboard and metrics queries filter
+on created_at, so they (and vacuum) only touch the months involved.
+
+The daily `maintain_partitions` beat task:
+
+1. creates partitions for this month and the next PARTITION_PREMAKE_MONTHS;
+2. detaches and drops month partitions that are past every business's
+   retention — DETACH ... CONCURRENTLY, so writers aren't blocked;
+3. deletes, in batches, the older rows of businesses whose own
+   data_retention_months is shorter than that (plus their call transcripts),
+   and prunes the Twilio SID ledger.
+
+Functions here take a synchronous Connection so the migration, the worker
+and tests can share them. Retention must run on an autocommit connection:
+DETACH CONCURRENTLY can't run in a transaction, and each delete batch
+commits on its own.
+"""
+
+import logging
+import re
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+PARTITIONED_TABLES = ("messages", "calls")
+
+# Rows purged per tenant: table -> key columns to delete by
+_PURGE_KEYS = {
+    "messages": "id, created_at",
+    "calls": "id, created_at",
+    "call_transcripts": "call_id",
+}
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month `months` after `day`'s month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def _create_partition(conn: Connection, table: str, month: date) -> str | None:
+    name = partition_name(table, month)
+    if conn.scalar(text("SELECT to_regclass(:name)"), {"name": name}) is not None:
+        return None
+    conn.execute(
+        text(
+            f"CREATE TABLE {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{add_months(month, 1)} 00:00:00+00')"
+        )
+    )
+    # Supabase exposes every public table; partitions are backend-only
+    conn.execute(text(f"ALTER TABLE {name} ENABLE ROW LEVEL SECURITY"))
+    return name
+
+
+def ensure_partitions(
+    conn: Connection, start: date | None = None, months_ahead: int | None = None
+) -> list[str]:
+    """
+    Create any missing month partitions from `start` (default: this month)
+    through `months_ahead` months from now, and the DEFAULT partitions.
+    Returns the names created.
+    """
+    this_month = month_start(datetime.utcnow().date())
+    month = month_start(start or this_month)
+    last = add_months(
+        this_month,
+        settings.partition_premake_months if months_ahead is None else months_ahead,
+    )
+
+    created = []
+    for table in PARTITIONED_TABLES:
+        default = f"{table}_default"
+        if conn.scalar(text("SELECT to_regclass(:name)"), {"name": default}) is None:
+            conn.execute(text(f"CREATE TABLE {default} PARTITION OF {table} DEFAULT"))
+            conn.execute(text(f"ALTER TABLE {default} ENABLE ROW LEVEL SECURITY"))
+            created.append(default)
+        current = month
+        while current <= last:
+            name = _create_partition(conn, table, current)
+            if name:
+                created.append(name)
+            current = add_months(current, 1)
+    return created
+
+
+def list_partitions(conn: Connection, table: str) -> dict[str, date]:
+    """Attached month partitions of `table`, name -> month."""
+    pattern = re.compile(rf"^{table}_(\d{{4}})_(\d{{2}})$")
+    names = conn.scalars(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table"
+        ),
+        {"table": table},
+    ).all()
+    partitions = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            partitions[name] = date(int(match[1]), int(match[2]), 1)
+    return partitions
+
+
+def expired_partitions(partitions: dict[str, date], cutoff: date) -> list[str]:
+    """Partitions whose whole month is before `cutoff`, oldest first."""
+    return sorted(
+        (name for name, month in partitions.items() if add_months(month, 1) <= cutoff),
+        key=partitions.get,
+    )
+
+
+def retention_horizon_months(conn: Connection) -> int:
+    """The longest retention any business has; whole months older than it can go."""
+    longest = conn.scalar(
+        text("SELECT max(coalesce(data_retention_months, :default)) FROM businesses"),
+        {"default": settings.data_retention_months},
+    )
+    return longest or settings.data_retention_months
+
+
+def drop_expired_partitions(conn: Connection, today: date | None = None) -> list[str]:
+    """Detach (concurrently) and drop partitions past every tenant's retention."""
+    today = today or datetime.utcnow().date()
+    cutoff = add_months(month_start(today), -retention_horizon_months(conn))
+
+    dropped = []
+    for table in PARTITIONED_TABLES:
+        for name in expired_partitions(list_partitions(conn, table), cutoff):
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name} CONCURRENTLY"))
+            conn.execute(text(f"DROP TABLE {name}"))
+            logger.info(f"Dropped expired partition {name}")
+            dropped.append(name)
+
+    # Transcripts of the calls that just went
+    _delete_in_batches(
+        conn, "call_transcripts", "created_at < :cutoff", {"cutoff": cutoff}
+    )
+    return dropped
+
+
+def _delete_in_batches(conn: Connection, table: str, condition: str, params: dict) -> int:
+    keys = _PURGE_KEYS[table]
+    total = 0
+    while True:
+        deleted = conn.execute(
+            text(
+                f"DELETE FROM {table} WHERE ({keys}) IN "
+                f"(SELECT {keys} FROM {table} WHERE {condition} LIMIT :batch)"
+            ),
+            {**params, "batch": settings.retention_delete_batch},
+        ).rowcount
+        total += deleted
+        if deleted < settings.retention_delete_batch:
+            return total
+
+
+def purge_tenant_rows(conn: Connection, today: date | None = None) -> int:
+    """
+    Delete rows older than each business's own retention where that is
+    shorter than the partition horizon. Returns the number of rows deleted.
+    """
+    today = today or datetime.utcnow().date()
+    horizon = retention_horizon_months(conn)
+    total = 0
+    for business_id, months in conn.execute(
+        text("SELECT id, data_retention_months FROM businesses")
+    ).all():
+        months = months or settings.data_retention_months
+        if months >= horizon:
+            continue  # covered by dropping whole partitions
+        params = {"business_id": business_id, "cutoff": add_months(today, -months)}
+        for table in _PURGE_KEYS:
+            total += _delete_in_batches(
+                conn, table, "business_id = :business_id AND created_at < :cutoff", params
+            )
+    return total
+
+
+def prune_sid_ledger(conn: Connection) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=settings.twilio_sid_ledger_days)
+    return conn.execute(
+        text("DELETE FROM twilio_sids WHERE created_at < :cutoff"), {"cutoff": cutoff}
+    ).rowcount
@@ -0,0 +1,146 @@
+"""
+Connection pool statistics.
+
+Every pooled connection checkout is tagged with the route that asked for it
+(set by get_db) and timed until it is checked back in. Long holds point at a
+handler keeping a transaction open across an external call.
+
+The engine's pool class (TimedAsyncQueuePool) also times how long each
+checkout takes to get a connection, and counts checkouts that found the pool
+exhausted and had to wait, or timed out.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+_route: ContextVar[str] = ContextVar("db_route", default="background")
+
+
+@dataclass(slots=True)
+class PoolHoldStats:
+    checkouts: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "avg_ms": round(self.total_seconds / self.checkouts * 1000, 1) if self.checkouts else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 1),
+        }
+
+
+@dataclass(slots=True)
+class CheckoutWaitStats:
+    checkouts: int = 0
+    waits: int = 0
+    timeouts: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds: float, waited: bool, timed_out: bool) -> None:
+        self.checkouts += 1
+        self.waits += waited
+        self.timeouts += timed_out
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+            "checkout_avg_ms": round(self.total_seconds / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+            "checkout_max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+
+_stats: dict[str, PoolHoldStats] = {}
+_checkout_stats = CheckoutWaitStats()
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """The default async pool, timing how long each checkout waits."""
+
+    def _do_get(self):
+        # No idle connection and no overflow left: this checkout will queue
+        waited = (
+            self._max_overflow > -1
+            and self.checkedin() == 0
+            and self.overflow() >= self._max_overflow
+        )
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            _checkout_stats.record(time.perf_counter() - started, waited, True)
+            raise
+        _checkout_stats.record(time.perf_counter() - started, waited, False)
+        return connection
+
+
+def set_route(route: str) -> None:
+    """Attribute connections checked out from this context to `route`."""
+    _route.set(route)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    connection_record.info["checked_out"] = (_route.get(), time.perf_counter())
+
+
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    checked_out = connection_record.info.pop("checked_out", None)
+    if checked_out is None:
+        return
+    route, started = checked_out
+    _stats.setdefault(route, PoolHoldStats()).record(time.perf_counter() - started)
+
+
+def install(engine: AsyncEngine) -> None:
+    """Start timing checkouts on the engine's pool."""
+    event.listen(engine.sync_engine, "checkout", _on_checkout)
+    event.listen(engine.sync_engine, "checkin", _on_checkin)
+
+
+def pool_hold_stats() -> dict[str, dict]:
+    """Checkout count and hold times per route, longest average first."""
+    return dict(
+        sorted(
+            ((route, s.as_dict()) for route, s in _stats.items()),
+            key=lambda item: item[1]["avg_ms"],
+            reverse=True,
+        )
+    )
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    """Live pool occupancy plus checkout wait stats (this process)."""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    status.update(_checkout_stats.as_dict())
+    return status
+
+
+def reset() -> None:
+    global _checkout_stats
+    _stats.clear()
+    _checkout_stats = CheckoutWaitStats()
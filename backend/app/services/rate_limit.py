@@ -0,0 +1,132 @@
+"""
+Per-tenant admission control.
+
+Token buckets keyed by business and by caller phone bound how much inbound
+SMS handling and how many AI turns one tenant (or one runaway sender) can
+consume. Each bucket holds up to `burst` tokens and refills at
+`rate_per_minute`. State lives in Redis so limits hold across API processes;
+if Redis is unavailable each process falls back to its own buckets, which
+keeps limiting in place (per process) rather than failing open.
+"""
+
+import logging
+import time
+
+from app.config import get_settings
+from app.services.cache import TTLCache
+from app.services.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# KEYS[1] bucket; ARGV rate (tokens/s), burst, now (s), cost. Returns 1 if admitted.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local admitted = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  admitted = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return admitted
+"""
+
+
+class TokenBucketLimiter:
+    def __init__(self, name: str, rate_per_minute: float, burst: int):
+        self.name = name
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        # key -> (tokens, updated at), used while Redis is unreachable
+        self._local = TTLCache(maxsize=8192, ttl_seconds=burst / self.rate + 1)
+        # Set while on local buckets, so the outage is logged once, not per call
+        self._local_mode = False
+
+    def _allow_local(self, key: str, cost: float) -> bool:
+        now = time.monotonic()
+        tokens, updated = self._local.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        admitted = tokens >= cost
+        self._local.set(key, (tokens - cost if admitted else tokens, now))
+        return admitted
+
+    async def allow(self, key: str, cost: float = 1) -> bool:
+        """Take `cost` tokens from `key`'s bucket if it has them."""
+        try:
+            script = get_async_redis().register_script(_TOKEN_BUCKET_LUA)
+            admitted = await script(
+                keys=[f"rl:{self.name}:{key}"],
+                args=[self.rate, self.burst, time.time(), cost],
+            )
+        except Exception as e:
+            if not self._local_mode:
+                self._local_mode = True
+                logger.warning(f"Rate limiter {self.name} using local buckets: {e}")
+            return self._allow_local(key, cost)
+        if self._local_mode:
+            self._local_mode = False
+            logger.info(f"Rate limiter {self.name} back on Redis")
+        return bool(admitted)
+
+
+sms_business_limiter = TokenBucketLimiter(
+    "sms-business", settings.sms_business_rate_per_minute, settings.sms_business_burst
+)
+sms_caller_limiter = TokenBucketLimiter(
+    "sms-caller", settings.sms_caller_rate_per_minute, settings.sms_caller_burst
+)
+ai_business_limiter = TokenBucketLimiter(
+    "ai-business", settings.ai_business_rate_per_minute, settings.ai_business_burst
+)
+ai_caller_limiter = TokenBucketLimiter(
+    "ai-caller", settings.ai_caller_rate_per_minute, settings.ai_caller_burst
+)
+
+
+async def _admit(business_limiter, caller_limiter, business_id, caller: str) -> bool:
+    if not settings.rate_limit_enabled:
+        return True
+    # Caller first, so one noisy sender doesn't drain the tenant's bucket
+    if not await caller_limiter.allow(f"{business_id}:{caller}"):
+        return False
+    return await business_limiter.allow(str(business_id))
+
+
+async def admit_inbound_sms(business_id, caller: str) -> bool:
+    """Whether an inbound text may be processed now."""
+    return await _admit(sms_business_limiter, sms_caller_limiter, business_id, caller)
+
+
+async def admit_ai_turn(business_id, caller: str) -> bool:
+    """Whether an AI reply may be generated now."""
+    return await _admit(ai_business_limiter, ai_caller_limiter, business_id, caller)
+
+
+_notices = TTLCache(maxsize=8192, ttl_seconds=settings.rate_limit_notice_seconds)
+
+
+async def claim_limit_notice(business_id, caller: str) -> bool:
+    """
+    True at most once per RATE_LIMIT_NOTICE_SECONDS per caller, so an
+    over-limit sender gets one canned reply rather than one per text.
+    """
+    key = f"rl-notice:{business_id}:{caller}"
+    try:
+        return bool(
+            await get_async_redis().set(
+                key, "1", nx=True, ex=settings.rate_limit_notice_seconds
+            )
+        )
+    except Exception:
+        if _notices.get(key):
+            return False
+        _notices.set(key, True)
+        return True
@@ -0,0 +1,112 @@
+"""
+Shared asyncio Redis client for the API process.
+
+Celery and follow-up scheduling keep using the sync client; this one is for
+request-path work (dedup keys, locks, counters) that must not block the loop.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import redis.asyncio as aioredis
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_client: aioredis.Redis | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Return a pooled Redis client bound to the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = aioredis.from_url(
+            settings.redis_url,
+            socket_timeout=settings.redis_socket_timeout_seconds,
+            socket_connect_timeout=settings.redis_socket_timeout_seconds,
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_async_redis() -> None:
+    global _client, _client_loop
+    if _client is not None:
+        try:
+            await _client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close Redis client: {e}")
+    _client = None
+    _client_loop = None
+
+
+def pubsub_client() -> aioredis.Redis:
+    """
+    Dedicated client for a long-lived subscription. It has no socket timeout
+    (the shared client's would cut off an idle subscription), so liveness
+    comes from TCP keepalive and the heartbeat in `listen`.
+    """
+    return aioredis.from_url(
+        settings.redis_url,
+        socket_connect_timeout=settings.redis_socket_timeout_seconds,
+        socket_keepalive=True,
+        health_check_interval=settings.redis_pubsub_heartbeat_seconds,
+    )
+
+
+async def listen(pubsub: aioredis.client.PubSub) -> AsyncIterator[dict]:
+    """
+    Yield published messages, pinging the server whenever the channel is
+    quiet. Raises ConnectionError if nothing, not even the pong, arrives for
+    two heartbeat intervals: a connection that died without an error would
+    otherwise look like a quiet channel forever.
+    """
+    interval = settings.redis_pubsub_heartbeat_seconds
+    last_seen = time.monotonic()
+    while True:
+        message = await pubsub.get_message(timeout=interval)
+        now = time.monotonic()
+        if message is not None:
+            last_seen = now
+            if message["type"] == "message":
+                yield message
+            continue
+        if now - last_seen > 2 * interval:
+            raise ConnectionError("Redis pub/sub heartbeat lost")
+        await pubsub.ping()
+
+
+@asynccontextmanager
+async def redis_lock(name: str, timeout: float = 60, blocking_timeout: float = 30):
+    """
+    Distributed lock across API processes. Yields True if the lock is held.
+
+    If Redis is down or the lock can't be acquired in `blocking_timeout`,
+    yields False and lets the caller proceed unlocked rather than drop work.
+    """
+    lock = None
+    acquired = False
+    try:
+        lock = get_async_redis().lock(
+            f"lock:{name}", timeout=timeout, blocking_timeout=blocking_timeout
+        )
+        acquired = await lock.acquire()
+        if not acquired:
+            logger.warning(f"Timed out waiting for lock {name}, proceeding unlocked")
+    except Exception as e:
+        logger.warning(f"Redis lock {name} unavailable: {e}")
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                await lock.release()
+            except Exception as e:
+                logger.warning(f"Failed to release lock {name}: {e}")
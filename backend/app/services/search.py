@@ -0,0 +1,205 @@
+"""
+Dashboard search over messages, voice transcripts and leads.
+
+Messages and transcripts use Postgres full-text search (websearch syntax:
+"quoted phrases", or, -exclusions) against per-tenant GIN indexes; lead
+name, address and phone use pg_trgm indexes so partial input ("elm st",
+"555-01") matches. Each kind is ranked on its own and capped at `limit`, and
+snippets are only built for the rows returned.
+"""
+
+import re
+import uuid
+
+from sqlalchemy import func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.call_transcript import CallTranscript
+from app.models.conversation import Conversation
+from app.models.lead import Lead
+from app.models.message import Message
+from app.services.transcripts import decompress_turns
+
+# Must match the indexed expressions (see the Message / CallTranscript models)
+_ENGLISH = literal_column("'english'")
+_HEADLINE_OPTIONS = "StartSel=**, StopSel=**, MaxWords=25, MinWords=8, MaxFragments=2"
+_SNIPPET_CHARS = 160
+
+
+def _tsquery(q: str):
+    return func.websearch_to_tsquery(_ENGLISH, q)
+
+
+def _lead_ref(lead_id, name, phone) -> dict | None:
+    if lead_id is None:
+        return None
+    return {"id": str(lead_id), "name": name, "phone": phone}
+
+
+async def search_messages(
+    db: AsyncSession, business_id: uuid.UUID, q: str, limit: int
+) -> list[dict]:
+    query = _tsquery(q)
+    document = func.to_tsvector(_ENGLISH, Message.body)
+    rank = func.ts_rank(document, query)
+    hits = (
+        select(
+            Message.id,
+            Message.conversation_id,
+            Message.body,
+            Message.sender_type,
+            Message.created_at,
+            rank.label("rank"),
+        )
+        .where(Message.business_id == business_id, document.bool_op("@@")(query))
+        .order_by(rank.desc(), Message.created_at.desc())
+        .limit(limit)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            hits.c.id,
+            hits.c.conversation_id,
+            hits.c.sender_type,
+            hits.c.created_at,
+            hits.c.rank,
+            func.ts_headline(_ENGLISH, hits.c.body, query, _HEADLINE_OPTIONS),
+            Lead.id,
+            Lead.name,
+            Lead.phone,
+        )
+        .join(Conversation, Conversation.id == hits.c.conversation_id)
+        .join(Lead, Lead.id == Conversation.lead_id)
+        .order_by(hits.c.rank.desc(), hits.c.created_at.desc())
+    )
+    return [
+        {
+            "id": str(message_id),
+            "conversation_id": str(conversation_id),
+            "sender_type": sender_type,
+            "snippet": snippet,
+            "rank": round(float(rank), 4),
+            "created_at": created_at.isoformat() if created_at else None,
+            "lead": _lead_ref(lead_id, name, phone),
+        }
+        for message_id, conversation_id, sender_type, created_at, rank, snippet, lead_id, name, phone in result.all()
+    ]
+
+
+def transcript_snippet(turns: list[dict], q: str) -> str:
+    """The first turn mentioning a query word, trimmed around the match."""
+    terms = [t for t in re.findall(r"\w+", q.lower()) if len(t) > 2]
+    pattern = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE) if terms else None
+
+    for turn in turns:
+        match = pattern.search(turn["content"]) if pattern else None
+        if match or pattern is None:
+            content = turn["content"]
+            start = max(0, (match.start() if match else 0) - _SNIPPET_CHARS // 2)
+            excerpt = content[start:start + _SNIPPET_CHARS]
+            if pattern:
+                excerpt = pattern.sub(lambda m: f"**{m.group(0)}**", excerpt)
+            prefix = "…" if start > 0 else ""
+            suffix = "…" if start + _SNIPPET_CHARS < len(content) else ""
+            return f"{turn['role']}: {prefix}{excerpt}{suffix}"
+
+    # Matched on a stemmed form only; show the opening line
+    return f"{turns[0]['role']}: {turns[0]['content'][:_SNIPPET_CHARS]}" if turns else ""
+
+
+async def search_transcripts(
+    db: AsyncSession, business_id: uuid.UUID, q: str, limit: int
+) -> list[dict]:
+    query = _tsquery(q)
+    rank = func.ts_rank(CallTranscript.search_vector, query)
+    result = await db.execute(
+        select(
+            CallTranscript.call_id,
+            CallTranscript.turns,
+            CallTranscript.created_at,
+            rank,
+            Conversation.id,
+            Lead.id,
+            Lead.name,
+            Lead.phone,
+        )
+        .outerjoin(Conversation, Conversation.call_id == CallTranscript.call_id)
+        .outerjoin(Lead, Lead.id == Conversation.lead_id)
+        .where(
+            CallTranscript.business_id == business_id,
+            CallTranscript.search_vector.bool_op("@@")(query),
+        )
+        .order_by(rank.desc(), CallTranscript.created_at.desc())
+        .limit(limit)
+    )
+    return [
+        {
+            "call_id": str(call_id),
+            "conversation_id": str(conversation_id) if conversation_id else None,
+            "snippet": transcript_snippet(decompress_turns(turns), q),
+            "rank": round(float(rank), 4),
+            "created_at": created_at.isoformat() if created_at else None,
+            "lead": _lead_ref(lead_id, name, phone),
+        }
+        for call_id, turns, created_at, rank, conversation_id, lead_id, name, phone in result.all()
+    ]
+
+
+def _like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+async def search_leads(
+    db: AsyncSession, business_id: uuid.UUID, q: str, limit: int
+) -> list[dict]:
+    # Plain ILIKE on the raw columns so the trigram indexes apply
+    pattern = _like_pattern(q)
+    conditions = [
+        Lead.name.ilike(pattern, escape="\\"),
+        Lead.address.ilike(pattern, escape="\\"),
+    ]
+    digits = re.sub(r"\D", "", q)
+    if len(digits) >= 3:
+        conditions.append(Lead.phone.like(f"%{digits}%"))
+
+    rank = func.greatest(
+        func.similarity(func.coalesce(Lead.name, ""), q),
+        func.similarity(func.coalesce(Lead.address, ""), q),
+    )
+    result = await db.execute(
+        select(Lead, rank)
+        .where(Lead.business_id == business_id, or_(*conditions))
+        .order_by(rank.desc(), Lead.updated_at.desc())
+        .limit(limit)
+    )
+
+    needle = q.lower()
+    hits = []
+    for lead, score in result.all():
+        if lead.name and needle in lead.name.lower():
+            matched = "name"
+        elif lead.address and needle in lead.address.lower():
+            matched = "address"
+        else:
+            matched = "phone"
+        hits.append({
+            "id": str(lead.id),
+            "name": lead.name,
+            "phone": lead.phone,
+            "address": lead.address,
+            "status": lead.status,
+            "matched": matched,
+            "rank": round(float(score), 4),
+        })
+    return hits
+
+
+async def search(
+    db: AsyncSession, business_id: uuid.UUID, q: str, limit: int = 20
+) -> dict:
+    return {
+        "leads": await search_leads(db, business_id, q, limit),
+        "messages": await search_messages(db, business_id, q, limit),
+        "transcripts": await search_transcripts(db, business_id, q, limit),
+    }
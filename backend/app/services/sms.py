@@ -1,29 +1,21 @@
 import uuid
 import logging
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from twilio.rest import Client
 
 from app.config import get_settings
 from app.models.message import Message
 from app.models.opt_out import OptOut
 from app.models.conversation import Conversation
 from app.models.lead import Lead
+from app.models.twilio_sid import TwilioSid
+from app.services.twilio_client import get_async_twilio_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Lazy init — only create client when credentials exist
-_twilio_client: Client | None = None
-
-
-def _get_twilio_client() -> Client:
-    global _twilio_client
-    if _twilio_client is None:
-        _twilio_client = Client(settings.twilio_account_sid, settings.twilio_auth_token)
-    return _twilio_client
-
 
 async def send_sms(
     db: AsyncSession,
@@ -34,9 +26,15 @@ async def send_sms(
     business_id: uuid.UUID,
     sender_type: str = "ai",
 ) -> str:
-    """Send an SMS via Twilio and save to database."""
-    client = _get_twilio_client()
-    message = client.messages.create(
+    """
+    Send an SMS via Twilio and save to database.
+
+    Nothing is committed here: the outbound message is left pending on `db`.
+    Callers commit (release_connection) before calling if they don't want a
+    connection held while Twilio answers.
+    """
+    client = get_async_twilio_client()
+    message = await client.messages.create_async(
         to=to,
         from_=from_,
         body=body,
@@ -64,8 +62,14 @@ async def save_message(
     sender_type: str,
     body: str,
     twilio_message_sid: str | None = None,
-) -> Message:
-    """Save a message record to the database."""
+) -> Message | None:
+    """
+    Save a message record to the database.
+
+    Returns None if an inbound message with this Twilio SID is already stored
+    (a retried webhook delivery). A new inbound message also bumps the
+    conversation's updated_at, which orders the dashboard list.
+    """
     message = Message(
         conversation_id=conversation_id,
         business_id=business_id,
@@ -75,6 +79,20 @@ async def save_message(
         twilio_message_sid=twilio_message_sid,
         status="received" if direction == "inbound" else "sent",
     )
+    if direction == "inbound" and twilio_message_sid:
+        try:
+            async with db.begin_nested():
+                db.add_all([TwilioSid(sid=twilio_message_sid), message])
+        except IntegrityError:
+            logger.info(f"Duplicate inbound message {twilio_message_sid}, skipping")
+            return None
+        await db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(updated_at=func.now())
+        )
+        return message
+
     db.add(message)
     await db.flush()
     return message
@@ -83,7 +101,12 @@ async def save_message(
 async def handle_opt_out(
     db: AsyncSession, phone: str, business_id: uuid.UUID
 ) -> None:
-    """Handle STOP keyword — add to opt-out list, close conversations."""
+    """
+    Handle STOP keyword — add to opt-out list, close conversations.
+
+    The opt-out index hears about it from the opt_outs trigger once the
+    caller commits.
+    """
     # Add opt-out record (ignore if already exists)
     existing = await db.execute(
         select(OptOut.id).where(
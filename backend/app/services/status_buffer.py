@@ -0,0 +1,164 @@
+"""
+Write-behind buffer for SMS delivery status callbacks.
+
+Twilio sends 2-4 status callbacks per outbound text (queued, sent,
+delivered, ...). Instead of one UPDATE per callback, the status webhook drops
+each into this buffer, which keeps only the most advanced status per
+MessageSid and writes them all in one batched UPDATE every
+SMS_STATUS_FLUSH_MS or once SMS_STATUS_FLUSH_BATCH SIDs are waiting.
+
+Callbacks for one SID can be split across flushes, so the UPDATE also
+ranks the stored status against the new one and only ever moves it forward:
+a late "sent" never overwrites "delivered".
+
+A callback can beat send_sms to the database (the row is saved after Twilio
+answers). SIDs that match no row, and whole batches whose flush failed, are
+retried on later flushes for up to SMS_STATUS_HOLD_SECONDS.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+from sqlalchemy import Text, case, column, func, literal, update, values
+
+from app.config import get_settings
+from app.database import async_session_factory
+from app.models.message import Message
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Callbacks only concern recent texts; bounding created_at lets the UPDATE
+# skip all but the latest monthly partitions of messages
+STATUS_WINDOW = timedelta(days=7)
+
+# Later states win when callbacks for one SID are coalesced (or arrive out of order)
+_STATUS_RANK = {
+    "accepted": 0,
+    "scheduled": 0,
+    "queued": 1,
+    "sending": 2,
+    "sent": 3,
+    "receiving": 3,
+    "received": 4,
+    "delivered": 5,
+    "undelivered": 5,
+    "failed": 5,
+    "canceled": 5,
+    "read": 6,
+}
+
+
+def _rank(status):
+    return case(_STATUS_RANK, value=status, else_=0)
+
+
+def advance_status(new_status):
+    """SET value for Message.status that moves it forward to `new_status`, never back."""
+    if isinstance(new_status, str):
+        new_status = literal(new_status, Text)
+    return case(
+        (_rank(new_status) >= _rank(Message.status), new_status),
+        else_=Message.status,
+    )
+
+
+class MessageStatusBuffer:
+    def __init__(self, flush_ms: int, batch_size: int, hold_seconds: float):
+        self.flush_seconds = flush_ms / 1000
+        self.batch_size = batch_size
+        self.hold_seconds = hold_seconds
+        # sid -> (status, first seen)
+        self._pending: dict[str, tuple[str, float]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, sid: str, status: str) -> None:
+        current = self._pending.get(sid)
+        if current is None:
+            self._pending[sid] = (status, time.monotonic())
+        elif _STATUS_RANK.get(status, 0) >= _STATUS_RANK.get(current[0], 0):
+            self._pending[sid] = (status, current[1])
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write buffered statuses. Returns how many SIDs were applied."""
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+
+        rows = values(
+            column("sid", Text), column("status", Text), name="status_updates"
+        ).data([(sid, status) for sid, (status, _) in batch.items()])
+        try:
+            async with async_session_factory() as db:
+                result = await db.execute(
+                    update(Message)
+                    .where(
+                        Message.twilio_message_sid == rows.c.sid,
+                        Message.created_at >= func.now() - STATUS_WINDOW,
+                    )
+                    .values(status=advance_status(rows.c.status))
+                    .returning(Message.twilio_message_sid)
+                )
+                applied = set(result.scalars().all())
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"SMS status flush failed, will retry: {e}")
+            self._requeue(batch)
+            return 0
+
+        self._requeue({sid: entry for sid, entry in batch.items() if sid not in applied})
+        return len(applied)
+
+    def _requeue(self, entries: dict[str, tuple[str, float]]) -> None:
+        # Entries held past hold_seconds are dropped, whether their row never
+        # showed up or the database kept failing. Callbacks that arrived
+        # during the flush are newer; merge, don't overwrite
+        now = time.monotonic()
+        for sid, (status, first_seen) in entries.items():
+            if now - first_seen >= self.hold_seconds:
+                continue
+            current = self._pending.get(sid)
+            if current is None or _STATUS_RANK.get(status, 0) > _STATUS_RANK.get(current[0], 0):
+                self._pending[sid] = (status, first_seen)
+            else:
+                self._pending[sid] = (current[0], first_seen)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="sms-status-buffer")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+
+status_buffer = MessageStatusBuffer(
+    flush_ms=settings.sms_status_flush_ms,
+    batch_size=settings.sms_status_flush_batch,
+    hold_seconds=settings.sms_status_hold_seconds,
+)
@@ -0,0 +1,113 @@
+"""
+Voice AI transcript store.
+
+Transcripts can run to several KB per call, so they live in call_transcripts
+as compressed structured turns instead of on the calls / conversations rows
+that every list query scans. They are written once when the Vapi report is
+applied and only read by the detail and transcript endpoints.
+"""
+
+import json
+import uuid
+import zlib
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.call_transcript import CallTranscript
+
+# Vapi (and legacy flattened "role: text") speaker labels -> our roles
+_ROLES = {
+    "assistant": "assistant",
+    "bot": "assistant",
+    "ai": "assistant",
+    "user": "user",
+    "customer": "user",
+}
+
+
+def _turn(role: str | None, content: str, seconds: float | None = None) -> dict:
+    return {
+        "role": _ROLES.get((role or "").strip().lower(), "unknown"),
+        "content": content.strip(),
+        "seconds": seconds,
+    }
+
+
+def parse_flat_transcript(text: str) -> list[dict]:
+    """Turns from a flattened "role: content" transcript."""
+    turns: list[dict] = []
+    for line in text.splitlines():
+        role, sep, content = line.partition(":")
+        if sep and role.strip().lower() in _ROLES:
+            turns.append(_turn(role, content))
+        elif turns:
+            turns[-1]["content"] += "\n" + line  # a turn spanning several lines
+        elif line.strip():
+            turns.append(_turn(None, line))
+    return turns
+
+
+def turns_from_report(message: dict) -> list[dict]:
+    """Structured turns from a Vapi end-of-call report."""
+    raw = (message.get("artifact") or {}).get("messages") or message.get("messages") or []
+    turns = [
+        _turn(m.get("role"), m.get("message") or m.get("content") or "", m.get("secondsFromStart"))
+        for m in raw
+        if (m.get("role") or "").lower() in _ROLES and (m.get("message") or m.get("content"))
+    ]
+    if turns:
+        return turns
+
+    transcript = message.get("transcript", "")
+    if isinstance(transcript, list):
+        return [
+            _turn(t.get("role"), t.get("content", ""), t.get("secondsFromStart"))
+            for t in transcript
+        ]
+    return parse_flat_transcript(str(transcript or ""))
+
+
+def flatten_turns(turns: list[dict]) -> str:
+    """The "role: content" text the dashboard renders."""
+    return "\n".join(f"{t['role']}: {t['content']}" for t in turns)
+
+
+def compress_turns(turns: list[dict]) -> bytes:
+    return zlib.compress(
+        json.dumps(turns, separators=(",", ":"), ensure_ascii=False).encode()
+    )
+
+
+def decompress_turns(data: bytes) -> list[dict]:
+    return json.loads(zlib.decompress(data))
+
+
+async def store_transcript(
+    db: AsyncSession,
+    call_id: uuid.UUID,
+    business_id: uuid.UUID,
+    turns: list[dict],
+) -> None:
+    """Save a call's transcript. A second write for the same call is ignored."""
+    if not turns:
+        return
+    await db.execute(
+        insert(CallTranscript)
+        .values(
+            call_id=call_id,
+            business_id=business_id,
+            turns=compress_turns(turns),
+            turn_count=len(turns),
+            search_vector=func.to_tsvector(literal_column("'english'"), flatten_turns(turns)),
+        )
+        .on_conflict_do_nothing(index_elements=["call_id"])
+    )
+
+
+async def load_transcript(db: AsyncSession, call_id: uuid.UUID) -> list[dict] | None:
+    data = await db.scalar(
+        select(CallTranscript.turns).where(CallTranscript.call_id == call_id)
+    )
+    return decompress_turns(data) if data is not None else None
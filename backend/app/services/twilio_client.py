@@ -0,0 +1,132 @@
+"""
+Shared Twilio REST clients.
+
+The API process talks to Twilio through an asyncio-native client backed by a
+pooled keep-alive aiohttp session, so SMS sends and lookups never block the
+event loop. Celery tasks are synchronous and share one pooled requests-based
+client per worker process instead of building a new Client per task.
+"""
+
+import asyncio
+import logging
+
+from aiohttp import ClientConnectorError, ClientResponse, ClientSession, ClientTimeout, TCPConnector
+from aiohttp_retry import ExponentialRetry, RetryClient
+from twilio.http.async_http_client import AsyncTwilioHttpClient
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+# A 5xx can come after Twilio acted on the request, so only these are retried
+# on one; retrying the POST behind send_sms would text the customer twice
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+async def _usable_response(response: ClientResponse) -> bool:
+    """False (retry) for a server error on an idempotent request."""
+    return not (response.status >= 500 and response.method in _IDEMPOTENT_METHODS)
+
+
+class _PooledAsyncHttpClient(AsyncTwilioHttpClient):
+    """AsyncTwilioHttpClient with a bounded keep-alive pool and a default timeout."""
+
+    def __init__(self, timeout: float, retries: int, pool_size: int):
+        super().__init__(pool_connections=False, timeout=timeout)
+        session = ClientSession(
+            connector=TCPConnector(limit=pool_size, keepalive_timeout=60),
+            timeout=ClientTimeout(total=timeout),
+        )
+        if retries > 0:
+            session = RetryClient(
+                client_session=session,
+                retry_options=ExponentialRetry(
+                    attempts=retries + 1,
+                    retry_all_server_errors=False,
+                    # Failing to connect means nothing was sent: safe for any method
+                    exceptions={ClientConnectorError},
+                    evaluate_response_callback=_usable_response,
+                ),
+            )
+        self.session = session
+
+    async def request(
+        self,
+        method,
+        url,
+        params=None,
+        data=None,
+        headers=None,
+        auth=None,
+        timeout=None,
+        allow_redirects=False,
+    ):
+        # The base client forwards timeout=None, which aiohttp reads as "no timeout"
+        return await super().request(
+            method, url, params, data, headers, auth,
+            timeout or self.timeout, allow_redirects,
+        )
+
+
+_async_client: Client | None = None
+_async_client_loop: asyncio.AbstractEventLoop | None = None
+_sync_client: Client | None = None
+
+
+def get_async_twilio_client() -> Client:
+    """
+    Twilio client for use inside async code (call the *_async methods).
+
+    The aiohttp session is bound to the event loop that created it, so a new
+    client is built if we're running on a different loop (e.g. asyncio.run
+    inside a Celery task).
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        http_client = _PooledAsyncHttpClient(
+            timeout=settings.twilio_http_timeout_seconds,
+            retries=settings.twilio_http_retries,
+            pool_size=settings.twilio_http_pool_size,
+        )
+        _async_client = Client(
+            settings.twilio_account_sid,
+            settings.twilio_auth_token,
+            http_client=http_client,
+        )
+        _async_client_loop = loop
+    return _async_client
+
+
+def get_sync_twilio_client() -> Client:
+    """Twilio client for synchronous code (Celery tasks)."""
+    global _sync_client
+    if _sync_client is None:
+        http_client = TwilioHttpClient(
+            pool_connections=True,
+            timeout=settings.twilio_http_timeout_seconds,
+            max_retries=settings.twilio_http_retries,
+        )
+        _sync_client = Client(
+            settings.twilio_account_sid,
+            settings.twilio_auth_token,
+            http_client=http_client,
+        )
+    return _sync_client
+
+
+async def close_async_twilio_client() -> None:
+    """Close the pooled aiohttp session (app shutdown)."""
+    global _async_client, _async_client_loop
+    if _async_client is None:
+        return
+    try:
+        await _async_client.http_client.close()
+    except Exception as e:
+        logger.warning(f"Failed to close Twilio HTTP session: {e}")
+    _async_client = None
+    _async_client_loop = None
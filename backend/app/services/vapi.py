@@ -2,24 +2,31 @@
 Vapi.ai Voice AI service layer.
 
 Handles:
-- Creating/updating Vapi assistants per business
+- Creating/updating Vapi assistants per business (skipped when unchanged)
 - Building voice AI system prompts
 - Transferring missed calls to Vapi
 - Processing call results (transcripts, extracted data, recordings)
 """
 
+import hashlib
+import json
 import logging
 import uuid
+from dataclasses import dataclass
+from datetime import datetime
 
 import httpx
 from sqlalchemy import select, update as sa_update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.database import release_connection, standalone_session
 from app.models.business import Business
 from app.models.lead import Lead
 from app.models.service import Service
 from app.models.voice_ai_config import VoiceAIConfig
+from app.services.business_cache import invalidate_on_commit
+from app.services.redis_client import get_async_redis
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -208,29 +215,12 @@ VAPI_FUNCTION_TOOLS = [
 ]
 
 
-async def create_or_update_assistant(
-    db: AsyncSession,
+def build_assistant_payload(
     business: Business,
-) -> str:
-    """
-    Create or update a Vapi assistant for a business.
-
-    Returns the Vapi assistant ID.
-    """
-    # Load services
-    services_result = await db.execute(
-        select(Service)
-        .where(Service.business_id == business.id, Service.is_active == True)
-        .order_by(Service.sort_order)
-    )
-    services = list(services_result.scalars().all())
-
-    # Load voice AI config if exists
-    config_result = await db.execute(
-        select(VoiceAIConfig).where(VoiceAIConfig.business_id == business.id)
-    )
-    config = config_result.scalar_one_or_none()
-
+    services: list[Service],
+    config: VoiceAIConfig | None = None,
+) -> dict:
+    """The assistant definition we push to Vapi for a business."""
     system_prompt = build_voice_system_prompt(business, services, config)
 
     greeting = "Hi! Thanks for calling {}. Sorry nobody could get to the phone — I can help you out though. What's going on?".format(
@@ -245,7 +235,7 @@ async def create_or_update_assistant(
     if config:
         max_duration = config.max_call_duration_seconds
 
-    assistant_payload = {
+    return {
         "name": f"DialHook - {business.name}",
         "model": {
             "provider": "openai",
@@ -273,6 +263,56 @@ async def create_or_update_assistant(
         "responseDelaySeconds": 0.5,
     }
 
+
+def assistant_payload_hash(payload: dict) -> str:
+    """Stable fingerprint of an assistant payload (key order doesn't matter)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class AssistantSync:
+    assistant_id: str
+    changed: bool
+
+
+async def sync_assistant(
+    db: AsyncSession,
+    business: Business,
+    force: bool = False,
+) -> AssistantSync:
+    """
+    Push a business's assistant to Vapi if its payload changed since the last
+    push (or if `force`). `changed` is False when the PATCH was skipped.
+    """
+    # Load services
+    services_result = await db.execute(
+        select(Service)
+        .where(Service.business_id == business.id, Service.is_active == True)
+        .order_by(Service.sort_order)
+    )
+    services = list(services_result.scalars().all())
+
+    # Load voice AI config if exists
+    config_result = await db.execute(
+        select(VoiceAIConfig).where(VoiceAIConfig.business_id == business.id)
+    )
+    config = config_result.scalar_one_or_none()
+
+    assistant_payload = build_assistant_payload(business, services, config)
+    payload_hash = assistant_payload_hash(assistant_payload)
+
+    if (
+        not force
+        and business.vapi_assistant_id
+        and config
+        and config.provider_assistant_id == business.vapi_assistant_id
+        and config.synced_payload_hash == payload_hash
+    ):
+        return AssistantSync(assistant_id=business.vapi_assistant_id, changed=False)
+
+    await release_connection(db)
+
     try:
         async with httpx.AsyncClient(timeout=30) as client:
             if business.vapi_assistant_id:
@@ -297,34 +337,105 @@ async def create_or_update_assistant(
             data = resp.json()
             assistant_id = data["id"]
 
-            # Save assistant ID on business
-            await db.execute(
-                sa_update(Business)
-                .where(Business.id == business.id)
-                .values(vapi_assistant_id=assistant_id)
-            )
-
-            # Create or update voice AI config
-            if not config:
-                config = VoiceAIConfig(
-                    business_id=business.id,
-                    provider_assistant_id=assistant_id,
-                )
-                db.add(config)
-            else:
-                await db.execute(
-                    sa_update(VoiceAIConfig)
-                    .where(VoiceAIConfig.business_id == business.id)
-                    .values(provider_assistant_id=assistant_id)
-                )
-
-            await db.flush()
-            return assistant_id
-
     except httpx.HTTPError as e:
         logger.error(f"Vapi API connection error: {e}")
         raise VapiUnavailableError(str(e)) from e
 
+    # Save assistant ID on business
+    await db.execute(
+        sa_update(Business)
+        .where(Business.id == business.id)
+        .values(vapi_assistant_id=assistant_id)
+    )
+    invalidate_on_commit(db, business.id)
+
+    # Create or update voice AI config
+    synced = {
+        "provider_assistant_id": assistant_id,
+        "synced_payload_hash": payload_hash,
+        "synced_at": datetime.utcnow(),
+    }
+    if not config:
+        db.add(VoiceAIConfig(business_id=business.id, **synced))
+    else:
+        await db.execute(
+            sa_update(VoiceAIConfig)
+            .where(VoiceAIConfig.business_id == business.id)
+            .values(**synced)
+        )
+
+    await db.flush()
+    return AssistantSync(assistant_id=assistant_id, changed=True)
+
+
+async def create_or_update_assistant(
+    db: AsyncSession,
+    business: Business,
+    force: bool = False,
+) -> str:
+    """
+    Create or update a Vapi assistant for a business.
+
+    Returns the Vapi assistant ID.
+    """
+    return (await sync_assistant(db, business, force=force)).assistant_id
+
+
+# Business fields that end up in the assistant payload
+ASSISTANT_BUSINESS_FIELDS = frozenset({
+    "name", "ai_greeting", "ai_instructions",
+    "call_recording_enabled", "two_party_consent_state",
+})
+
+
+def _sync_key(business_id: uuid.UUID) -> str:
+    return f"vapi-sync:{business_id}"
+
+
+async def schedule_assistant_sync(business) -> None:
+    """
+    Queue a re-sync of the business's assistant after a config change.
+
+    Edits within VAPI_SYNC_DEBOUNCE_SECONDS of each other share one push, and
+    the push itself is skipped if the payload ends up unchanged. Businesses
+    without an assistant are left alone.
+    """
+    if not settings.vapi_api_key or not business.vapi_assistant_id:
+        return
+    key = _sync_key(business.id)
+    try:
+        r = get_async_redis()
+        if not await r.set(key, "1", nx=True, ex=settings.vapi_sync_debounce_seconds + 60):
+            return  # a sync is already scheduled
+        from app.worker.tasks import celery_app
+
+        celery_app.send_task(
+            "sync_vapi_assistant",
+            args=[str(business.id)],
+            countdown=settings.vapi_sync_debounce_seconds,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to schedule Vapi assistant sync for {business.id}: {e}")
+        try:
+            await get_async_redis().delete(key)
+        except Exception:
+            pass
+
+
+async def run_scheduled_sync(business_id: uuid.UUID) -> None:
+    """Worker side of schedule_assistant_sync."""
+    # Clear the debounce key first so edits made during the push schedule another
+    await get_async_redis().delete(_sync_key(business_id))
+
+    async with standalone_session() as db:
+        business = await db.get(Business, business_id)
+        if not business or not business.vapi_assistant_id:
+            return
+        result = await sync_assistant(db, business)
+        await db.commit()
+    if result.changed:
+        logger.info(f"Re-synced Vapi assistant for business {business_id}")
+
 
 async def transfer_call_to_vapi(
     business: Business,
@@ -0,0 +1,99 @@
+"""
+Live Vapi call context.
+
+Vapi's mid-call tool webhooks (save_lead_info, flag_emergency, ...) arrive
+while the caller is on the line, so they must answer in tens of
+milliseconds. When call_completed hands a missed call to Vapi we already know
+the business, conversation and lead; we keep that keyed by our call ID so tool
+handlers can go straight to their single write. Other processes (or expired
+entries) fall back to one joined query.
+"""
+
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.business import Business
+from app.models.call import Call
+from app.models.conversation import Conversation
+from app.services.business_cache import BusinessSnapshot, cache_business, cache_generation
+from app.services.cache import TTLCache
+
+settings = get_settings()
+
+_live_calls = TTLCache(maxsize=2048, ttl_seconds=settings.vapi_live_call_ttl_seconds)
+
+
+@dataclass(frozen=True, slots=True)
+class LiveCall:
+    business: BusinessSnapshot
+    call_id: uuid.UUID
+    caller_phone: str
+    conversation_id: uuid.UUID | None
+    lead_id: uuid.UUID | None
+
+
+def remember_live_call(
+    business: BusinessSnapshot,
+    call_id: uuid.UUID,
+    caller_phone: str,
+    conversation_id: uuid.UUID | None,
+    lead_id: uuid.UUID | None,
+) -> None:
+    """Record a call that was just handed to Vapi."""
+    _live_calls.set(
+        str(call_id),
+        LiveCall(
+            business=business,
+            call_id=call_id,
+            caller_phone=caller_phone,
+            conversation_id=conversation_id,
+            lead_id=lead_id,
+        ),
+    )
+
+
+def forget_live_call(call_id: uuid.UUID | str) -> None:
+    _live_calls.pop(str(call_id))
+
+
+async def get_live_call(
+    db: AsyncSession, call_id: str, business_id: str
+) -> LiveCall | None:
+    """Context for an in-progress Vapi call, from cache or one query."""
+    live = _live_calls.get(call_id)
+    if live is not None:
+        return live if str(live.business.id) == business_id else None
+
+    # The ids come from Vapi call metadata: anything malformed is just not found
+    try:
+        call_uuid, business_uuid = uuid.UUID(call_id), uuid.UUID(business_id)
+    except (ValueError, TypeError, AttributeError):  # AttributeError: a non-str id
+        return None
+
+    generation = cache_generation()
+    result = await db.execute(
+        select(Business, Call.caller_phone, Conversation.id, Conversation.lead_id)
+        .select_from(Call)
+        .join(Business, Business.id == Call.business_id)
+        .outerjoin(Conversation, Conversation.call_id == Call.id)
+        .where(Call.id == call_uuid, Business.id == business_uuid)
+        .limit(1)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    business, caller_phone, conversation_id, lead_id = row
+    live = LiveCall(
+        business=cache_business(business, generation),
+        call_id=call_uuid,
+        caller_phone=caller_phone,
+        conversation_id=conversation_id,
+        lead_id=lead_id,
+    )
+    _live_calls.set(call_id, live)
+    return live
@@ -0,0 +1,377 @@
+"""
+Durable processing of Vapi end-of-call reports.
+
+The webhook only stores the raw report (one row per Vapi call ID, so retried
+deliveries are no-ops) and queues it; Vapi gets its 200 straight away. The
+Celery worker then processes the report in two stages:
+
+1. apply — store the transcript, write the call details and extracted lead
+   fields and work out whether the lead is qualified, in one transaction;
+2. side effects — owner notification, confirmation / recovery SMS, follow-up
+   and owner nudge. Each step is recorded on the report once it succeeds, so
+   a retry after a Twilio or Resend failure only repeats what hadn't
+   happened yet.
+
+Only one task chain works on a report at a time. It takes a lease
+(processing_until / processing_owner) before starting, renews it before each
+side effect, and on failure keeps it through the Celery retry backoff so
+that only its own retry picks the report up again. A beat task re-queues
+reports that were stored but never finished (broker down, worker crash) once
+their lease, if any, has run out.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, select, update as sa_update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import standalone_session
+from app.models.business import Business
+from app.models.call import Call
+from app.models.conversation import Conversation
+from app.models.lead import Lead
+from app.models.vapi_call_report import VapiCallReport
+from app.services.lookup import can_receive_sms
+from app.services.notifications import notify_owner
+from app.services.transcripts import store_transcript, turns_from_report
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+async def store_call_report(
+    db: AsyncSession, vapi_call_id: str, message: dict
+) -> uuid.UUID | None:
+    """Persist a raw report. Returns None if this call's report is already stored."""
+    result = await db.execute(
+        insert(VapiCallReport)
+        .values(id=uuid.uuid4(), vapi_call_id=vapi_call_id, payload=message)
+        .on_conflict_do_nothing(index_elements=["vapi_call_id"])
+        .returning(VapiCallReport.id)
+    )
+    return result.scalar_one_or_none()
+
+
+def enqueue_call_report(report_id: uuid.UUID) -> None:
+    """Hand a stored report to the worker (the re-queue sweep covers failures)."""
+    try:
+        from app.worker.tasks import celery_app
+
+        celery_app.send_task("process_vapi_report", args=[str(report_id)])
+    except Exception as e:
+        logger.warning(f"Failed to queue Vapi report {report_id}, sweep will retry: {e}")
+
+
+async def _apply_report(db: AsyncSession, report: VapiCallReport) -> None:
+    """Stage 1: write the report's data to the call, conversation and lead."""
+    message = report.payload
+    call_data = message.get("call", {})
+    metadata = call_data.get("metadata") or {}
+    dialhook_call_id = metadata.get("dialhook_call_id")
+    business_id = metadata.get("business_id")
+
+    if not dialhook_call_id or not business_id:
+        logger.warning(f"Vapi report {report.id} missing dialhook metadata")
+        report.status = "done"
+        return
+
+    call = await db.get(Call, uuid.UUID(dialhook_call_id))
+    business = await db.get(Business, uuid.UUID(business_id))
+    if not call or not business:
+        logger.warning(f"Vapi report {report.id}: call or business not found (call={dialhook_call_id})")
+        report.status = "done"
+        return
+
+    duration_seconds = int(call_data.get("duration", 0) or 0)
+    recording_url = message.get("recordingUrl") or call_data.get("recordingUrl")
+    cost = message.get("cost") or call_data.get("cost")
+
+    # Update call record with voice AI data
+    call_updates = {
+        "voice_ai_used": True,
+        "voice_ai_duration_seconds": duration_seconds,
+        "vapi_call_id": report.vapi_call_id,
+    }
+    if recording_url:
+        call_updates["recording_url"] = recording_url
+    if cost is not None:
+        call_updates["voice_ai_cost"] = float(cost)
+    if duration_seconds > 0:
+        call_updates["duration_seconds"] = duration_seconds
+
+    await db.execute(
+        sa_update(Call).where(Call.id == call.id).values(**call_updates)
+    )
+    await store_transcript(db, call.id, business.id, turns_from_report(message))
+
+    conversation = await db.scalar(
+        select(Conversation).where(Conversation.call_id == call.id)
+    )
+    if not conversation:
+        report.status = "done"
+        return
+
+    lead = await db.get(Lead, conversation.lead_id)
+    if not lead:
+        report.status = "done"
+        return
+
+    # Extract structured data from the analysis/summary if available
+    structured_data = message.get("analysis", {}).get("structuredData", {})
+
+    lead_updates = {}
+    for field in ("name", "service_needed", "urgency", "address", "preferred_time"):
+        if structured_data.get(field) and not getattr(lead, field):
+            lead_updates[field] = structured_data[field]
+
+    is_qualified = bool(
+        (lead.name or lead_updates.get("name"))
+        and (lead.service_needed or lead_updates.get("service_needed"))
+        and (lead.address or lead_updates.get("address"))
+    )
+
+    if is_qualified and lead.status not in ("qualified", "booked"):
+        lead_updates["status"] = "qualified"
+        # Estimate value
+        from app.services.ai_engine import _match_service
+        matched = await _match_service(
+            db, business.id,
+            lead_updates.get("service_needed") or lead.service_needed,
+        )
+        if matched and matched.price:
+            lead_updates["estimated_value"] = float(matched.price)
+        else:
+            lead_updates["estimated_value"] = float(business.avg_job_value or 350)
+    elif not is_qualified and lead.status == "new":
+        lead_updates["status"] = "qualifying"
+
+    if lead_updates:
+        await db.execute(
+            sa_update(Lead).where(Lead.id == lead.id).values(**lead_updates)
+        )
+
+    if is_qualified:
+        await db.execute(
+            sa_update(Conversation)
+            .where(Conversation.id == conversation.id)
+            .values(status="qualified")
+        )
+
+    report.is_qualified = is_qualified
+    report.status = "applied"
+
+
+def _lease_expiry(extra_seconds: float = 0) -> datetime:
+    return datetime.utcnow() + timedelta(
+        seconds=settings.vapi_report_lease_seconds + extra_seconds
+    )
+
+
+def retry_countdown(retries: int) -> int:
+    """Backoff before the worker's next attempt at a failed report."""
+    return 30 * 2 ** retries
+
+
+async def _run_step(db: AsyncSession, report: VapiCallReport, step: str, action) -> None:
+    if step in report.completed_steps:
+        return
+    report.processing_until = _lease_expiry()
+    await db.commit()
+    await action()
+    report.completed_steps = [*report.completed_steps, step]
+    await db.commit()
+
+
+async def _run_side_effects(db: AsyncSession, report: VapiCallReport) -> None:
+    """Stage 2: notifications and texts, each recorded once it has happened."""
+    call_data = report.payload.get("call", {})
+    metadata = call_data.get("metadata") or {}
+    duration_seconds = int(call_data.get("duration", 0) or 0)
+
+    call = await db.get(Call, uuid.UUID(metadata["dialhook_call_id"]))
+    business = await db.get(Business, uuid.UUID(metadata["business_id"]))
+    conversation = await db.scalar(
+        select(Conversation).where(Conversation.call_id == call.id)
+    )
+    lead = await db.get(Lead, conversation.lead_id, populate_existing=True)
+    is_qualified = bool(report.is_qualified)
+    mobile = can_receive_sms(call.line_type)
+
+    async def notify():
+        await notify_owner(
+            business=business,
+            event="emergency" if lead.urgency == "emergency" else "qualified_lead" if is_qualified else "missed_call",
+            data={
+                "lead": lead,
+                "caller_phone": call.caller_phone,
+                "after_hours": call.is_after_hours,
+                "voice_ai": True,
+                "duration": duration_seconds,
+            },
+        )
+
+    async def confirmation_sms():
+        from app.services.sms import send_sms
+
+        caller_name = lead.name or ""
+        svc = lead.service_needed or "your service"
+        addr = lead.address or ""
+        confirmation = (
+            f"Thanks for calling {business.name}"
+            f"{', ' + caller_name if caller_name else ''}! "
+            f"Confirming: {svc}"
+            f"{' at ' + addr if addr else ''}. "
+            f"Someone will call to confirm the time. "
+            f"Text this number anytime if you need anything!"
+        )
+        await send_sms(
+            db,
+            to=call.caller_phone,
+            from_=business.twilio_number,
+            body=confirmation,
+            conversation_id=conversation.id,
+            business_id=business.id,
+            sender_type="ai",
+        )
+
+    async def recovery_sms():
+        # Caller hung up before we had everything
+        from app.services.sms import send_sms
+
+        recovery_msg = (
+            f"Hey! This is {business.name}. "
+            f"Looks like we got disconnected. "
+            f"What time works best to get you scheduled?"
+        )
+        await send_sms(
+            db,
+            to=call.caller_phone,
+            from_=business.twilio_number,
+            body=recovery_msg,
+            conversation_id=conversation.id,
+            business_id=business.id,
+            sender_type="ai",
+        )
+
+    async def follow_up():
+        from app.services.follow_up import schedule_follow_up
+
+        await schedule_follow_up(conversation_id=conversation.id, delay_minutes=120)
+
+    async def landline_callback():
+        await notify_owner(
+            business=business,
+            event="human_needed",
+            data={
+                "reason": "Landline caller — call incomplete, cannot send SMS follow-up",
+                "caller_phone": call.caller_phone,
+                "lead": lead,
+            },
+        )
+
+    async def owner_nudge():
+        from app.worker.tasks import celery_app
+
+        celery_app.send_task(
+            "send_owner_nudge",
+            args=[str(business.id), str(lead.id)],
+            countdown=settings.owner_nudge_delay_minutes * 60,
+        )
+
+    await _run_step(db, report, "notify_owner", notify)
+    if is_qualified:
+        if mobile:
+            await _run_step(db, report, "confirmation_sms", confirmation_sms)
+        await _run_step(db, report, "owner_nudge", owner_nudge)
+    elif mobile:
+        await _run_step(db, report, "recovery_sms", recovery_sms)
+        await _run_step(db, report, "follow_up", follow_up)
+    else:
+        await _run_step(db, report, "landline_callback", landline_callback)
+
+    report.status = "done"
+
+
+async def _claim(db: AsyncSession, report_id: uuid.UUID, owner: str) -> bool:
+    """Take the report's lease unless another chain holds an unexpired one."""
+    claimed = await db.scalar(
+        sa_update(VapiCallReport)
+        .where(
+            VapiCallReport.id == report_id,
+            VapiCallReport.status.in_(("received", "applied")),
+            or_(
+                VapiCallReport.processing_until.is_(None),
+                VapiCallReport.processing_until < datetime.utcnow(),
+                VapiCallReport.processing_owner == owner,
+            ),
+        )
+        .values(
+            processing_until=_lease_expiry(),
+            processing_owner=owner,
+            attempts=VapiCallReport.attempts + 1,
+        )
+        .returning(VapiCallReport.id)
+    )
+    await db.commit()
+    return claimed is not None
+
+
+async def process_call_report(
+    report_id: uuid.UUID, owner: str | None = None, retry_in: float | None = None
+) -> None:
+    """
+    Run whatever stages of a stored report haven't completed yet.
+
+    `owner` identifies the task chain (Celery keeps a task's id across its
+    retries). If this attempt fails and `retry_in` is set, the lease is kept
+    for that long plus the lease period, so the sweep doesn't start a second
+    chain while the retry waits.
+    """
+    owner = owner or str(uuid.uuid4())
+    async with standalone_session() as db:
+        if not await _claim(db, report_id, owner):
+            return
+        report = await db.get(VapiCallReport, report_id, populate_existing=True)
+
+        try:
+            if report.status == "received":
+                await _apply_report(db, report)
+                await db.commit()
+            if report.status == "applied":
+                await _run_side_effects(db, report)
+            report.processed_at = datetime.utcnow()
+            report.processing_until = None
+            report.processing_owner = None
+            report.last_error = None
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            await db.execute(
+                sa_update(VapiCallReport)
+                .where(VapiCallReport.id == report_id)
+                .values(
+                    last_error=str(e)[:1000],
+                    processing_until=_lease_expiry(retry_in) if retry_in is not None else None,
+                )
+            )
+            await db.commit()
+            raise
+
+
+async def mark_report_failed(report_id: uuid.UUID) -> None:
+    async with standalone_session() as db:
+        await db.execute(
+            sa_update(VapiCallReport)
+            .where(VapiCallReport.id == report_id)
+            .values(status="failed", processing_until=None, processing_owner=None)
+        )
+        await db.commit()
+
+
+def stale_report_cutoff() -> datetime:
+    """Reports still unfinished after this were dropped by the queue."""
+    return datetime.utcnow() - timedelta(minutes=settings.vapi_report_requeue_minutes)
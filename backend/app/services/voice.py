@@ -1,25 +1,52 @@
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 
 import pytz
-from sqlalchemy import select, update, or_
+from sqlalchemy import select, update, or_, and_, func, true, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.config import get_settings
 from app.models.business import Business
 from app.models.call import Call
 from app.models.lead import Lead
 from app.models.conversation import Conversation
+from app.models.message import Message
 from app.models.opt_out import OptOut
+from app.models.service import Service
+from app.models.twilio_sid import TwilioSid
+from app.services.opt_out_index import opt_out_index
+from app.services.business_cache import (
+    BusinessSnapshot,
+    cache_business,
+    cache_generation,
+    get_cached_business,
+)
+
+settings = get_settings()
+
+ACTIVE_CONVERSATION_STATUSES = ("active", "follow_up", "human_active")
 
 
 async def get_business_by_twilio_number(
     db: AsyncSession, twilio_number: str
-) -> Business | None:
-    """Look up business by their Twilio phone number."""
+) -> BusinessSnapshot | None:
+    """Look up business by their Twilio phone number (cached per process)."""
+    cached = get_cached_business(twilio_number)
+    if cached:
+        return cached
+
+    generation = cache_generation()
     result = await db.execute(
         select(Business).where(Business.twilio_number == twilio_number)
     )
-    return result.scalar_one_or_none()
+    business = result.scalar_one_or_none()
+    if not business:
+        return None
+    return cache_business(business, generation)
 
 
 async def create_call_record(
@@ -30,7 +57,11 @@ async def create_call_record(
     status: str,
     is_after_hours: bool,
 ) -> Call:
-    """Create a call record in the database."""
+    """
+    Create a call record in the database.
+
+    A retried webhook for the same CallSid returns the existing record.
+    """
     call = Call(
         business_id=business_id,
         twilio_call_sid=twilio_call_sid,
@@ -38,8 +69,14 @@ async def create_call_record(
         status=status,
         is_after_hours=is_after_hours,
     )
-    db.add(call)
-    await db.flush()
+    try:
+        async with db.begin_nested():
+            db.add_all([TwilioSid(sid=twilio_call_sid), call])
+    except IntegrityError:
+        result = await db.execute(
+            select(Call).where(Call.twilio_call_sid == twilio_call_sid)
+        )
+        return result.scalar_one()
     return call
 
 
@@ -81,6 +118,10 @@ async def is_opted_out(
     db: AsyncSession, phone: str, business_id: uuid.UUID
 ) -> bool:
     """Check if a phone number has opted out (business-specific or global)."""
+    known = opt_out_index.lookup(phone, business_id)
+    if known is not None:
+        return known
+
     result = await db.execute(
         select(OptOut.id).where(
             OptOut.phone == phone,
@@ -100,7 +141,7 @@ async def get_active_conversation(
         .where(
             Conversation.business_id == business_id,
             Lead.phone == phone,
-            Conversation.status.in_(["active", "follow_up", "human_active"]),
+            Conversation.status.in_(ACTIVE_CONVERSATION_STATUSES),
         )
         .order_by(Conversation.created_at.desc())
         .limit(1)
@@ -151,3 +192,126 @@ async def create_conversation(
     db.add(conversation)
     await db.flush()
     return conversation
+
+
+@dataclass(slots=True)
+class InboundContext:
+    """
+    What an inbound SMS turn needs to know about the sender.
+
+    `lead` and `conversation` are attached to the session that loaded them;
+    `services` and `messages` are transient, read-only copies.
+    """
+
+    business: BusinessSnapshot
+    lead: Lead | None = None
+    conversation: Conversation | None = None
+    services: list[Service] = field(default_factory=list)
+    messages: list[Message] = field(default_factory=list)  # oldest first
+
+
+def _json_array(expr, order_by):
+    return func.coalesce(
+        func.json_agg(aggregate_order_by(expr, order_by)),
+        literal_column("'[]'::json"),
+    )
+
+
+async def load_inbound_context(
+    db: AsyncSession,
+    business: BusinessSnapshot,
+    phone: str,
+    history_limit: int | None = None,
+) -> InboundContext:
+    """
+    Load the lead, active conversation, active services and recent message
+    history for a sender in a single query.
+
+    The business itself comes from the routing cache. Services and messages
+    are aggregated to JSON in scalar subqueries, so the query returns exactly
+    one row whether or not the sender is a lead yet.
+    """
+    history_limit = history_limit or settings.ai_history_messages
+
+    active = (
+        select(Conversation)
+        .where(
+            Conversation.lead_id == Lead.id,
+            Conversation.business_id == Business.id,
+            Conversation.status.in_(ACTIVE_CONVERSATION_STATUSES),
+        )
+        .order_by(Conversation.created_at.desc())
+        .limit(1)
+        .lateral("active_conversation")
+    )
+    ActiveConversation = aliased(Conversation, active)
+
+    services = (
+        select(
+            _json_array(
+                func.json_build_object(
+                    "id", Service.id,
+                    "name", Service.name,
+                    "description", Service.description,
+                    "price", Service.price,
+                    "duration_minutes", Service.duration_minutes,
+                    "is_bookable", Service.is_bookable,
+                    "sort_order", Service.sort_order,
+                ),
+                Service.sort_order,
+            )
+        )
+        .where(Service.business_id == Business.id, Service.is_active == True)
+        .scalar_subquery()
+    )
+
+    # Oldest message still inside the history window
+    earlier = aliased(Message)
+    cutoff = (
+        select(earlier.created_at)
+        .where(earlier.conversation_id == ActiveConversation.id)
+        .order_by(earlier.created_at.desc())
+        .offset(history_limit - 1)
+        .limit(1)
+        .correlate(active)
+        .scalar_subquery()
+    )
+    history = (
+        select(
+            _json_array(
+                func.json_build_object(
+                    "id", Message.id,
+                    "direction", Message.direction,
+                    "sender_type", Message.sender_type,
+                    "body", Message.body,
+                ),
+                Message.created_at,
+            )
+        )
+        .where(
+            Message.conversation_id == ActiveConversation.id,
+            or_(cutoff.is_(None), Message.created_at >= cutoff),
+        )
+        .correlate(active)
+        .scalar_subquery()
+    )
+
+    result = await db.execute(
+        select(Lead, ActiveConversation, services, history)
+        .select_from(Business)
+        .outerjoin(Lead, and_(Lead.business_id == Business.id, Lead.phone == phone))
+        .outerjoin(active, true())
+        .where(Business.id == business.id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return InboundContext(business=business)
+
+    lead, conversation, service_rows, message_rows = row
+    return InboundContext(
+        business=business,
+        lead=lead,
+        conversation=conversation,
+        services=[Service(**svc) for svc in service_rows],
+        messages=[Message(**msg) for msg in message_rows],
+    )
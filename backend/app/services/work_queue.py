@@ -0,0 +1,83 @@
+"""
+Bounded in-process async work queue with per-key ordering.
+
+Jobs are sharded by key onto a fixed set of worker tasks, so two jobs for the
+same key (e.g. a conversation ID) always run one after the other in submit
+order, while jobs for different keys run concurrently. Each shard has a
+bounded backlog; `submit` returns False instead of blocking when it is full so
+callers can fall back to doing the work inline.
+"""
+
+import asyncio
+import logging
+import zlib
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+Job = tuple[Callable[..., Awaitable[Any]], tuple, dict]
+
+
+class KeyedWorkQueue:
+    def __init__(self, name: str, workers: int = 8, max_backlog: int = 200):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_backlog = max_backlog
+        self._queues: list[asyncio.Queue[Job]] = []
+        self._tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks) and self._loop is asyncio.get_running_loop()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        per_shard = max(1, self.max_backlog // self.workers)
+        self._loop = asyncio.get_running_loop()
+        self._queues = [asyncio.Queue(maxsize=per_shard) for _ in range(self.workers)]
+        self._tasks = [
+            asyncio.create_task(self._worker(q), name=f"{self.name}-{i}")
+            for i, q in enumerate(self._queues)
+        ]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Let queued jobs finish (up to `timeout`), then cancel the workers."""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(q.join() for q in self._queues)), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.name} queue stopped with {self.backlog()} jobs pending")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queues = []
+
+    def submit(self, key: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> bool:
+        """Queue `fn(*args, **kwargs)` behind earlier jobs with the same key."""
+        self.start()
+        shard = zlib.crc32(key.encode()) % self.workers
+        try:
+            self._queues[shard].put_nowait((fn, args, kwargs))
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"{self.name} queue full, rejecting job for {key}")
+            return False
+
+    def backlog(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            fn, args, kwargs = await queue.get()
+            try:
+                await fn(*args, **kwargs)
+            except Exception as e:
+                logger.exception(f"{self.name} job failed: {e}")
+            finally:
+                queue.task_done()
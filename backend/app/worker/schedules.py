@@ -6,6 +6,14 @@ beat_schedule = {
         "task": "compute_daily_metrics",
         "schedule": crontab(hour=0, minute=5),  # Run at 12:05 AM UTC daily
     },
+    "maintain-partitions": {
+        "task": "maintain_partitions",
+        "schedule": crontab(hour=0, minute=30),  # New months ahead of time, retention
+    },
+    "requeue-vapi-reports": {
+        "task": "requeue_vapi_reports",
+        "schedule": crontab(minute="*/5"),
+    },
     "send-weekly-reports": {
         "task": "send_weekly_report",
         "schedule": crontab(hour=14, minute=0, day_of_week=1),  # Monday 10am ET
@@ -1,11 +1,15 @@
+import asyncio
 import logging
+import uuid
 from datetime import date, datetime, timedelta
 
 from celery import Celery
-from sqlalchemy import create_engine, select, update as sa_update
+from sqlalchemy import create_engine, or_, select, update as sa_update
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.config import get_settings
+from app.services.redis_client import close_async_redis
+from app.services.twilio_client import close_async_twilio_client, get_sync_twilio_client
 from app.worker.schedules import beat_schedule
 
 logger = logging.getLogger(__name__)
@@ -31,7 +35,7 @@ _sync_engine = None
 _SyncSession = None
 
 
-def _get_sync_session() -> Session:
+def _get_sync_engine():
     global _sync_engine, _SyncSession
     if _sync_engine is None:
         sync_url = settings.database_url.replace(
@@ -39,9 +43,33 @@ def _get_sync_session() -> Session:
         ).replace("postgresql://", "postgresql+psycopg2://")
         _sync_engine = create_engine(sync_url)
         _SyncSession = sessionmaker(bind=_sync_engine)
+    return _sync_engine
+
+
+def _get_sync_session() -> Session:
+    _get_sync_engine()
     return _SyncSession()
 
 
+def _run_async(coro):
+    """
+    asyncio.run() for a task. The async Twilio, Redis and OpenAI clients are
+    bound to the loop that built them, so they're closed before this one
+    ends instead of leaking a session and pool per task.
+    """
+    from app.services.ai_engine import close_openai_client
+
+    async def run():
+        try:
+            return await coro
+        finally:
+            await close_async_twilio_client()
+            await close_async_redis()
+            await close_openai_client()
+
+    return asyncio.run(run())
+
+
 FOLLOW_UP_MESSAGES = [
     "Hey, just checking in! Did you still need help with your HVAC issue? We'd love to get you taken care of.",
     "Hi there! We haven't heard back from you. If you still need HVAC service, just reply and we'll get you scheduled.",
@@ -98,9 +126,7 @@ def send_follow_up(conversation_id: str):
         message_body = FOLLOW_UP_MESSAGES[count]
 
         try:
-            from twilio.rest import Client
-
-            client = Client(settings.twilio_account_sid, settings.twilio_auth_token)
+            client = get_sync_twilio_client()
             lead = session.execute(
                 select(Lead).where(Lead.id == convo.lead_id)
             ).scalar_one_or_none()
@@ -149,6 +175,111 @@ def send_follow_up(conversation_id: str):
         session.close()
 
 
+@celery_app.task(name="retry_ai_turn")
+def retry_ai_turn(conversation_id: str, from_number: str, body: str, fallback_sid: str):
+    """Send the real AI reply for a turn that got the fallback reply."""
+    from app.services.ai_turn import retry_degraded_turn
+
+    try:
+        _run_async(
+            retry_degraded_turn(uuid.UUID(conversation_id), from_number, body, fallback_sid)
+        )
+    except Exception as e:
+        logger.error(f"AI turn retry failed for {conversation_id}: {e}")
+
+
+@celery_app.task(
+    name="process_vapi_report", bind=True, max_retries=settings.vapi_report_max_retries
+)
+def process_vapi_report(self, report_id: str):
+    """Process a stored Vapi end-of-call report, retrying with backoff."""
+    from app.services.vapi_reports import (
+        mark_report_failed,
+        process_call_report,
+        retry_countdown,
+    )
+
+    # The task id is the same across retries, so it doubles as the lease owner
+    last_attempt = self.request.retries >= self.max_retries
+    countdown = None if last_attempt else retry_countdown(self.request.retries)
+    try:
+        _run_async(
+            process_call_report(uuid.UUID(report_id), owner=self.request.id, retry_in=countdown)
+        )
+    except Exception as e:
+        if last_attempt:
+            logger.error(f"Vapi report {report_id} failed permanently: {e}")
+            _run_async(mark_report_failed(uuid.UUID(report_id)))
+            return
+        logger.warning(f"Vapi report {report_id} failed, retrying: {e}")
+        raise self.retry(exc=e, countdown=countdown)
+
+
+@celery_app.task(name="requeue_vapi_reports")
+def requeue_vapi_reports():
+    """
+    Re-queue stored Vapi reports that never finished (lost task, worker crash).
+
+    Reports whose lease hasn't run out are skipped: a chain is still working
+    on them or waiting out its retry backoff.
+    """
+    from app.models.vapi_call_report import VapiCallReport
+    from app.services.vapi_reports import stale_report_cutoff
+
+    session = _get_sync_session()
+    try:
+        report_ids = session.execute(
+            select(VapiCallReport.id).where(
+                VapiCallReport.status.in_(["received", "applied"]),
+                VapiCallReport.created_at < stale_report_cutoff(),
+                VapiCallReport.attempts <= settings.vapi_report_max_retries,
+                or_(
+                    VapiCallReport.processing_until.is_(None),
+                    VapiCallReport.processing_until < datetime.utcnow(),
+                ),
+            )
+        ).scalars().all()
+        for report_id in report_ids:
+            process_vapi_report.delay(str(report_id))
+        if report_ids:
+            logger.info(f"Re-queued {len(report_ids)} Vapi reports")
+    except Exception as e:
+        logger.error(f"Vapi report sweep failed: {e}")
+    finally:
+        session.close()
+
+
+@celery_app.task(name="maintain_partitions")
+def maintain_partitions():
+    """Create upcoming messages/calls partitions and apply data retention."""
+    from app.services import partitions
+
+    try:
+        with _get_sync_engine().connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT")
+            created = partitions.ensure_partitions(conn)
+            dropped = partitions.drop_expired_partitions(conn)
+            purged = partitions.purge_tenant_rows(conn)
+            partitions.prune_sid_ledger(conn)
+        logger.info(
+            f"Partitions: created {created or 'none'}, dropped {dropped or 'none'}, "
+            f"purged {purged} rows past tenant retention"
+        )
+    except Exception as e:
+        logger.error(f"Partition maintenance failed: {e}")
+
+
+@celery_app.task(name="sync_vapi_assistant")
+def sync_vapi_assistant(business_id: str):
+    """Push a business's Vapi assistant after its config changed."""
+    from app.services.vapi import run_scheduled_sync
+
+    try:
+        _run_async(run_scheduled_sync(uuid.UUID(business_id)))
+    except Exception as e:
+        logger.error(f"Vapi assistant sync failed for {business_id}: {e}")
+
+
 @celery_app.task(name="send_owner_nudge")
 def send_owner_nudge(business_id: str, lead_id: str):
     """Remind the business owner to call back a qualified lead after 30 minutes."""
@@ -203,9 +334,7 @@ def send_owner_nudge(business_id: str, lead_id: str):
         )
 
         try:
-            from twilio.rest import Client
-
-            client = Client(settings.twilio_account_sid, settings.twilio_auth_token)
+            client = get_sync_twilio_client()
             client.messages.create(
                 to=business.owner_phone,
                 from_=business.twilio_number,
@@ -259,9 +388,7 @@ def send_review_request(review_request_id: str):
             return
 
         try:
-            from twilio.rest import Client
-
-            client = Client(settings.twilio_account_sid, settings.twilio_auth_token)
+            client = get_sync_twilio_client()
             name = lead.name or "there"
 
             # Build Google review direct link if google_place_id is configured
@@ -338,9 +465,7 @@ def send_review_reminder(review_request_id: str):
             return
 
         try:
-            from twilio.rest import Client
-
-            client = Client(settings.twilio_account_sid, settings.twilio_auth_token)
+            client = get_sync_twilio_client()
 
             google_place_id = getattr(business, "google_place_id", None)
             if google_place_id:
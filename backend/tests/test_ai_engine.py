@@ -105,9 +105,9 @@ class TestBuildSystemPrompt:
 
         prompt = build_system_prompt(biz, lead, convo)
 
-        assert "[QUALIFIED]" in prompt
-        assert "[HUMAN_NEEDED]" in prompt
-        assert "[EMERGENCY]" in prompt
+        assert "signals.qualified" in prompt
+        assert "signals.human_needed" in prompt
+        assert "signals.emergency" in prompt
 
     def test_prompt_includes_empty_services_fallback(self):
         biz = self._make_business(services=[])
@@ -188,3 +188,177 @@ class TestCheckBusinessHours:
         result = check_business_hours(biz, test_time)
 
         assert result is True
+
+
+class TestGenerateAiResponse:
+    """Tests for the single structured AI turn."""
+
+    def _make_db(self, lead):
+        lead_result = MagicMock()
+        lead_result.scalar_one_or_none.return_value = lead
+        empty = MagicMock()
+        empty.scalars.return_value.all.return_value = []
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[lead_result, empty, empty, MagicMock(), MagicMock()])
+        db.commit = AsyncMock()
+        return db
+
+    def _completion(self, payload, finish_reason="stop"):
+        completion = MagicMock()
+        completion.choices[0].finish_reason = finish_reason
+        completion.choices[0].message.content = (
+            payload if isinstance(payload, str) else json.dumps(payload)
+        )
+        return completion
+
+    @pytest.mark.asyncio
+    @patch("app.services.ai_engine._handle_qualified_lead", new_callable=AsyncMock)
+    @patch("app.services.ai_engine._get_openai_client")
+    async def test_one_completion_returns_reply_signals_and_fields(
+        self, mock_client, mock_qualified
+    ):
+        from app.services.ai_engine import generate_ai_response
+
+        lead = MagicMock(
+            id=uuid.uuid4(), status="contacted", service_needed=None,
+            urgency=None, address=None, preferred_time=None,
+        )
+        lead.name = None
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=self._completion({
+            "reply": "Thanks Sarah, we'll see you tomorrow!",
+            "signals": {"qualified": True, "human_needed": False, "emergency": False},
+            "lead": {
+                "name": "Sarah", "service_needed": "AC repair", "urgency": None,
+                "address": "123 Main St", "preferred_time": "tomorrow",
+            },
+        }))
+        mock_client.return_value = client
+        biz = TestBuildSystemPrompt()._make_business()
+        convo = MagicMock(id=uuid.uuid4())
+
+        reply = await generate_ai_response(self._make_db(lead), convo, biz, "123 Main St")
+
+        assert reply == "Thanks Sarah, we'll see you tomorrow!"
+        client.chat.completions.create.assert_awaited_once()
+        assert lead.name == "Sarah"
+        assert lead.address == "123 Main St"
+        mock_qualified.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("app.services.notifications.notify_owner", new_callable=AsyncMock)
+    async def test_signal_handlers_commit_before_notifying(self, mock_notify):
+        from app.services.ai_engine import _handle_emergency
+
+        db = MagicMock()
+        db.execute = AsyncMock()
+        db.in_transaction.return_value = True
+        db.commit = AsyncMock()
+        mock_notify.side_effect = lambda **_: db.commit.assert_awaited_once()
+
+        await _handle_emergency(db, MagicMock(id=uuid.uuid4()), MagicMock(id=uuid.uuid4()), MagicMock())
+
+        mock_notify.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("app.services.ai_engine._get_openai_client")
+    async def test_preloaded_context_skips_queries(self, mock_client):
+        from app.services.ai_engine import generate_ai_response
+        from app.services.voice import InboundContext
+
+        lead = MagicMock(id=uuid.uuid4(), status="qualifying")
+        lead.name = "Sarah"
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=self._completion({
+            "reply": "Got it!",
+            "signals": {"qualified": False, "human_needed": False, "emergency": False},
+            "lead": {
+                "name": None, "service_needed": None, "urgency": None,
+                "address": None, "preferred_time": None,
+            },
+        }))
+        mock_client.return_value = client
+        biz = TestBuildSystemPrompt()._make_business()
+        history = [MagicMock(sender_type="caller", body="Hi")]
+        context = InboundContext(business=biz, lead=lead, messages=history)
+        db = MagicMock()
+        db.execute = AsyncMock()
+        db.commit = AsyncMock()
+
+        reply = await generate_ai_response(
+            db, MagicMock(id=uuid.uuid4()), biz, "My AC is out", context=context
+        )
+
+        assert reply == "Got it!"
+        db.execute.assert_not_awaited()
+        sent = client.chat.completions.create.await_args.kwargs["messages"]
+        assert [m["content"] for m in sent[1:]] == ["Hi", "My AC is out"]
+
+    @pytest.mark.asyncio
+    @patch("app.services.ai_engine._get_openai_client")
+    async def test_slow_completion_raises_unavailable(self, mock_client):
+        import asyncio
+        from app.services.ai_engine import AIUnavailableError, generate_ai_response, settings
+        from app.services.circuit_breaker import CircuitBreaker
+
+        async def slow(**kwargs):
+            await asyncio.sleep(1)
+
+        client = MagicMock()
+        client.chat.completions.create = slow
+        mock_client.return_value = client
+        lead = MagicMock(id=uuid.uuid4(), status="qualifying")
+        lead.name = None
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=60)
+
+        with patch.object(settings, "ai_turn_budget_seconds", 0.01), \
+                patch("app.services.ai_engine._openai_breaker", breaker):
+            with pytest.raises(AIUnavailableError) as exc:
+                await generate_ai_response(
+                    self._make_db(lead), MagicMock(id=uuid.uuid4()),
+                    TestBuildSystemPrompt()._make_business(), "Hello",
+                )
+            assert exc.value.reason == "timeout"
+            assert breaker.is_open
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content, finish_reason", [
+        ('{"reply": "Thanks! We can come by tomo', "length"),
+        (None, "content_filter"),
+        ('{"reply": "  ", "signals": {}, "lead": {}}', "stop"),
+        ("Sure, happy to help!", "stop"),
+    ])
+    @patch("app.services.ai_engine._get_openai_client")
+    async def test_unusable_output_raises_unavailable(self, mock_client, content, finish_reason):
+        from app.services.ai_engine import AIUnavailableError, generate_ai_response
+
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(
+            return_value=self._completion(content, finish_reason)
+        )
+        mock_client.return_value = client
+        lead = MagicMock(id=uuid.uuid4(), status="qualifying")
+        lead.name = None
+
+        with pytest.raises(AIUnavailableError) as exc:
+            await generate_ai_response(
+                self._make_db(lead), MagicMock(id=uuid.uuid4()),
+                TestBuildSystemPrompt()._make_business(), "Hello",
+            )
+        assert exc.value.reason == "bad_output"
+
+
+class TestFallbackReply:
+    def test_uses_business_override(self):
+        from app.services.ai_engine import fallback_reply
+
+        biz = MagicMock(ai_fallback_reply="Back in a sec!")
+        assert fallback_reply(biz) == "Back in a sec!"
+
+    def test_template_names_business(self):
+        from app.services.ai_engine import fallback_reply
+
+        biz = MagicMock(ai_fallback_reply=None)
+        biz.name = "Smith HVAC"
+        assert "Smith HVAC" in fallback_reply(biz)
@@ -0,0 +1,250 @@
+"""
+Query-plan checks for the hot-path queries.
+
+Runs the real crud / metrics / voice functions against a scratch Postgres
+database, captures every SELECT they send, and EXPLAINs each one with
+sequential scans disabled: if the plan still contains a Seq Scan, no index
+can serve that query. Skipped unless QUERY_PLAN_DATABASE_URL is set; the
+app's tables in that database are dropped and recreated.
+
+    QUERY_PLAN_DATABASE_URL=postgresql+asyncpg://postgres@localhost/dialhook_plans \\
+        pytest tests/test_query_plans.py
+"""
+import os
+import uuid
+from datetime import date, datetime, time, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import *  # noqa: F401, F403 - every table, for create_all
+from app.models.appointment import Appointment
+from app.models.business import Business
+from app.models.call import Call
+from app.models.conversation import Conversation
+from app.models.lead import Lead
+from app.models.message import Message
+from app.services import crud, metrics, voice
+from app.services.business_cache import BusinessSnapshot
+from app.services.partitions import ensure_partitions
+from app.services.vapi_call_cache import get_live_call
+
+DATABASE_URL = os.environ.get("QUERY_PLAN_DATABASE_URL")
+
+pytestmark = [
+    pytest.mark.skipif(not DATABASE_URL, reason="QUERY_PLAN_DATABASE_URL not set"),
+    pytest.mark.asyncio(loop_scope="module"),
+]
+
+CALLER = "+15552220000"
+
+
+def _seed(business_id: uuid.UUID) -> list:
+    """A few rows per table; with enable_seqscan off the size doesn't matter."""
+    now = datetime.utcnow()
+    rows = [
+        Business(
+            id=business_id,
+            name="Plan Check HVAC",
+            owner_name="Owner",
+            owner_email="owner@example.com",
+            owner_phone="+15550000001",
+            business_phone="+15550000002",
+            twilio_number="+15550000003",
+            stripe_customer_id="cus_plans",
+        )
+    ]
+    for i in range(20):
+        lead = Lead(id=uuid.uuid4(), business_id=business_id, phone=f"+1555222{i:04d}", status="new")
+        call = Call(
+            id=uuid.uuid4(),
+            business_id=business_id,
+            twilio_call_sid=f"CA{uuid.uuid4().hex}",
+            caller_phone=lead.phone,
+            status="missed",
+            created_at=now - timedelta(hours=i),
+        )
+        convo = Conversation(
+            id=uuid.uuid4(), business_id=business_id, lead_id=lead.id, call_id=call.id, status="active"
+        )
+        rows += [lead, call, convo]
+        rows += [
+            Message(
+                conversation_id=convo.id,
+                business_id=business_id,
+                direction="inbound" if j % 2 else "outbound",
+                sender_type="lead" if j % 2 else "ai",
+                body=f"message {j}",
+                created_at=now - timedelta(minutes=j),
+            )
+            for j in range(5)
+        ]
+        rows.append(
+            Appointment(
+                business_id=business_id,
+                lead_id=lead.id,
+                scheduled_date=date.today() + timedelta(days=i),
+                scheduled_time=time(9, 0),
+            )
+        )
+    return rows
+
+
+@pytest_asyncio.fixture(loop_scope="module", scope="module")
+async def plan_db():
+    engine = create_async_engine(DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gin"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(ensure_partitions)
+
+    business_id = uuid.uuid4()
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        db.add_all(_seed(business_id))
+        await db.commit()
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+
+    yield engine, session_factory, business_id
+    await engine.dispose()
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    found = [plan["Relation Name"]] if plan["Node Type"] == "Seq Scan" else []
+    for child in plan.get("Plans", []):
+        found += _seq_scans(child)
+    return found
+
+
+async def _assert_indexed(plan_db, run) -> None:
+    """Run `run(db)`, then EXPLAIN every SELECT it issued."""
+    engine, session_factory, _ = plan_db
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async with session_factory() as db:
+            await run(db)
+            await db.rollback()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert statements, "nothing was queried"
+    async with engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = result.scalar()[0]["Plan"]
+            assert not _seq_scans(plan), f"Seq Scan on {_seq_scans(plan)} for:\n{statement}"
+
+
+async def _business(db, business_id) -> BusinessSnapshot:
+    return BusinessSnapshot.from_model(await db.get(Business, business_id))
+
+
+class TestHotQueryPlans:
+    async def test_lead_list_pages(self, plan_db):
+        business_id = plan_db[2]
+
+        async def run(db):
+            page = await crud.get_leads(db, business_id, limit=5)
+            await crud.get_leads(db, business_id, cursor=page.next_cursor, limit=5)
+            await crud.get_leads(db, business_id, status="new", limit=5)
+
+        await _assert_indexed(plan_db, run)
+
+    async def test_lead_detail(self, plan_db):
+        business_id = plan_db[2]
+
+        async def run(db):
+            lead_id = await db.scalar(select(Lead.id).where(Lead.business_id == business_id).limit(1))
+            await crud.get_lead_detail(db, business_id, lead_id, limit=2)
+
+        await _assert_indexed(plan_db, run)
+
+    async def test_conversation_list_and_messages(self, plan_db):
+        business_id = plan_db[2]
+
+        async def run(db):
+            page = await crud.get_conversations(db, business_id, limit=5)
+            await crud.get_conversations(db, business_id, cursor=page.next_cursor, limit=5)
+            convo_id = page.items[0][0].id
+            messages = await crud.get_conversation_messages(db, convo_id, limit=2)
+            await crud.get_conversation_messages(db, convo_id, cursor=messages.next_cursor, limit=2)
+
+        await _assert_indexed(plan_db, run)
+
+    async def test_call_list(self, plan_db):
+        business_id = plan_db[2]
+
+        async def run(db):
+            page = await crud.get_calls(db, business_id, limit=5)
+            await crud.get_calls(db, business_id, cursor=page.next_cursor, limit=5)
+            await crud.get_calls(db, business_id, status="missed", limit=5)
+
+        await _assert_indexed(plan_db, run)
+
+    async def test_appointment_list(self, plan_db):
+        business_id = plan_db[2]
+
+        async def run(db):
+            page = await crud.get_appointments(db, business_id, date_from=date.today(), limit=5)
+            await crud.get_appointments(db, business_id, cursor=page.next_cursor, limit=5)
+
+        await _assert_indexed(plan_db, run)
+
+    async def test_dashboard(self, plan_db):
+        business_id = plan_db[2]
+
+        async def run(db):
+            await crud.get_dashboard_stats(db, business_id)
+            await crud.get_recent_activity(db, business_id)
+
+        await _assert_indexed(plan_db, run)
+
+    async def test_daily_metrics(self, plan_db):
+        business_id = plan_db[2]
+
+        async def run(db):
+            await metrics.compute_daily_metrics(db, business_id, date.today())
+
+        await _assert_indexed(plan_db, run)
+
+    async def test_inbound_voice_and_sms_lookups(self, plan_db):
+        business_id = plan_db[2]
+
+        async def run(db):
+            business = await _business(db, business_id)
+            await voice.get_business_by_twilio_number(db, "+15550000003")
+            await voice.create_or_get_lead(db, business_id, CALLER, "missed_call")
+            await voice.get_active_conversation(db, business_id, CALLER)
+            await voice.is_opted_out(db, CALLER, business_id)
+            await voice.load_inbound_context(db, business, CALLER)
+
+        await _assert_indexed(plan_db, run)
+
+    async def test_vapi_call_to_conversation(self, plan_db):
+        business_id = plan_db[2]
+
+        async def run(db):
+            call_id = await db.scalar(select(Call.id).where(Call.business_id == business_id).limit(1))
+            await get_live_call(db, str(call_id), str(business_id))
+            await db.scalar(select(Conversation).where(Conversation.call_id == call_id))
+
+        await _assert_indexed(plan_db, run)
+
+    async def test_stripe_customer_lookup(self, plan_db):
+        async def run(db):
+            await db.scalar(select(Business).where(Business.stripe_customer_id == "cus_plans"))
+
+        await _assert_indexed(plan_db, run)
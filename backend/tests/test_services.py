@@ -0,0 +1,1100 @@
+"""Tests for service-layer helpers (caches, queues, limiters)."""
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.cache import TTLCache
+from app.services import business_cache
+
+
+class TestTTLCache:
+    def test_get_returns_value_until_expiry(self):
+        cache = TTLCache(maxsize=10, ttl_seconds=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        cache.set("b", 2, ttl_seconds=-1)
+        assert cache.get("b") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+
+class TestBusinessCache:
+    def _make_business(self, mock_business):
+        mock_business.google_place_id = None
+        mock_business.vapi_assistant_id = None
+        mock_business.call_recording_enabled = True
+        mock_business.two_party_consent_state = False
+        return mock_business
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_skips_database(self, mock_business):
+        from app.services.voice import get_business_by_twilio_number
+
+        business_cache.invalidate_business()
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = self._make_business(mock_business)
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+
+        first = await get_business_by_twilio_number(db, mock_business.twilio_number)
+        second = await get_business_by_twilio_number(db, mock_business.twilio_number)
+
+        assert first.id == mock_business.id
+        assert second is first
+        db.execute.assert_awaited_once()
+
+    def test_invalidate_drops_snapshot(self, mock_business):
+        business_cache.invalidate_business()
+        business_cache.cache_business(self._make_business(mock_business))
+
+        business_cache.invalidate_business(mock_business.id)
+
+        assert business_cache.get_cached_business(mock_business.twilio_number) is None
+
+    def test_invalidation_waits_for_commit_and_is_broadcast(self, mock_business):
+        from sqlalchemy.orm import Session
+
+        business_cache.invalidate_business()
+        business_cache.cache_business(self._make_business(mock_business))
+        session = Session()
+
+        business_cache.invalidate_on_commit(session, mock_business.id)
+        assert business_cache.get_cached_business(mock_business.twilio_number) is not None
+
+        with patch("app.services.business_cache._broadcast_sync") as broadcast:
+            session.commit()
+
+        assert business_cache.get_cached_business(mock_business.twilio_number) is None
+        broadcast.assert_called_once_with({str(mock_business.id)})
+
+    def test_fill_that_raced_an_invalidation_is_not_cached(self, mock_business):
+        business_cache.invalidate_business()
+        generation = business_cache.cache_generation()
+        business_cache.invalidate_business(mock_business.id)
+
+        business_cache.cache_business(self._make_business(mock_business), generation)
+
+        assert business_cache.get_cached_business(mock_business.twilio_number) is None
+
+
+class TestAsyncTwilioTransport:
+    @pytest.mark.asyncio
+    @patch("app.services.sms.save_message", new_callable=AsyncMock)
+    @patch("app.services.sms.get_async_twilio_client")
+    async def test_send_sms_awaits_async_client(self, mock_get_client, mock_save):
+        from app.services.sms import send_sms
+
+        client = MagicMock()
+        client.messages.create_async = AsyncMock(return_value=MagicMock(sid="SM123"))
+        mock_get_client.return_value = client
+        db = MagicMock()
+        db.commit = AsyncMock()
+
+        sid = await send_sms(
+            db,
+            to="+15552223333",
+            from_="+15550001111",
+            body="Hi there",
+            conversation_id=uuid.uuid4(),
+            business_id=uuid.uuid4(),
+        )
+
+        assert sid == "SM123"
+        db.commit.assert_not_awaited()  # callers own the commit points
+        client.messages.create_async.assert_awaited_once()
+        assert mock_save.await_args.kwargs["twilio_message_sid"] == "SM123"
+
+    @pytest.mark.asyncio
+    async def test_server_errors_are_only_retried_for_idempotent_requests(self):
+        from app.services.twilio_client import _usable_response
+
+        assert await _usable_response(MagicMock(status=503, method="POST")) is True
+        assert await _usable_response(MagicMock(status=503, method="GET")) is False
+        assert await _usable_response(MagicMock(status=201, method="POST")) is True
+
+    @pytest.mark.asyncio
+    async def test_async_client_is_reused_within_a_loop(self):
+        from app.services.twilio_client import (
+            close_async_twilio_client,
+            get_async_twilio_client,
+        )
+
+        first = get_async_twilio_client()
+        assert get_async_twilio_client() is first
+        await close_async_twilio_client()
+
+
+class TestKeyedWorkQueue:
+    @pytest.mark.asyncio
+    async def test_jobs_for_same_key_run_in_order(self):
+        import asyncio
+        from app.services.work_queue import KeyedWorkQueue
+
+        queue = KeyedWorkQueue("test", workers=4, max_backlog=40)
+        seen = []
+
+        async def job(n):
+            await asyncio.sleep(0.01 if n == 0 else 0)
+            seen.append(n)
+
+        for n in range(5):
+            assert queue.submit("convo-1", job, n)
+        await queue.stop()
+
+        assert seen == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_submit_rejects_when_backlog_full(self):
+        import asyncio
+        from app.services.work_queue import KeyedWorkQueue
+
+        queue = KeyedWorkQueue("test", workers=1, max_backlog=1)
+        gate = asyncio.Event()
+
+        async def blocked():
+            await gate.wait()
+
+        assert queue.submit("a", blocked)
+        await asyncio.sleep(0)  # worker picks up the first job
+        assert queue.submit("a", blocked)
+        assert not queue.submit("a", blocked)
+        gate.set()
+        await queue.stop()
+
+
+class TestWebhookIdempotency:
+    @pytest.mark.asyncio
+    @patch("app.services.idempotency.get_async_redis")
+    async def test_second_claim_is_rejected(self, mock_redis):
+        from app.services.idempotency import claim_webhook
+
+        r = MagicMock()
+        r.set = AsyncMock(side_effect=[True, None])
+        mock_redis.return_value = r
+
+        assert await claim_webhook("sms", "SM123") is True
+        assert await claim_webhook("sms", "SM123") is False
+        assert r.set.await_args.kwargs["nx"] is True
+
+    @pytest.mark.asyncio
+    @patch("app.services.idempotency.get_async_redis")
+    async def test_fails_open_when_redis_is_down(self, mock_redis):
+        from app.services.idempotency import claim_webhook
+
+        r = MagicMock()
+        r.set = AsyncMock(side_effect=ConnectionError("refused"))
+        mock_redis.return_value = r
+
+        assert await claim_webhook("sms", "SM123") is True
+
+
+class TestBurstCoalescing:
+    @pytest.mark.asyncio
+    @patch("app.services.ai_turn._reply", new_callable=AsyncMock)
+    @patch("app.services.ai_turn.get_async_redis")
+    async def test_superseded_turn_does_not_reply(self, mock_redis, mock_reply):
+        from app.services.ai_turn import BurstTicket, run_ai_turn
+
+        r = MagicMock()
+        r.get = AsyncMock(return_value=b"2")
+        mock_redis.return_value = r
+        convo = MagicMock(id=uuid.uuid4())
+
+        await run_ai_turn(
+            MagicMock(), convo, MagicMock(), "+15552223333", "hi",
+            burst=BurstTicket(seq=1, deadline=0),
+        )
+
+        mock_reply.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch("app.services.ai_turn._pending_inbound", new_callable=AsyncMock)
+    @patch("app.services.ai_turn._reply", new_callable=AsyncMock)
+    @patch("app.services.ai_turn.redis_lock")
+    @patch("app.services.ai_turn.get_async_redis")
+    async def test_last_turn_answers_combined_texts(
+        self, mock_redis, mock_lock, mock_reply, mock_pending
+    ):
+        from datetime import datetime
+        from app.services.ai_turn import BurstTicket, run_ai_turn
+
+        r = MagicMock()
+        r.get = AsyncMock(return_value=b"2")
+        mock_redis.return_value = r
+        mock_lock.return_value.__aenter__ = AsyncMock(return_value=True)
+        mock_lock.return_value.__aexit__ = AsyncMock(return_value=False)
+        newest = datetime(2026, 10, 16, 12, 0, 5)
+        mock_pending.return_value = ("hi\nmy AC is out", newest)
+        db = MagicMock()
+        db.scalar = AsyncMock(return_value="active")
+        db.execute = AsyncMock()
+        db.commit = AsyncMock()
+        convo = MagicMock(id=uuid.uuid4())
+
+        await run_ai_turn(
+            db, convo, MagicMock(), "+15552223333", "my AC is out",
+            burst=BurstTicket(seq=2, deadline=0),
+        )
+
+        assert mock_reply.await_args.args[4] == "hi\nmy AC is out"
+        # Answered through the newest text read, not "now": a text that
+        # arrived while the reply was generated is still pending
+        mark = db.execute.await_args.args[0]
+        assert mark.compile().params["greatest_1"] == newest
+
+    @pytest.mark.asyncio
+    @patch("app.services.ai_turn._is_latest_in_burst", new_callable=AsyncMock, return_value=True)
+    async def test_coalesced_turn_is_queued_once_the_window_closes(self, _):
+        import asyncio
+        import time
+        from app.services import ai_turn
+
+        with patch.object(ai_turn, "ai_turn_queue") as queue:
+            queue.submit.return_value = True
+            ai_turn.enqueue_ai_turn(
+                uuid.uuid4(), "+15550001111", "+15552223333", "hi",
+                burst=ai_turn.BurstTicket(seq=1, deadline=time.time() + 0.05),
+            )
+            await asyncio.sleep(0)
+            queue.submit.assert_not_called()
+
+            await asyncio.gather(*list(ai_turn._delayed_turns))
+
+        queue.submit.assert_called_once()
+
+
+class TestLineTypeCache:
+    @pytest.mark.asyncio
+    @patch("app.services.lookup._lookup_line_type", new_callable=AsyncMock)
+    async def test_repeat_caller_uses_stored_line_type(self, mock_lookup):
+        from datetime import datetime, timezone
+        from app.services import lookup
+
+        lookup._line_types.clear()
+        db = MagicMock()
+        db.get = AsyncMock(
+            return_value=MagicMock(line_type="landline", checked_at=datetime.now(timezone.utc))
+        )
+
+        assert await lookup.detect_line_type("+15552223333", db) == "landline"
+        assert await lookup.detect_line_type("+15552223333", db) == "landline"
+        mock_lookup.assert_not_awaited()
+        db.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("app.services.lookup._lookup_line_type", new_callable=AsyncMock)
+    async def test_unknown_result_is_negatively_cached(self, mock_lookup):
+        from app.services import lookup
+
+        lookup._line_types.clear()
+        mock_lookup.return_value = "unknown"
+
+        assert await lookup.detect_line_type("+15554445555") == "unknown"
+        assert await lookup.detect_line_type("+15554445555") == "unknown"
+        mock_lookup.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("app.services.lookup._lookup_line_type", new_callable=AsyncMock)
+    async def test_failed_cache_read_is_rolled_back_to_a_savepoint(self, mock_lookup):
+        from app.services import lookup
+
+        lookup._line_types.clear()
+        mock_lookup.return_value = "mobile"
+        savepoint = MagicMock()
+        savepoint.__aenter__ = AsyncMock()
+        savepoint.__aexit__ = AsyncMock(return_value=False)
+        db = MagicMock()
+        db.begin_nested.return_value = savepoint
+        db.get = AsyncMock(side_effect=RuntimeError("relation does not exist"))
+
+        assert await lookup.detect_line_type("+15556667777", db) == "mobile"
+        savepoint.__aexit__.assert_awaited()
+        assert savepoint.__aexit__.await_args_list[0].args[0] is RuntimeError
+
+
+class TestCallerPrefetch:
+    @pytest.mark.asyncio
+    @patch("app.services.call_prefetch._prefetch", new_callable=AsyncMock)
+    async def test_call_completed_takes_prefetched_context_once(self, mock_prefetch):
+        from app.services.call_prefetch import (
+            CallerContext,
+            start_caller_prefetch,
+            take_caller_context,
+        )
+
+        context = CallerContext(
+            opted_out=False, line_type="mobile", lead_id=uuid.uuid4(), conversation_id=None
+        )
+        mock_prefetch.return_value = context
+
+        start_caller_prefetch("CA123", uuid.uuid4(), "+15552223333")
+
+        assert await take_caller_context("CA123") == context
+        assert await take_caller_context("CA123") is None
+
+
+class TestOptOutIndex:
+    def _ready_index(self):
+        import time
+        from app.services.opt_out_index import OptOutIndex
+
+        index = OptOutIndex()
+        index._loaded = True
+        index._confirmed_at = time.monotonic()
+        return index
+
+    def test_global_and_business_opt_outs(self):
+        index = self._ready_index()
+        business_id = uuid.uuid4()
+        index.apply("add", "+15551110000", None)
+        index.apply("add", "+15552220000", business_id)
+
+        assert index.lookup("+15551110000", business_id) is True
+        assert index.lookup("+15552220000", business_id) is True
+        assert index.lookup("+15552220000", uuid.uuid4()) is False
+
+        index.apply("remove", "+15552220000", str(business_id))
+        assert index.lookup("+15552220000", business_id) is False
+
+    def test_not_ready_defers_to_database(self):
+        from app.services.opt_out_index import OptOutIndex
+
+        assert OptOutIndex().lookup("+15551110000", uuid.uuid4()) is None
+
+    def test_missed_heartbeats_defer_to_database(self):
+        from app.services.opt_out_index import settings
+
+        index = self._ready_index()
+        index._confirmed_at -= 2 * settings.opt_out_index_heartbeat_seconds + 1
+
+        assert index.lookup("+15551110000", uuid.uuid4()) is None
+
+    @pytest.mark.asyncio
+    async def test_changes_during_load_are_replayed_over_the_snapshot(self):
+        import json
+        from app.services.opt_out_index import OptOutIndex
+
+        index = OptOutIndex()
+        business_id = uuid.uuid4()
+
+        async def execute(query):
+            # Committed while the snapshot was being read
+            index._on_notify(None, 1, "opt_outs", json.dumps(
+                {"op": "remove", "phone": "+15551110000", "business_id": None}
+            ))
+            index._on_notify(None, 1, "opt_outs", json.dumps(
+                {"op": "add", "phone": "+15552220000", "business_id": str(business_id)}
+            ))
+            result = MagicMock()
+            result.all.return_value = [("+15551110000", None)]
+            return result
+
+        db = MagicMock()
+        db.execute = execute
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=db)
+        session.__aexit__ = AsyncMock(return_value=False)
+        with patch("app.services.opt_out_index.async_session_factory", return_value=session):
+            await index._load()
+
+        assert index._entries == {(str(business_id), "+15552220000")}
+
+    @pytest.mark.asyncio
+    async def test_is_opted_out_skips_database_when_index_ready(self):
+        from app.services.voice import is_opted_out
+
+        db = MagicMock()
+        db.execute = AsyncMock()
+        with patch("app.services.voice.opt_out_index", self._ready_index()):
+            assert await is_opted_out(db, "+15553334444", uuid.uuid4()) is False
+        db.execute.assert_not_awaited()
+
+
+class TestPoolMetrics:
+    def test_hold_time_is_attributed_to_route(self):
+        from app.services import pool_metrics
+
+        pool_metrics.reset()
+        record = MagicMock(info={})
+        pool_metrics.set_route("/webhook/sms/incoming")
+        pool_metrics._on_checkout(None, record, None)
+        pool_metrics._on_checkin(None, record)
+        pool_metrics._on_checkin(None, record)
+
+        stats = pool_metrics.pool_hold_stats()
+        assert stats["/webhook/sms/incoming"]["checkouts"] == 1
+
+    def test_checkout_waits_and_timeouts_are_reported(self):
+        from app.services import pool_metrics
+
+        pool_metrics.reset()
+        pool_metrics._checkout_stats.record(0.001, waited=False, timed_out=False)
+        pool_metrics._checkout_stats.record(0.250, waited=True, timed_out=False)
+        pool_metrics._checkout_stats.record(10.0, waited=True, timed_out=True)
+
+        status = pool_metrics.pool_status(MagicMock())
+
+        assert status["checkouts"] == 3
+        assert status["waits"] == 2
+        assert status["timeouts"] == 1
+        assert status["checkout_max_ms"] == 10000.0
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_lets_one_trial_through(self):
+        from app.services.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=0)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.is_open
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert not breaker.is_open
+
+    @pytest.mark.asyncio
+    async def test_cancelled_trial_does_not_wedge_the_breaker(self):
+        import asyncio
+
+        from app.services import ai_engine
+        from app.services.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=asyncio.CancelledError)
+
+        with patch.object(ai_engine, "_openai_breaker", breaker), \
+                patch.object(ai_engine, "_get_openai_client", return_value=client):
+            with pytest.raises(asyncio.CancelledError):
+                await ai_engine._complete([])
+
+        assert breaker.is_open
+        assert breaker.allow()
+
+
+class TestTaskEventLoop:
+    @patch("app.worker.tasks.close_async_redis", new_callable=AsyncMock)
+    @patch("app.worker.tasks.close_async_twilio_client", new_callable=AsyncMock)
+    @patch("app.services.ai_engine.close_openai_client", new_callable=AsyncMock)
+    def test_loop_clients_are_closed_even_when_the_task_fails(
+        self, mock_openai, mock_twilio, mock_redis
+    ):
+        from app.worker.tasks import _run_async
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            _run_async(fail())
+
+        mock_twilio.assert_awaited_once()
+        mock_redis.assert_awaited_once()
+        mock_openai.assert_awaited_once()
+
+
+class TestDegradedTurn:
+    @pytest.mark.asyncio
+    @patch("app.services.ai_turn.release_connection", new_callable=AsyncMock)
+    @patch("app.services.ai_turn.record_ai_degradation", new_callable=AsyncMock)
+    @patch("app.services.ai_turn.schedule_follow_up", new_callable=AsyncMock)
+    @patch("app.services.ai_turn.send_sms", new_callable=AsyncMock)
+    @patch("app.services.ai_turn.generate_ai_response", new_callable=AsyncMock)
+    async def test_sends_fallback_and_schedules_retry(
+        self, mock_generate, mock_send, mock_follow_up, mock_record, mock_release
+    ):
+        from app.services.ai_engine import AIUnavailableError
+        from app.services.ai_turn import run_ai_turn
+
+        mock_generate.side_effect = AIUnavailableError("timeout")
+        mock_send.return_value = "SM999"
+        biz = MagicMock(id=uuid.uuid4(), ai_fallback_reply="One moment!")
+        convo = MagicMock(id=uuid.uuid4())
+
+        with patch("app.worker.tasks.celery_app") as mock_celery:
+            await run_ai_turn(MagicMock(), convo, biz, "+15552223333", "hi")
+
+        assert mock_send.await_args.kwargs["body"] == "One moment!"
+        mock_record.assert_awaited_once_with(biz.id, "timeout")
+        assert mock_celery.send_task.call_args.kwargs["args"][3] == "SM999"
+        mock_release.assert_awaited_once()
+        mock_follow_up.assert_not_awaited()
+
+
+class TestMessageStatusBuffer:
+    def test_keeps_most_advanced_status_per_sid(self):
+        from app.services.status_buffer import MessageStatusBuffer
+
+        buffer = MessageStatusBuffer(flush_ms=500, batch_size=100, hold_seconds=60)
+        buffer.add("SM1", "sent")
+        buffer.add("SM1", "delivered")
+        buffer.add("SM1", "queued")
+
+        assert len(buffer) == 1
+        assert buffer._pending["SM1"][0] == "delivered"
+
+    @pytest.mark.asyncio
+    @patch("app.services.status_buffer.async_session_factory")
+    async def test_unmatched_sids_are_held_for_next_flush(self, mock_factory):
+        from app.services.status_buffer import MessageStatusBuffer
+
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = ["SM1"]
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+        db.commit = AsyncMock()
+        mock_factory.return_value.__aenter__ = AsyncMock(return_value=db)
+        mock_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        buffer = MessageStatusBuffer(flush_ms=500, batch_size=100, hold_seconds=60)
+        buffer.add("SM1", "sent")
+        buffer.add("SM2", "sent")
+
+        assert await buffer.flush() == 1
+        db.execute.assert_awaited_once()
+        assert list(buffer._pending) == ["SM2"]
+
+    @pytest.mark.asyncio
+    @patch("app.services.status_buffer.async_session_factory")
+    async def test_failed_flush_requeues_only_within_hold(self, mock_factory):
+        import time
+
+        from app.services.status_buffer import MessageStatusBuffer
+
+        mock_factory.return_value.__aenter__ = AsyncMock(side_effect=OSError("db down"))
+        mock_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        buffer = MessageStatusBuffer(flush_ms=500, batch_size=100, hold_seconds=60)
+        buffer.add("SM1", "sent")
+        buffer.add("SM2", "sent")
+        buffer._pending["SM1"] = ("sent", time.monotonic() - 61)
+
+        assert await buffer.flush() == 0
+        assert list(buffer._pending) == ["SM2"]
+
+    def test_update_never_moves_status_backwards(self):
+        from sqlalchemy import update
+        from sqlalchemy.dialects import postgresql
+
+        from app.models.message import Message
+        from app.services.status_buffer import advance_status
+
+        sql = str(
+            update(Message)
+            .values(status=advance_status("sent"))
+            .compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        )
+
+        assert "ELSE messages.status END" in sql
+        assert ">= CASE messages.status WHEN" in sql
+
+
+class TestLiveVapiCall:
+    @pytest.mark.asyncio
+    async def test_handed_off_call_needs_no_query(self):
+        from app.services.vapi_call_cache import get_live_call, remember_live_call
+
+        business = MagicMock(id=uuid.uuid4())
+        call_id, lead_id = uuid.uuid4(), uuid.uuid4()
+        remember_live_call(business, call_id, "+15552223333", uuid.uuid4(), lead_id)
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        live = await get_live_call(db, str(call_id), str(business.id))
+
+        assert live.lead_id == lead_id
+        assert await get_live_call(db, str(call_id), str(uuid.uuid4())) is None
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_malformed_metadata_ids_are_not_found(self):
+        from app.services.vapi_call_cache import get_live_call
+
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        assert await get_live_call(db, "not-a-uuid", str(uuid.uuid4())) is None
+        assert await get_live_call(db, str(uuid.uuid4()), 12345) is None
+        db.execute.assert_not_awaited()
+
+    def test_save_lead_info_only_fills_blank_fields_in_sql(self):
+        from app.api.webhooks.vapi import _lead_info_updates
+
+        updates = _lead_info_updates({"name": "Sarah", "urgency": "high"})
+
+        assert updates["urgency"] == "high"
+        assert "coalesce" in str(updates["name"]).lower()
+        assert "status" in updates
+        assert _lead_info_updates({}) == {}
+
+
+class TestVapiReportSteps:
+    @pytest.mark.asyncio
+    async def test_completed_steps_are_not_repeated(self):
+        from app.services.vapi_reports import _run_step
+
+        report = MagicMock(completed_steps=["notify_owner"])
+        db = MagicMock()
+        db.commit = AsyncMock()
+        notify, sms = AsyncMock(), AsyncMock()
+
+        await _run_step(db, report, "notify_owner", notify)
+        await _run_step(db, report, "confirmation_sms", sms)
+
+        notify.assert_not_awaited()
+        sms.assert_awaited_once()
+        assert report.completed_steps == ["notify_owner", "confirmation_sms"]
+
+    @pytest.mark.asyncio
+    async def test_lease_is_renewed_before_each_side_effect(self):
+        from app.services.vapi_reports import _run_step
+
+        report = MagicMock(completed_steps=[], processing_until=None)
+        db = MagicMock()
+        db.commit = AsyncMock()
+
+        async def sms():
+            assert report.processing_until is not None
+            db.commit.assert_awaited_once()
+
+        await _run_step(db, report, "confirmation_sms", sms)
+
+        assert db.commit.await_count == 2
+
+    @pytest.mark.asyncio
+    @patch("app.services.vapi_reports.standalone_session")
+    async def test_report_leased_by_another_chain_is_left_alone(self, mock_session):
+        from app.services.vapi_reports import process_call_report
+
+        db = MagicMock()
+        db.scalar = AsyncMock(return_value=None)  # claim matched no row
+        db.commit = AsyncMock()
+        db.get = AsyncMock()
+        mock_session.return_value.__aenter__ = AsyncMock(return_value=db)
+        mock_session.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        await process_call_report(uuid.uuid4(), owner="task-2")
+
+        claim = db.scalar.await_args.args[0]
+        where = str(claim.whereclause)
+        assert "processing_until" in where and "processing_owner" in where
+        db.get.assert_not_awaited()
+
+
+class TestVapiAssistantSync:
+    def _db(self, config):
+        services = MagicMock()
+        services.scalars.return_value.all.return_value = []
+        configs = MagicMock()
+        configs.scalar_one_or_none.return_value = config
+        db = MagicMock()
+        # services, config, then the Business and VoiceAIConfig updates after a push
+        db.execute = AsyncMock(side_effect=[services, configs, MagicMock(), MagicMock()])
+        return db
+
+    def test_payload_hash_ignores_key_order(self):
+        from app.services.vapi import assistant_payload_hash
+
+        assert assistant_payload_hash({"a": 1, "b": [1, 2]}) == assistant_payload_hash({"b": [1, 2], "a": 1})
+        assert assistant_payload_hash({"a": 1}) != assistant_payload_hash({"a": 2})
+
+    @pytest.mark.asyncio
+    async def test_unchanged_payload_skips_patch(self):
+        from app.services.vapi import assistant_payload_hash, build_assistant_payload, sync_assistant
+
+        business = MagicMock(
+            id=uuid.uuid4(), vapi_assistant_id="asst_1", ai_greeting=None,
+            ai_instructions=None, call_recording_enabled=False,
+        )
+        config = MagicMock(
+            provider_assistant_id="asst_1", system_prompt_override=None,
+            greeting_override=None, voice_id=None, max_call_duration_seconds=300,
+        )
+        config.synced_payload_hash = assistant_payload_hash(build_assistant_payload(business, [], config))
+
+        with patch("app.services.vapi.httpx.AsyncClient") as client:
+            result = await sync_assistant(self._db(config), business)
+
+        assert result.changed is False
+        assert result.assistant_id == "asst_1"
+        client.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_changed_payload_is_pushed(self):
+        from app.services.vapi import sync_assistant
+
+        business = MagicMock(
+            id=uuid.uuid4(), vapi_assistant_id="asst_1", ai_greeting=None,
+            ai_instructions="Always ask for the unit's age", call_recording_enabled=False,
+        )
+        config = MagicMock(
+            provider_assistant_id="asst_1", system_prompt_override=None,
+            greeting_override=None, voice_id=None, max_call_duration_seconds=300,
+            synced_payload_hash="stale",
+        )
+        db = self._db(config)
+        db.in_transaction.return_value = False
+        db.flush = AsyncMock()
+        client = AsyncMock()
+        client.patch.return_value = MagicMock(status_code=200, json=lambda: {"id": "asst_1"})
+        client.__aenter__.return_value = client
+
+        with patch("app.services.vapi.httpx.AsyncClient", return_value=client), \
+                patch("app.services.vapi.invalidate_on_commit"):
+            result = await sync_assistant(db, business)
+
+        assert result.changed is True
+        client.patch.assert_awaited_once()
+        assert db.execute.await_count == 4
+
+
+class TestTranscripts:
+    def test_report_messages_become_structured_turns(self):
+        from app.services.transcripts import turns_from_report
+
+        turns = turns_from_report({
+            "artifact": {"messages": [
+                {"role": "system", "message": "You are a receptionist"},
+                {"role": "bot", "message": "Hi! What's going on?", "secondsFromStart": 0.4},
+                {"role": "user", "message": "AC is out", "secondsFromStart": 3.1},
+            ]},
+            "transcript": "AI: Hi! What's going on?\nUser: AC is out",
+        })
+
+        assert turns == [
+            {"role": "assistant", "content": "Hi! What's going on?", "seconds": 0.4},
+            {"role": "user", "content": "AC is out", "seconds": 3.1},
+        ]
+
+    def test_flat_transcript_round_trips_through_compression(self):
+        from app.services.transcripts import (
+            compress_turns, decompress_turns, flatten_turns, parse_flat_transcript,
+        )
+
+        turns = parse_flat_transcript("AI: Hi there\nUser: My furnace\nis making noise")
+
+        assert turns[1] == {"role": "user", "content": "My furnace\nis making noise", "seconds": None}
+        assert decompress_turns(compress_turns(turns)) == turns
+        assert flatten_turns(turns).startswith("assistant: Hi there\nuser: ")
+
+
+class TestSearch:
+    def test_transcript_snippet_highlights_first_matching_turn(self):
+        from app.services.search import transcript_snippet
+
+        turns = [
+            {"role": "assistant", "content": "Thanks for calling!", "seconds": 0.0},
+            {"role": "user", "content": "I smell gas near the furnace on Elm St", "seconds": 4.2},
+        ]
+
+        assert transcript_snippet(turns, "gas smell") == "user: I **smell** **gas** near the furnace on Elm St"
+
+    def test_like_pattern_escapes_wildcards(self):
+        from app.services.search import _like_pattern
+
+        assert _like_pattern("50%_off") == "%50\\%\\_off%"
+
+
+class TestLocalAuth:
+    def _token(self, sub="user-1", secret="test-secret", **claims):
+        import time
+
+        import jwt
+
+        payload = {"sub": sub, "aud": "authenticated", "exp": int(time.time()) + 3600, **claims}
+        return jwt.encode(payload, secret, algorithm="HS256")
+
+    @pytest.mark.asyncio
+    async def test_business_is_resolved_without_remote_call_and_cached(self, mock_business):
+        from app.middleware import auth
+
+        business_cache.invalidate_business()
+        mock_business.google_place_id = None
+        mock_business.vapi_assistant_id = None
+        mock_business.call_recording_enabled = True
+        mock_business.two_party_consent_state = False
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = mock_business
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+        request = MagicMock(headers={"Authorization": f"Bearer {self._token()}"})
+
+        with patch.object(auth.settings, "supabase_url", "https://example.supabase.co"), \
+                patch.object(auth.settings, "supabase_jwt_secret", "test-secret"):
+            first = await auth.get_current_business(request, db)
+            second = await auth.get_current_business(request, db)
+
+        assert first.id == mock_business.id
+        assert second is first
+        db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bad_signature_is_rejected(self):
+        from fastapi import HTTPException
+
+        from app.middleware import auth
+
+        request = MagicMock(headers={"Authorization": f"Bearer {self._token(secret='wrong')}"})
+
+        with patch.object(auth.settings, "supabase_url", "https://example.supabase.co"), \
+                patch.object(auth.settings, "supabase_jwt_secret", "test-secret"):
+            with pytest.raises(HTTPException) as exc:
+                await auth.get_current_business(request, MagicMock())
+
+        assert exc.value.status_code == 401
+
+
+class TestRateLimit:
+    @pytest.mark.asyncio
+    @patch("app.services.rate_limit.get_async_redis", side_effect=ConnectionError("redis down"))
+    async def test_local_bucket_limits_when_redis_is_down(self, _):
+        from app.services.rate_limit import TokenBucketLimiter
+
+        limiter = TokenBucketLimiter("test", rate_per_minute=1, burst=2)
+
+        assert await limiter.allow("biz-1")
+        assert await limiter.allow("biz-1")
+        assert not await limiter.allow("biz-1")
+        assert await limiter.allow("biz-2")
+
+    @pytest.mark.asyncio
+    @patch("app.services.rate_limit.logger")
+    @patch("app.services.rate_limit.get_async_redis", side_effect=ConnectionError("redis down"))
+    async def test_fallback_is_logged_once_per_outage(self, _, mock_logger):
+        from app.services.rate_limit import TokenBucketLimiter
+
+        limiter = TokenBucketLimiter("test", rate_per_minute=60, burst=10)
+        for _ in range(5):
+            await limiter.allow("biz-1")
+
+        mock_logger.warning.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("app.services.ai_turn.release_connection", new_callable=AsyncMock)
+    @patch("app.services.ai_turn.record_ai_degradation", new_callable=AsyncMock)
+    @patch("app.services.ai_turn.send_sms", new_callable=AsyncMock)
+    @patch("app.services.ai_turn.generate_ai_response", new_callable=AsyncMock)
+    @patch("app.services.ai_turn.admit_ai_turn", new_callable=AsyncMock, return_value=False)
+    async def test_over_limit_turn_gets_fallback_without_openai(
+        self, _, mock_generate, mock_send, mock_record, mock_release
+    ):
+        from app.services.ai_turn import run_ai_turn
+
+        biz = MagicMock(id=uuid.uuid4(), ai_fallback_reply="One moment!")
+
+        with patch("app.worker.tasks.celery_app"):
+            await run_ai_turn(MagicMock(), MagicMock(id=uuid.uuid4()), biz, "+15552223333", "hi")
+
+        mock_generate.assert_not_awaited()
+        assert mock_send.await_args.kwargs["body"] == "One moment!"
+        mock_record.assert_awaited_once_with(biz.id, "rate_limited")
+
+
+class TestReadReplicaRouting:
+    @pytest.mark.asyncio
+    async def test_recent_writer_reads_from_primary(self):
+        from app import database
+
+        primary, replica = MagicMock(), MagicMock()
+        database._recent_writers.set("biz-1", True)
+
+        with patch.object(database.get_settings(), "database_replica_url", "postgresql://replica/db"), \
+                patch("app.database._get_session_factory", return_value=primary), \
+                patch("app.database._get_replica_session_factory", return_value=replica):
+            session = await database._open_read_session("biz-1")
+
+        assert session is primary.return_value
+        replica.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_dead_replica_falls_back_to_primary(self):
+        from app import database
+        from app.services.circuit_breaker import CircuitBreaker
+
+        replica_session = MagicMock()
+        replica_session.connection = AsyncMock(side_effect=OSError("connection refused"))
+        replica_session.close = AsyncMock()
+        primary = MagicMock()
+
+        with patch.object(database.get_settings(), "database_replica_url", "postgresql://replica/db"), \
+                patch.object(database, "_replica_breaker", CircuitBreaker("test", 1, 30)) as breaker, \
+                patch("app.database._get_session_factory", return_value=primary), \
+                patch("app.database._get_replica_session_factory", return_value=MagicMock(return_value=replica_session)):
+            session = await database._open_read_session(None)
+
+        assert session is primary.return_value
+        replica_session.close.assert_awaited_once()
+        assert breaker.is_open
+
+
+class TestKeysetPagination:
+    def test_cursor_round_trips_typed_keys(self):
+        from datetime import datetime, timezone
+
+        from app.models.call import Call
+        from app.services.pagination import decode_cursor, encode_cursor
+
+        values = (datetime(2026, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc), uuid.uuid4())
+        cursor = encode_cursor(values)
+
+        assert decode_cursor(cursor, (Call.created_at, Call.id)) == values
+
+    def test_tampered_cursor_is_rejected(self):
+        from app.models.call import Call
+        from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("not-a-cursor", (Call.created_at, Call.id))
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(encode_cursor(["2026-03-01T12:00:00"]), (Call.created_at, Call.id))
+
+    def test_limit_is_capped(self):
+        from app.services.pagination import MAX_PAGE_SIZE, clamp_limit
+
+        assert clamp_limit(10_000) == MAX_PAGE_SIZE
+        assert clamp_limit(0) >= 1
+
+    @pytest.mark.asyncio
+    async def test_next_cursor_only_when_more_rows(self):
+        from datetime import datetime, timezone
+
+        from app.models.call import Call
+        from app.services.pagination import decode_cursor, fetch_page
+        from sqlalchemy import select
+
+        calls = [
+            MagicMock(created_at=datetime(2026, 3, 1, 12, i, tzinfo=timezone.utc), id=uuid.uuid4())
+            for i in range(3, 0, -1)
+        ]
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = calls
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+        keys = (Call.created_at, Call.id)
+
+        page = await fetch_page(db, select(Call), keys, None, limit=2)
+
+        assert page.items == calls[:2]
+        assert decode_cursor(page.next_cursor, keys) == (calls[1].created_at, calls[1].id)
+
+        result.scalars.return_value.all.return_value = calls[2:]
+        last = await fetch_page(db, select(Call), keys, page.next_cursor, limit=2)
+        assert last.items == calls[2:]
+        assert last.next_cursor is None
+
+    @pytest.mark.asyncio
+    @patch("app.api.appointments.get_appointments", new_callable=AsyncMock)
+    async def test_appointments_start_at_the_business_today(self, mock_get):
+        from datetime import date, datetime
+
+        import pytz
+
+        from app.api.appointments import list_appointments
+        from app.services.pagination import Page
+
+        mock_get.return_value = Page([], None)
+        business = MagicMock(id=uuid.uuid4(), timezone="America/New_York")
+
+        await list_appointments(None, None, None, 50, business=business, db=MagicMock())
+        today = datetime.now(pytz.timezone("America/New_York")).date()
+        assert mock_get.await_args.kwargs["date_from"] == today
+
+        await list_appointments(None, date(2026, 1, 31), None, 50, business=business, db=MagicMock())
+        assert mock_get.await_args.kwargs["date_from"] is None
+
+
+class TestPartitions:
+    def test_add_months_crosses_years(self):
+        from datetime import date
+
+        from app.services.partitions import add_months
+
+        assert add_months(date(2026, 11, 15), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 31), -1) == date(2025, 12, 1)
+
+    def test_only_whole_months_before_cutoff_expire(self):
+        from datetime import date
+
+        from app.services.partitions import expired_partitions
+
+        partitions = {
+            "messages_2024_10": date(2024, 10, 1),
+            "messages_2024_09": date(2024, 9, 1),
+            "messages_2024_11": date(2024, 11, 1),
+        }
+
+        assert expired_partitions(partitions, date(2024, 11, 1)) == [
+            "messages_2024_09",
+            "messages_2024_10",
+        ]
+
+    def test_ensure_partitions_creates_missing_months(self):
+        from datetime import date
+
+        from app.services.partitions import ensure_partitions, month_start
+
+        conn = MagicMock()
+        conn.scalar.return_value = None  # nothing exists yet
+
+        created = ensure_partitions(conn, months_ahead=1)
+
+        this_month = month_start(date.today())
+        assert f"messages_{this_month:%Y_%m}" in created
+        assert "calls_default" in created
+        assert len(created) == 2 * 3  # default + this month + next, per table
+        sql = [str(c.args[0]) for c in conn.execute.call_args_list]
+        assert any(
+            f"PARTITION OF messages FOR VALUES FROM ('{this_month} 00:00:00+00')" in s for s in sql
+        )
+
+    def test_tenants_at_horizon_are_left_to_partition_drops(self):
+        from datetime import date
+
+        from app.services import partitions
+
+        conn = MagicMock()
+        conn.execute.return_value.all.return_value = [(uuid.uuid4(), None), (uuid.uuid4(), 6)]
+        conn.execute.return_value.rowcount = 0
+
+        with patch.object(partitions, "retention_horizon_months", return_value=24), \
+                patch.object(partitions.settings, "data_retention_months", 24):
+            partitions.purge_tenant_rows(conn, today=date(2026, 10, 16))
+
+        deletes = [c for c in conn.execute.call_args_list if "DELETE" in str(c.args[0])]
+        assert len(deletes) == 3  # messages, calls, call_transcripts of the 6-month tenant
+        assert {c.args[1]["cutoff"] for c in deletes} == {date(2026, 4, 1)}
+
+    @pytest.mark.asyncio
+    async def test_duplicate_inbound_sid_rejected_by_ledger(self):
+        from sqlalchemy.exc import IntegrityError
+
+        from app.models.twilio_sid import TwilioSid
+        from app.services.sms import save_message
+
+        db = MagicMock()
+        db.begin_nested.return_value.__aenter__ = AsyncMock()
+        db.begin_nested.return_value.__aexit__ = AsyncMock(
+            side_effect=IntegrityError("INSERT", {}, Exception("duplicate key"))
+        )
+
+        result = await save_message(
+            db, uuid.uuid4(), uuid.uuid4(), "inbound", "caller", "hi", twilio_message_sid="SM123"
+        )
+
+        assert result is None
+        ledger_row = db.add_all.call_args.args[0][0]
+        assert isinstance(ledger_row, TwilioSid) and ledger_row.sid == "SM123"
@@ -6,6 +6,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.services.call_prefetch import CallerContext
 
 client = TestClient(app)
 
@@ -42,8 +43,7 @@ class TestVoiceIncoming:
     @patch("app.api.webhooks.voice.send_sms")
     @patch("app.api.webhooks.voice.create_conversation")
     @patch("app.api.webhooks.voice.create_or_get_lead")
-    @patch("app.api.webhooks.voice.get_active_conversation")
-    @patch("app.api.webhooks.voice.is_opted_out")
+    @patch("app.api.webhooks.voice.start_caller_prefetch")
     @patch("app.api.webhooks.voice.update_call")
     @patch("app.api.webhooks.voice.get_call")
     @patch("app.api.webhooks.voice.get_business_by_twilio_number")
@@ -51,8 +51,8 @@ class TestVoiceIncoming:
     @patch("app.api.webhooks.voice.is_after_hours")
     def test_incoming_call_returns_dial_twiml(
         self, mock_after_hrs, mock_create_call, mock_get_biz,
-        mock_get_call, mock_update_call, mock_opted_out,
-        mock_get_convo, mock_create_lead, mock_create_convo,
+        mock_get_call, mock_update_call, mock_prefetch,
+        mock_create_lead, mock_create_convo,
         mock_send_sms, mock_notify, mock_schedule,
     ):
         biz = MagicMock()
@@ -74,6 +74,7 @@ class TestVoiceIncoming:
         assert response.status_code == 200
         assert "<Dial" in response.text
         assert biz.business_phone in response.text
+        mock_prefetch.assert_called_once_with("CA123", biz.id, "+15551234567")
 
 
 class TestCallCompleted:
@@ -90,6 +91,7 @@ class TestCallCompleted:
 
         biz = MagicMock()
         biz.id = call.business_id
+        biz.subscription_status = "active"
         mock_get_biz.return_value = biz
 
         response = client.post(
@@ -111,14 +113,13 @@ class TestCallCompleted:
     @patch("app.api.webhooks.voice.send_sms")
     @patch("app.api.webhooks.voice.create_conversation")
     @patch("app.api.webhooks.voice.create_or_get_lead")
-    @patch("app.api.webhooks.voice.get_active_conversation")
-    @patch("app.api.webhooks.voice.is_opted_out")
+    @patch("app.api.webhooks.voice.resolve_caller_context")
     @patch("app.api.webhooks.voice.update_call")
     @patch("app.api.webhooks.voice.get_call")
     @patch("app.api.webhooks.voice.get_business_by_twilio_number")
     def test_missed_call_triggers_sms(
         self, mock_get_biz, mock_get_call, mock_update_call,
-        mock_opted_out, mock_get_convo, mock_create_lead,
+        mock_resolve, mock_create_lead,
         mock_create_convo, mock_send_sms, mock_notify, mock_schedule,
     ):
         call = MagicMock()
@@ -129,13 +130,15 @@ class TestCallCompleted:
 
         biz = MagicMock()
         biz.id = call.business_id
+        biz.subscription_status = "active"
         biz.name = "Test HVAC"
         biz.ai_greeting = None
         biz.twilio_number = "+15550001111"
         mock_get_biz.return_value = biz
 
-        mock_opted_out.return_value = False
-        mock_get_convo.return_value = None
+        mock_resolve.return_value = CallerContext(
+            opted_out=False, line_type="mobile", lead_id=None, conversation_id=None
+        )
 
         lead = MagicMock()
         lead.id = uuid.uuid4()
@@ -164,9 +167,9 @@ class TestCallCompleted:
     @patch("app.api.webhooks.voice.update_call")
     @patch("app.api.webhooks.voice.get_call")
     @patch("app.api.webhooks.voice.get_business_by_twilio_number")
-    @patch("app.api.webhooks.voice.is_opted_out")
+    @patch("app.api.webhooks.voice.resolve_caller_context")
     def test_opted_out_caller_not_texted(
-        self, mock_opted_out, mock_get_biz, mock_get_call, mock_update,
+        self, mock_resolve, mock_get_biz, mock_get_call, mock_update,
     ):
         call = MagicMock()
         call.id = uuid.uuid4()
@@ -175,9 +178,12 @@ class TestCallCompleted:
 
         biz = MagicMock()
         biz.id = call.business_id
+        biz.subscription_status = "active"
         mock_get_biz.return_value = biz
 
-        mock_opted_out.return_value = True
+        mock_resolve.return_value = CallerContext(
+            opted_out=True, line_type="unknown", lead_id=None, conversation_id=None
+        )
 
         response = client.post(
             "/webhook/voice/call-completed",
@@ -207,6 +213,25 @@ class TestSmsIncoming:
 
         assert response.status_code == 200
 
+    @patch("app.api.webhooks.sms.get_business_by_twilio_number")
+    @patch("app.api.webhooks.sms.claim_webhook", new_callable=AsyncMock)
+    def test_retried_message_sid_is_dropped(self, mock_claim, mock_get_biz):
+        mock_claim.return_value = False
+
+        response = client.post(
+            "/webhook/sms/incoming",
+            data={
+                "From": "+15551234567",
+                "To": "+15550001111",
+                "Body": "Hello",
+                "MessageSid": "SM123",
+            },
+        )
+
+        assert response.status_code == 200
+        mock_claim.assert_awaited_once_with("sms", "SM123")
+        mock_get_biz.assert_not_called()
+
     @patch("app.api.webhooks.sms.handle_opt_out")
     @patch("app.api.webhooks.sms.get_business_by_twilio_number")
     def test_stop_keyword_triggers_opt_out(self, mock_get_biz, mock_opt_out):
@@ -241,6 +266,140 @@ class TestSmsIncoming:
         assert "Welcome back" in response.text
         mock_opt_in.assert_called_once()
 
+    @patch("app.api.webhooks.sms.run_ai_turn")
+    @patch("app.api.webhooks.sms.enqueue_ai_turn")
+    @patch("app.api.webhooks.sms.cancel_pending_follow_ups")
+    @patch("app.api.webhooks.sms.save_message")
+    @patch("app.api.webhooks.sms.load_inbound_context")
+    @patch("app.api.webhooks.sms.get_business_by_twilio_number")
+    def test_fast_ack_queues_ai_turn(
+        self, mock_get_biz, mock_load_context, mock_save, mock_cancel,
+        mock_enqueue, mock_run_turn,
+    ):
+        from app.api.webhooks.sms import settings
+
+        biz = MagicMock()
+        biz.id = uuid.uuid4()
+        biz.twilio_number = "+15550001111"
+        mock_get_biz.return_value = biz
+
+        convo = MagicMock()
+        convo.id = uuid.uuid4()
+        convo.status = "active"
+        mock_load_context.return_value = MagicMock(conversation=convo)
+        mock_enqueue.return_value = True
+
+        with patch.object(settings, "sms_fast_ack", True):
+            response = client.post(
+                "/webhook/sms/incoming",
+                data={"From": "+15551234567", "To": "+15550001111", "Body": "My AC is out"},
+            )
+
+        assert response.status_code == 200
+        mock_save.assert_called_once()
+        mock_enqueue.assert_called_once_with(
+            convo.id, "+15550001111", "+15551234567", "My AC is out",
+            burst=None, received_at=mock_save.return_value.created_at,
+        )
+        mock_run_turn.assert_not_called()
+
+    @patch("app.api.webhooks.sms.run_ai_turn")
+    @patch("app.api.webhooks.sms.claim_limit_notice", new_callable=AsyncMock, return_value=False)
+    @patch("app.api.webhooks.sms.record_ai_degradation", new_callable=AsyncMock)
+    @patch("app.api.webhooks.sms.admit_inbound_sms", new_callable=AsyncMock, return_value=False)
+    @patch("app.api.webhooks.sms.cancel_pending_follow_ups")
+    @patch("app.api.webhooks.sms.save_message")
+    @patch("app.api.webhooks.sms.load_inbound_context")
+    @patch("app.api.webhooks.sms.get_business_by_twilio_number")
+    def test_over_limit_text_is_stored_but_not_answered(
+        self, mock_get_biz, mock_load_context, mock_save, mock_cancel,
+        mock_admit, mock_record, mock_notice, mock_run_turn,
+    ):
+        mock_get_biz.return_value = MagicMock(id=uuid.uuid4())
+        convo = MagicMock()
+        convo.id = uuid.uuid4()
+        convo.status = "active"
+        mock_load_context.return_value = MagicMock(conversation=convo)
+
+        response = client.post(
+            "/webhook/sms/incoming",
+            data={"From": "+15551234567", "To": "+15550001111", "Body": "Hello again"},
+        )
+
+        assert response.status_code == 200
+        mock_save.assert_called_once()
+        mock_record.assert_awaited_once()
+        assert mock_record.await_args.args[1] == "sms_rate_limited"
+        mock_run_turn.assert_not_called()
+
+    @patch("app.api.webhooks.sms.run_ai_turn")
+    @patch("app.api.webhooks.sms.cancel_pending_follow_ups")
+    @patch("app.api.webhooks.sms.unanswered_inbound")
+    @patch("app.api.webhooks.sms.save_message")
+    @patch("app.api.webhooks.sms.load_inbound_context")
+    @patch("app.api.webhooks.sms.get_business_by_twilio_number")
+    def test_stored_but_unanswered_retry_is_answered(
+        self, mock_get_biz, mock_load_context, mock_save, mock_unanswered,
+        mock_cancel, mock_run_turn,
+    ):
+        biz = MagicMock()
+        biz.id = uuid.uuid4()
+        mock_get_biz.return_value = biz
+
+        convo = MagicMock()
+        convo.id = uuid.uuid4()
+        convo.status = "active"
+        context = MagicMock(conversation=convo)
+        mock_load_context.return_value = context
+        mock_save.return_value = None  # first delivery committed it, then failed
+        stored = MagicMock(body="My AC is out")
+        mock_unanswered.return_value = stored
+
+        response = client.post(
+            "/webhook/sms/incoming",
+            data={
+                "From": "+15551234567",
+                "To": "+15550001111",
+                "Body": "My AC is out",
+                "MessageSid": "SM123",
+            },
+        )
+
+        assert response.status_code == 200
+        mock_unanswered.assert_called_once()
+        assert mock_unanswered.call_args.args[1:] == (convo.id, "SM123")
+        mock_run_turn.assert_called_once()
+        assert mock_run_turn.call_args.args[4] == "My AC is out"
+        assert mock_run_turn.call_args.kwargs["received_at"] == stored.created_at
+
+    @patch("app.api.webhooks.sms.run_ai_turn")
+    @patch("app.api.webhooks.sms.unanswered_inbound")
+    @patch("app.api.webhooks.sms.save_message")
+    @patch("app.api.webhooks.sms.load_inbound_context")
+    @patch("app.api.webhooks.sms.get_business_by_twilio_number")
+    def test_answered_retry_is_dropped(
+        self, mock_get_biz, mock_load_context, mock_save, mock_unanswered, mock_run_turn,
+    ):
+        mock_get_biz.return_value = MagicMock(id=uuid.uuid4())
+        convo = MagicMock()
+        convo.id = uuid.uuid4()
+        mock_load_context.return_value = MagicMock(conversation=convo)
+        mock_save.return_value = None
+        mock_unanswered.return_value = None
+
+        response = client.post(
+            "/webhook/sms/incoming",
+            data={
+                "From": "+15551234567",
+                "To": "+15550001111",
+                "Body": "My AC is out",
+                "MessageSid": "SM123",
+            },
+        )
+
+        assert response.status_code == 200
+        mock_run_turn.assert_not_called()
+
 
 class TestSmsStatus:
     """Tests for POST /webhook/sms/status."""
@@ -1,6 +1,6 @@
 "use client";
 
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { DashboardLayout } from "@/components/layout/dashboard-layout";
 import { useAuth } from "@/lib/auth-context";
 import { getAppointments, type Appointment } from "@/lib/api";
@@ -8,15 +8,21 @@ import { Calendar, Clock, MapPin, AlertTriangle } from "lucide-react";
 import { SkeletonList } from "@/components/ui/skeleton";
 import { EmptyState } from "@/components/ui/empty-state";
 import { StatusBadge } from "@/components/ui/status-badge";
+import { LoadMore } from "@/components/ui/load-more";
 
 export default function AppointmentsPage() {
   const { token } = useAuth();
 
-  const { data, isLoading, isError } = useQuery({
-    queryKey: ["appointments"],
-    queryFn: () => getAppointments(token!),
-    enabled: !!token,
-  });
+  // Upcoming appointments, soonest first (the API starts at the business's today)
+  const { data, isLoading, isError, hasNextPage, fetchNextPage, isFetchingNextPage } =
+    useInfiniteQuery({
+      queryKey: ["appointments"],
+      queryFn: ({ pageParam }) => getAppointments(token!, pageParam),
+      initialPageParam: undefined as string | undefined,
+      getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+      enabled: !!token,
+    });
+  const appointments = data?.pages.flatMap((page) => page.appointments) ?? [];
 
   return (
     <DashboardLayout>
@@ -30,10 +36,10 @@ export default function AppointmentsPage() {
           </div>
         ) : isLoading ? (
           <SkeletonList rows={4} />
-        ) : data?.appointments?.length ? (
+        ) : appointments.length ? (
           <div className="bg-white rounded-card shadow-card">
             <ul className="divide-y divide-gray-100">
-              {data.appointments.map((appt: Appointment) => (
+              {appointments.map((appt: Appointment) => (
                 <li key={appt.id} className="px-4 py-4 hover:bg-warm-white transition-colors">
                   <div className="flex items-center justify-between">
                     <div className="flex-1">
@@ -67,11 +73,16 @@ export default function AppointmentsPage() {
                 </li>
               ))}
             </ul>
+            <LoadMore
+              hasMore={hasNextPage}
+              loading={isFetchingNextPage}
+              onClick={() => fetchNextPage()}
+            />
           </div>
         ) : (
           <EmptyState
             icon={Calendar}
-            heading="No appointments scheduled"
+            heading="No upcoming appointments"
             description="Appointments are created when the AI successfully books a service call with a lead."
           />
         )}
@@ -1,7 +1,7 @@
 "use client";
 
 import { useState } from "react";
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { DashboardLayout } from "@/components/layout/dashboard-layout";
 import { useAuth } from "@/lib/auth-context";
 import { getCalls, type Call } from "@/lib/api";
@@ -11,6 +11,7 @@ import { Phone, PhoneMissed, PhoneIncoming, AlertTriangle } from "lucide-react";
 import { SkeletonList } from "@/components/ui/skeleton";
 import { EmptyState } from "@/components/ui/empty-state";
 import { StatusBadge } from "@/components/ui/status-badge";
+import { LoadMore } from "@/components/ui/load-more";
 
 const tabs = [
   { key: "", label: "All Calls" },
@@ -23,11 +24,15 @@ export default function CallsPage() {
   const [filter, setFilter] = useState("");
   useRealtimeCalls();
 
-  const { data, isLoading, isError } = useQuery({
-    queryKey: ["calls", filter],
-    queryFn: () => getCalls(token!, filter || undefined),
-    enabled: !!token,
-  });
+  const { data, isLoading, isError, hasNextPage, fetchNextPage, isFetchingNextPage } =
+    useInfiniteQuery({
+      queryKey: ["calls", filter],
+      queryFn: ({ pageParam }) => getCalls(token!, filter || undefined, pageParam),
+      initialPageParam: undefined as string | undefined,
+      getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+      enabled: !!token,
+    });
+  const calls = data?.pages.flatMap((page) => page.calls) ?? [];
 
   return (
     <DashboardLayout>
@@ -59,7 +64,7 @@ export default function CallsPage() {
           </div>
         ) : isLoading ? (
           <SkeletonList rows={5} />
-        ) : data?.calls?.length ? (
+        ) : calls.length ? (
           <div className="bg-white rounded-card shadow-card">
             <table className="w-full">
               <thead>
@@ -79,7 +84,7 @@ export default function CallsPage() {
                 </tr>
               </thead>
               <tbody className="divide-y divide-gray-50">
-                {data.calls.map((call: Call) => (
+                {calls.map((call: Call) => (
                   <tr key={call.id} className="hover:bg-warm-white transition-colors">
                     <td className="px-4 py-3">
                       <span className="inline-flex items-center gap-1.5">
@@ -104,6 +109,11 @@ export default function CallsPage() {
                 ))}
               </tbody>
             </table>
+            <LoadMore
+              hasMore={hasNextPage}
+              loading={isFetchingNextPage}
+              onClick={() => fetchNextPage()}
+            />
           </div>
         ) : (
           <EmptyState
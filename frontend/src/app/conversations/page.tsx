@@ -1,7 +1,7 @@
 "use client";
 
 import { useState } from "react";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useInfiniteQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { DashboardLayout } from "@/components/layout/dashboard-layout";
 import { useAuth } from "@/lib/auth-context";
 import {
@@ -29,6 +29,7 @@ import {
   ChevronUp,
 } from "lucide-react";
 import { SkeletonList } from "@/components/ui/skeleton";
+import { LoadMore } from "@/components/ui/load-more";
 
 export default function ConversationsPage() {
   const { token } = useAuth();
@@ -39,16 +40,24 @@ export default function ConversationsPage() {
 
   useRealtimeMessages(selectedId || undefined);
 
-  const { data: listData, isLoading, isError } = useQuery({
+  const list = useInfiniteQuery({
     queryKey: ["conversations"],
-    queryFn: () => getConversations(token!),
+    queryFn: ({ pageParam }) => getConversations(token!, undefined, pageParam),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
     enabled: !!token,
     refetchInterval: 15000,
   });
+  const { isLoading, isError } = list;
+  const conversations = list.data?.pages.flatMap((page) => page.conversations) ?? [];
 
-  const { data: detailData } = useQuery({
+  // Pages run newest first (each one in chronological order); the next
+  // cursor loads earlier messages
+  const detail = useInfiniteQuery({
     queryKey: ["conversation", selectedId],
-    queryFn: () => getConversation(token!, selectedId!),
+    queryFn: ({ pageParam }) => getConversation(token!, selectedId!, pageParam),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
     enabled: !!token && !!selectedId,
     refetchInterval: 10000,
   });
@@ -77,8 +86,8 @@ export default function ConversationsPage() {
     },
   });
 
-  const convo = detailData?.conversation;
-  const messages = detailData?.messages || [];
+  const convo = detail.data?.pages[0]?.conversation;
+  const messages = [...(detail.data?.pages ?? [])].reverse().flatMap((page) => page.messages);
   const isVoiceConvo = convo?.channel === "voice";
 
   return (
@@ -96,49 +105,56 @@ export default function ConversationsPage() {
             </div>
           ) : isLoading ? (
             <SkeletonList rows={4} />
-          ) : listData?.conversations?.length ? (
-            <ul className="divide-y divide-gray-50">
-              {listData.conversations.map((c: Conversation) => (
-                <li key={c.id}>
-                  <button
-                    onClick={() => {
-                      setSelectedId(c.id);
-                      setShowTranscript(false);
-                    }}
-                    className={`w-full text-left px-4 py-3 hover:bg-warm-white transition-colors ${
-                      selectedId === c.id ? "bg-ember/5 border-l-2 border-ember" : ""
-                    }`}
-                  >
-                    <div className="flex items-center justify-between">
-                      <div className="flex items-center gap-1.5">
-                        {c.channel === "voice" ? (
-                          <Phone className="h-3.5 w-3.5 text-teal" />
-                        ) : (
-                          <MessageSquare className="h-3.5 w-3.5 text-slate-muted" />
-                        )}
-                        <p className="text-sm font-medium text-navy truncate">
-                          {c.lead_name || formatPhone(c.lead_phone || "Unknown")}
-                        </p>
+          ) : conversations.length ? (
+            <>
+              <ul className="divide-y divide-gray-50">
+                {conversations.map((c: Conversation) => (
+                  <li key={c.id}>
+                    <button
+                      onClick={() => {
+                        setSelectedId(c.id);
+                        setShowTranscript(false);
+                      }}
+                      className={`w-full text-left px-4 py-3 hover:bg-warm-white transition-colors ${
+                        selectedId === c.id ? "bg-ember/5 border-l-2 border-ember" : ""
+                      }`}
+                    >
+                      <div className="flex items-center justify-between">
+                        <div className="flex items-center gap-1.5">
+                          {c.channel === "voice" ? (
+                            <Phone className="h-3.5 w-3.5 text-teal" />
+                          ) : (
+                            <MessageSquare className="h-3.5 w-3.5 text-slate-muted" />
+                          )}
+                          <p className="text-sm font-medium text-navy truncate">
+                            {c.lead_name || formatPhone(c.lead_phone || "Unknown")}
+                          </p>
+                        </div>
+                        <span
+                          className={`text-xs px-2 py-0.5 rounded-full ${
+                            c.status === "human_active"
+                              ? "bg-purple-50 text-purple-700"
+                              : c.status === "active"
+                              ? "bg-teal/10 text-teal"
+                              : "bg-gray-100 text-slate-light"
+                          }`}
+                        >
+                          {c.status === "human_active" ? "Human" : c.status}
+                        </span>
                       </div>
-                      <span
-                        className={`text-xs px-2 py-0.5 rounded-full ${
-                          c.status === "human_active"
-                            ? "bg-purple-50 text-purple-700"
-                            : c.status === "active"
-                            ? "bg-teal/10 text-teal"
-                            : "bg-gray-100 text-slate-light"
-                        }`}
-                      >
-                        {c.status === "human_active" ? "Human" : c.status}
-                      </span>
-                    </div>
-                    <p className="text-xs text-slate-muted mt-0.5 truncate">
-                      {c.channel === "voice" ? "Voice AI call" : c.last_message || "No messages yet"}
-                    </p>
-                  </button>
-                </li>
-              ))}
-            </ul>
+                      <p className="text-xs text-slate-muted mt-0.5 truncate">
+                        {c.channel === "voice" ? "Voice AI call" : c.last_message || "No messages yet"}
+                      </p>
+                    </button>
+                  </li>
+                ))}
+              </ul>
+              <LoadMore
+                hasMore={list.hasNextPage}
+                loading={list.isFetchingNextPage}
+                onClick={() => list.fetchNextPage()}
+              />
+            </>
           ) : (
             <div className="text-center py-12 px-4">
               <MessageSquare className="h-8 w-8 text-slate-muted mx-auto mb-3" />
@@ -250,6 +266,12 @@ export default function ConversationsPage() {
 
               {/* Messages */}
               <div className="flex-1 overflow-y-auto p-4 space-y-3">
+                <LoadMore
+                  hasMore={detail.hasNextPage}
+                  loading={detail.isFetchingNextPage}
+                  onClick={() => detail.fetchNextPage()}
+                  label="Load earlier messages"
+                />
                 {messages.length === 0 && isVoiceConvo ? (
                   <div className="text-center py-8 text-slate-muted">
                     <Phone className="h-8 w-8 mx-auto mb-2 opacity-40" />
@@ -1,6 +1,6 @@
 "use client";
 
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { DashboardLayout } from "@/components/layout/dashboard-layout";
 import { useAuth } from "@/lib/auth-context";
 import { getLead, type Message } from "@/lib/api";
@@ -8,6 +8,7 @@ import { formatPhone } from "@/lib/utils";
 import { useRealtimeMessages } from "@/hooks/use-realtime";
 import { SkeletonLine } from "@/components/ui/skeleton";
 import { StatusBadge } from "@/components/ui/status-badge";
+import { LoadMore } from "@/components/ui/load-more";
 import Link from "next/link";
 import {
   ArrowLeft,
@@ -23,16 +24,21 @@ import {
 export default function LeadDetailPage({ params }: { params: { id: string } }) {
   const { token } = useAuth();
 
-  const { data, isLoading, isError } = useQuery({
-    queryKey: ["lead", params.id],
-    queryFn: () => getLead(token!, params.id),
-    enabled: !!token,
-  });
+  // Message pages run newest first; the next cursor loads earlier messages
+  const { data, isLoading, isError, hasNextPage, fetchNextPage, isFetchingNextPage } =
+    useInfiniteQuery({
+      queryKey: ["lead", params.id],
+      queryFn: ({ pageParam }) => getLead(token!, params.id, pageParam),
+      initialPageParam: undefined as string | undefined,
+      getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+      enabled: !!token,
+    });
 
-  const lead = data?.lead;
-  const messages = data?.messages || [];
+  const first = data?.pages[0];
+  const lead = first?.lead;
+  const messages = [...(data?.pages ?? [])].reverse().flatMap((page) => page.messages);
 
-  const convoId = data?.conversations?.[0]?.id;
+  const convoId = first?.conversations?.[0]?.id;
   useRealtimeMessages(convoId);
 
   if (isLoading) {
@@ -134,6 +140,12 @@ export default function LeadDetailPage({ params }: { params: { id: string } }) {
 
               {messages.length ? (
                 <div className="space-y-3 max-h-[600px] overflow-y-auto">
+                  <LoadMore
+                    hasMore={hasNextPage}
+                    loading={isFetchingNextPage}
+                    onClick={() => fetchNextPage()}
+                    label="Load earlier messages"
+                  />
                   {messages.map((msg: Message) => (
                     <div
                       key={msg.id}
@@ -2,7 +2,7 @@
 
 import { useState } from "react";
 import Link from "next/link";
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { DashboardLayout } from "@/components/layout/dashboard-layout";
 import { useAuth } from "@/lib/auth-context";
 import { getLeads, type Lead } from "@/lib/api";
@@ -12,6 +12,7 @@ import { ChevronRight, AlertTriangle, Users } from "lucide-react";
 import { SkeletonList } from "@/components/ui/skeleton";
 import { EmptyState } from "@/components/ui/empty-state";
 import { StatusBadge } from "@/components/ui/status-badge";
+import { LoadMore } from "@/components/ui/load-more";
 
 const statusTabs = [
   { key: "", label: "All Leads" },
@@ -26,11 +27,15 @@ export default function LeadsPage() {
   const [filter, setFilter] = useState("");
   useRealtimeLeads();
 
-  const { data, isLoading, isError } = useQuery({
-    queryKey: ["leads", filter],
-    queryFn: () => getLeads(token!, filter || undefined),
-    enabled: !!token,
-  });
+  const { data, isLoading, isError, hasNextPage, fetchNextPage, isFetchingNextPage } =
+    useInfiniteQuery({
+      queryKey: ["leads", filter],
+      queryFn: ({ pageParam }) => getLeads(token!, filter || undefined, pageParam),
+      initialPageParam: undefined as string | undefined,
+      getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+      enabled: !!token,
+    });
+  const leads = data?.pages.flatMap((page) => page.leads) ?? [];
 
   return (
     <DashboardLayout>
@@ -62,10 +67,10 @@ export default function LeadsPage() {
           </div>
         ) : isLoading ? (
           <SkeletonList rows={5} />
-        ) : data?.leads?.length ? (
+        ) : leads.length ? (
           <div className="bg-white rounded-card shadow-card">
             <ul className="divide-y divide-gray-100">
-              {data.leads.map((lead: Lead) => (
+              {leads.map((lead: Lead) => (
                 <li key={lead.id}>
                   <Link
                     href={`/leads/${lead.id}`}
@@ -100,6 +105,11 @@ export default function LeadsPage() {
                 </li>
               ))}
             </ul>
+            <LoadMore
+              hasMore={hasNextPage}
+              loading={isFetchingNextPage}
+              onClick={() => fetchNextPage()}
+            />
           </div>
         ) : (
           <EmptyState
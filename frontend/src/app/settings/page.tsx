@@ -582,6 +582,21 @@ export default function SettingsPage() {
             />
           </section>
 
+          {/* AI Fallback Reply */}
+          <section className="bg-white rounded-card shadow-card p-6">
+            <h2 className="text-lg font-medium text-navy mb-4">Fallback Reply</h2>
+            <textarea
+              value={form.ai_fallback_reply || ""}
+              onChange={(e) => updateField("ai_fallback_reply", e.target.value)}
+              rows={2}
+              className="w-full px-3 py-2 border border-gray-300 rounded-lg text-sm focus:outline-none focus:ring-1 focus:ring-ember"
+              placeholder="Thanks for your message! Someone from [Your Business] will get back to you shortly."
+            />
+            <p className="text-xs text-slate-muted mt-1">
+              Sent if the AI can&apos;t reply in time. A full reply follows once it&apos;s available.
+            </p>
+          </section>
+
           {/* Notifications */}
           <section className="bg-white rounded-card shadow-card p-6">
             <h2 className="text-lg font-medium text-navy mb-4">Notifications</h2>
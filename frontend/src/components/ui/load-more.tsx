@@ -0,0 +1,27 @@
+// Footer for cursor-paginated lists: fetches the next page while one remains
+export function LoadMore({
+  hasMore,
+  loading,
+  onClick,
+  label = "Load more",
+}: {
+  hasMore: boolean;
+  loading: boolean;
+  onClick: () => void;
+  label?: string;
+}) {
+  if (!hasMore) return null;
+
+  return (
+    <div className="flex justify-center py-3">
+      <button
+        type="button"
+        onClick={onClick}
+        disabled={loading}
+        className="px-4 py-2 text-sm font-medium text-navy rounded-lg border border-gray-200 hover:bg-warm-white disabled:opacity-50 transition-colors"
+      >
+        {loading ? "Loading..." : label}
+      </button>
+    </div>
+  );
+}
@@ -48,6 +48,12 @@ export interface Lead {
   updated_at: string;
 }
 
+export interface TranscriptTurn {
+  role: "assistant" | "user" | "unknown";
+  content: string;
+  seconds: number | null;
+}
+
 export interface Conversation {
   id: string;
   business_id: string;
@@ -55,7 +61,9 @@ export interface Conversation {
   call_id: string | null;
   status: string;
   channel: string;
-  voice_transcript: string | null;
+  // Detail endpoint only (transcripts aren't included in list responses)
+  voice_transcript?: string | null;
+  transcript_turns?: TranscriptTurn[];
   recording_url: string | null;
   follow_up_count: number;
   next_follow_up_at: string | null;
@@ -91,7 +99,6 @@ export interface Call {
   recording_url: string | null;
   transcription: string | null;
   voice_ai_used: boolean;
-  voice_ai_transcript: string | null;
   voice_ai_duration_seconds: number | null;
   voice_ai_cost: number | null;
   line_type: string;
@@ -99,6 +106,43 @@ export interface Call {
   created_at: string;
 }
 
+export interface SearchLeadRef {
+  id: string;
+  name: string | null;
+  phone: string;
+}
+
+// Snippets mark matched words with **double asterisks**
+export interface SearchResults {
+  query: string;
+  leads: {
+    id: string;
+    name: string | null;
+    phone: string;
+    address: string | null;
+    status: string;
+    matched: "name" | "address" | "phone";
+    rank: number;
+  }[];
+  messages: {
+    id: string;
+    conversation_id: string;
+    sender_type: string;
+    snippet: string;
+    rank: number;
+    created_at: string;
+    lead: SearchLeadRef | null;
+  }[];
+  transcripts: {
+    call_id: string;
+    conversation_id: string | null;
+    snippet: string;
+    rank: number;
+    created_at: string;
+    lead: SearchLeadRef | null;
+  }[];
+}
+
 export interface Appointment {
   id: string;
   business_id: string;
@@ -156,6 +200,7 @@ export interface BusinessSettings {
   services: string[];
   ai_greeting: string | null;
   ai_instructions: string | null;
+  ai_fallback_reply: string | null;
   notification_prefs: {
     sms: boolean;
     email: boolean;
@@ -236,12 +281,29 @@ export const getDashboardStats = (token: string) =>
 export const getRecentActivity = (token: string) =>
   apiFetch<{ activities: Activity[] }>("/api/dashboard/recent", { token });
 
+// List endpoints are cursor-paginated: pass a response's next_cursor back to
+// get the following page (null when there are no more)
+const pageQuery = (params: Record<string, string | undefined>) => {
+  const query = new URLSearchParams(
+    Object.entries(params).filter((entry): entry is [string, string] => !!entry[1])
+  ).toString();
+  return query ? `?${query}` : "";
+};
+
 // Leads
-export const getLeads = (token: string, status?: string) =>
-  apiFetch<{ leads: Lead[] }>(`/api/leads${status ? `?status=${status}` : ""}`, { token });
+export const getLeads = (token: string, status?: string, cursor?: string) =>
+  apiFetch<{ leads: Lead[]; next_cursor: string | null }>(
+    `/api/leads${pageQuery({ status, cursor })}`,
+    { token }
+  );
 
-export const getLead = (token: string, id: string) =>
-  apiFetch<{ lead: Lead; conversations: Conversation[]; messages: Message[] }>(`/api/leads/${id}`, { token });
+export const getLead = (token: string, id: string, cursor?: string) =>
+  apiFetch<{
+    lead: Lead;
+    conversations: Conversation[];
+    messages: Message[];
+    next_cursor: string | null;
+  }>(`/api/leads/${id}${pageQuery({ cursor })}`, { token });
 
 export const updateLead = (token: string, id: string, data: Partial<Lead>) =>
   apiFetch<{ lead: Lead }>(`/api/leads/${id}`, {
@@ -251,14 +313,17 @@ export const updateLead = (token: string, id: string, data: Partial<Lead>) =>
   });
 
 // Conversations
-export const getConversations = (token: string, status?: string) =>
-  apiFetch<{ conversations: Conversation[] }>(
-    `/api/conversations${status ? `?status=${status}` : ""}`,
+export const getConversations = (token: string, status?: string, cursor?: string) =>
+  apiFetch<{ conversations: Conversation[]; next_cursor: string | null }>(
+    `/api/conversations${pageQuery({ status, cursor })}`,
     { token }
   );
 
-export const getConversation = (token: string, id: string) =>
-  apiFetch<{ conversation: Conversation; messages: Message[] }>(`/api/conversations/${id}`, { token });
+export const getConversation = (token: string, id: string, cursor?: string) =>
+  apiFetch<{ conversation: Conversation; messages: Message[]; next_cursor: string | null }>(
+    `/api/conversations/${id}${pageQuery({ cursor })}`,
+    { token }
+  );
 
 export const takeoverConversation = (token: string, id: string) =>
   apiFetch<{ conversation: Conversation }>(`/api/conversations/${id}/takeover`, { token, method: "POST" });
@@ -277,12 +342,22 @@ export const sendMessage = (token: string, id: string, body: string) =>
   });
 
 // Calls
-export const getCalls = (token: string, status?: string) =>
-  apiFetch<{ calls: Call[] }>(`/api/calls${status ? `?status=${status}` : ""}`, { token });
+export const getCalls = (token: string, status?: string, cursor?: string) =>
+  apiFetch<{ calls: Call[]; next_cursor: string | null }>(
+    `/api/calls${pageQuery({ status, cursor })}`,
+    { token }
+  );
+
+// Search
+export const search = (token: string, q: string, limit = 20) =>
+  apiFetch<SearchResults>(`/api/search?q=${encodeURIComponent(q)}&limit=${limit}`, { token });
 
 // Appointments
-export const getAppointments = (token: string) =>
-  apiFetch<{ appointments: Appointment[] }>("/api/appointments", { token });
+export const getAppointments = (token: string, cursor?: string) =>
+  apiFetch<{ appointments: Appointment[]; next_cursor: string | null }>(
+    `/api/appointments${pageQuery({ cursor })}`,
+    { token }
+  );
 
 export const createAppointment = (token: string, data: CreateAppointmentData) =>
   apiFetch<{ appointment: Appointment }>("/api/appointments", {
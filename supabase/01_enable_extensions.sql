@@ -10,3 +10,7 @@ CREATE EXTENSION IF NOT EXISTS "pgcrypto";
 
 -- Already enabled by default in Supabase, but be explicit:
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+
+-- Trigram and per-tenant GIN indexes for dashboard search
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+CREATE EXTENSION IF NOT EXISTS "btree_gin";
@@ -33,6 +33,16 @@ ALTER TABLE public.review_requests ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.opt_outs ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.audit_log ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.daily_metrics ENABLE ROW LEVEL SECURITY;
+-- Backend-only cache, no client policies
+ALTER TABLE public.phone_line_types ENABLE ROW LEVEL SECURITY;
+-- Backend-only worker queue, no client policies
+ALTER TABLE public.vapi_call_reports ENABLE ROW LEVEL SECURITY;
+-- Backend-only transcript store (served by the API), no client policies
+ALTER TABLE public.call_transcripts ENABLE ROW LEVEL SECURITY;
+-- Backend-only webhook dedup ledger, no client policies
+ALTER TABLE public.twilio_sids ENABLE ROW LEVEL SECURITY;
+-- calls / messages partitions (calls_2026_10, ...) get RLS with no policies
+-- when they are created; clients read through the parent tables
 
 -- ============================================================
 -- Businesses — owner can read/update their own record
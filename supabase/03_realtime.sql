@@ -29,6 +29,10 @@ BEGIN
 END
 $$;
 
+-- calls and messages are partitioned by month; publish their changes under
+-- the parent table names rather than calls_2026_10 etc.
+ALTER PUBLICATION supabase_realtime SET (publish_via_partition_root = true);
+
 -- Add tables the frontend subscribes to
 ALTER PUBLICATION supabase_realtime ADD TABLE public.calls;
 ALTER PUBLICATION supabase_realtime ADD TABLE public.messages;